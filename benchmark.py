@@ -0,0 +1,331 @@
+"""
+로컬 성능 벤치마크 스크립트 (SQLite)
+- 시드 고정 합성 데이터(사용자/메시지/댓글/투표/경로)를 임시 DB에 생성한 뒤
+  주요 엔드포인트의 응답 시간(p50/p95)과 요청당 쿼리 수를 측정합니다.
+- 결과는 JSON 파일로 저장되며 --compare로 이전 결과(다른 커밋)와 비교할 수 있습니다.
+- 시드 데이터는 최초 버전부터 있던 테이블/컬럼에만 직접 INSERT하고, 파생 데이터(통계/격자/인덱스 컬럼 등)는
+  해당 커밋의 migrate_schema.py 백필로 생성 → 어느 커밋에서든 같은 데이터로 측정 가능
+  (test_endpoints.py / debug_routes.py는 운영 서버 확인용이라 측정에 쓰지 않음)
+
+사용법:
+    python benchmark.py                                  # 기본 규모, benchmark_results.json 저장
+    python benchmark.py --routes 2000 --route-points 500 --clusters 3 --spread 0.01
+    python benchmark.py --output after.json --compare before.json
+"""
+import os
+import json
+import math
+import time
+import random
+import argparse
+import platform
+import sqlite3
+import tempfile
+import subprocess
+from datetime import timedelta
+
+parser = argparse.ArgumentParser(description='발길맵 로컬 벤치마크')
+parser.add_argument('--seed', type=int, default=42)
+parser.add_argument('--users', type=int, default=200)
+parser.add_argument('--messages', type=int, default=2000)
+parser.add_argument('--comments', type=int, default=3000)
+parser.add_argument('--votes', type=int, default=5000)
+parser.add_argument('--routes', type=int, default=500)
+parser.add_argument('--route-points', type=int, default=200, help='경로당 평균 점 개수')
+parser.add_argument('--clusters', type=int, default=5, help='데이터가 몰리는 지역(핫스팟) 수')
+parser.add_argument('--spread', type=float, default=0.02, help='핫스팟 주변 분포 표준편차 (도)')
+parser.add_argument('--iterations', type=int, default=50, help='엔드포인트별 측정 횟수')
+parser.add_argument('--warmup', type=int, default=5)
+parser.add_argument('--output', default='benchmark_results.json')
+parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+parser.add_argument('--db', help='SQLite 파일 경로 (기본: 임시 파일)')
+args = parser.parse_args()
+
+# server import 전에 격리된 환경 구성 (운영 DB / 로컬 캐시 파일을 건드리지 않음)
+os.environ['DATABASE_URL'] = 'sqlite:///' + (args.db or os.path.join(tempfile.mkdtemp(), 'benchmark.db'))
+os.environ['ROUTE_INGEST_MODE'] = 'sync'
+os.environ['CHANGE_VERSION_BACKEND'] = 'memory'
+
+from sqlalchemy import event, text, bindparam
+
+from server import app, db, get_kst_now
+
+try:
+    import migrate_schema
+except ImportError:
+    migrate_schema = None  # 마이그레이션 스크립트 도입 이전 커밋 (파생 데이터 없음)
+
+SEOUL = (126.978, 37.566)
+REGION_RADIUS = 0.15  # 핫스팟 중심이 놓이는 범위 (도)
+SEED_BATCH_SIZE = 200
+METERS_PER_DEGREE = 111320
+
+# ========================================
+# 합성 데이터 생성
+# ========================================
+class FootmapGenerator:
+    """시드 고정 합성 데이터 생성기 (같은 시드 → 같은 데이터)"""
+
+    def __init__(self, seed, clusters, spread):
+        self.rng = random.Random(seed)
+        self.spread = spread
+        self.centers = [
+            (SEOUL[0] + self.rng.uniform(-REGION_RADIUS, REGION_RADIUS),
+             SEOUL[1] + self.rng.uniform(-REGION_RADIUS, REGION_RADIUS))
+            for _ in range(max(1, clusters))
+        ]
+
+    def point(self):
+        """핫스팟 중 하나 주변의 좌표 (정규분포)"""
+        cx, cy = self.rng.choice(self.centers)
+        return round(self.rng.gauss(cx, self.spread), 6), round(self.rng.gauss(cy, self.spread), 6)
+
+    def bounds(self, size=0.02):
+        """핫스팟 주변의 화면 범위 (minLon, minLat, maxLon, maxLat)"""
+        lon, lat = self.point()
+        return lon - size / 2, lat - size / 2, lon + size / 2, lat + size / 2
+
+    def track(self, mean_points):
+        """걷기 속도(약 1.4m/s, 5초 간격)의 완만한 랜덤워크 궤적 → [{coords, timestamp}, ...]"""
+        count = max(2, int(self.rng.gauss(mean_points, mean_points * 0.25)))
+        lon, lat = self.point()
+        heading = self.rng.uniform(0, 2 * math.pi)
+        ts = int(time.time() * 1000) - self.rng.randint(0, 30 * 86400 * 1000)
+        points = []
+        for _ in range(count):
+            points.append({'coords': [round(lon, 6), round(lat, 6)], 'timestamp': ts})
+            heading += self.rng.gauss(0, 0.3)
+            step = 7.0 / METERS_PER_DEGREE
+            lon += step * math.cos(heading) / math.cos(math.radians(lat))
+            lat += step * math.sin(heading)
+            ts += 5000
+        return points
+
+    def route_payload(self, mean_points):
+        """save_user_route 요청 본문과 같은 형식 (궤적은 클라이언트처럼 JSON 문자열)"""
+        points = self.track(mean_points)
+        mode = self.rng.choice(['walking', 'walking', 'walking', 'wheelchair', 'vehicle'])
+        distance = (len(points) - 1) * 7.0 / 1000
+        first, last = points[0]['coords'], points[-1]['coords']
+        return {
+            'mode': mode,
+            'distance': round(distance, 3),
+            'duration': (len(points) - 1) * 5,
+            'startCoords': f"{first[0]},{first[1]}",
+            'endCoords': f"{last[0]},{last[1]}",
+            'points': json.dumps(points),
+            'approachPath': json.dumps(points[:min(len(points), 10)]),
+        }
+
+    def text(self, length=40):
+        words = ['발길', '산책', '경사로', '계단', '엘리베이터', '카페', '공원', '횡단보도', '턱', '좋아요']
+        return ' '.join(self.rng.choice(words) for _ in range(length // 4))[:length]
+
+def insert_rows(table, columns, rows, datetime_columns=()):
+    """최초 버전 스키마의 컬럼만 지정한 원시 INSERT (이후 추가된 컬럼은 기존 데이터처럼 비워 둠)"""
+    if not rows:
+        return
+    stmt = text(f'INSERT INTO "{table}" ({", ".join(columns)}) VALUES ({", ".join(":" + c for c in columns)})')
+    stmt = stmt.bindparams(*[bindparam(c, type_=db.DateTime) for c in datetime_columns])
+    for i in range(0, len(rows), SEED_BATCH_SIZE):
+        db.session.execute(stmt, rows[i:i + SEED_BATCH_SIZE])
+    db.session.commit()
+
+def seed_database(gen):
+    """합성 데이터 저장 → 생성 개수
+
+    기존 운영 DB와 같은 형태(원본 테이블만 채워진 상태)로 넣은 뒤 마이그레이션 백필로 파생 데이터 생성
+    """
+    rng = gen.rng
+    now = get_kst_now()
+    ago = lambda seconds: now - timedelta(seconds=rng.randint(0, seconds))
+    user_ids = [f'bench_user_{i}' for i in range(args.users)]
+
+    # 메시지
+    messages = []
+    for i in range(args.messages):
+        lon, lat = gen.point()
+        messages.append({'id': f'bench_msg_{i}', 'user_id': rng.choice(user_ids), 'text': gen.text(),
+                         'coord_x': lon, 'coord_y': lat, 'tags': '#벤치', 'timestamp': ago(30 * 86400)})
+    message_ids = [m['id'] for m in messages]
+
+    # 댓글
+    comments = [
+        {'id': f'bench_cmt_{i}', 'message_id': rng.choice(message_ids), 'user_id': rng.choice(user_ids),
+         'text': gen.text(30), 'timestamp': ago(86400)}
+        for i in range(args.comments if message_ids else 0)
+    ]
+
+    # 투표 (메시지당 사용자 1표) → 메시지 좋아요/싫어요 수
+    votes = {}
+    for _ in range(args.votes if message_ids else 0):
+        votes[(rng.choice(message_ids), rng.choice(user_ids))] = 'up' if rng.random() < 0.8 else 'down'
+    tallies = {}
+    for (message_id, _), vote_type in votes.items():
+        tallies.setdefault(message_id, {'up': 0, 'down': 0})[vote_type] += 1
+    for m in messages:
+        t = tallies.get(m['id'], {'up': 0, 'down': 0})
+        m.update(likes=t['up'], dislikes=t['down'], shares=0, edited=False)
+
+    # 경로 (+ 사용자 누적 거리: 최초 버전부터 User 컬럼에 저장)
+    routes = []
+    distances = {uid: {'walking': 0.0, 'wheelchair': 0.0, 'vehicle': 0.0} for uid in user_ids}
+    for _ in range(args.routes):
+        payload = gen.route_payload(args.route_points)
+        user_id = rng.choice(user_ids)
+        distances[user_id][payload['mode']] += payload['distance']
+        routes.append({'user_id': user_id, 'distance': payload['distance'], 'duration': payload['duration'],
+                       'mode': payload['mode'], 'start_coords': payload['startCoords'],
+                       'end_coords': payload['endCoords'], 'points_json': payload['points'],
+                       'approach_path': payload['approachPath'], 'timestamp': ago(30 * 86400)})
+
+    users = [
+        {'id': uid, 'nickname': f'벤치{i}', 'points': 0, 'total_distance': sum(distances[uid].values()),
+         'dist_walking': distances[uid]['walking'], 'dist_wheelchair': distances[uid]['wheelchair'],
+         'dist_vehicle': distances[uid]['vehicle'], 'created_at': now - timedelta(minutes=i)}
+        for i, uid in enumerate(user_ids)
+    ]
+
+    insert_rows('user', list(users[0]) if users else [], users, ['created_at'])
+    insert_rows('message', list(messages[0]) if messages else [], messages, ['timestamp'])
+    insert_rows('comment', ['id', 'message_id', 'user_id', 'text', 'timestamp'], comments, ['timestamp'])
+    insert_rows('vote', ['message_id', 'user_id', 'vote_type'],
+                [{'message_id': m, 'user_id': u, 'vote_type': t} for (m, u), t in votes.items()])
+    insert_rows('route', list(routes[0]) if routes else [], routes, ['timestamp'])
+
+    # 파생 데이터는 해당 커밋의 마이그레이션으로 생성
+    if migrate_schema is not None:
+        migrate_schema.migrate()
+    return {'users': len(user_ids), 'messages': len(message_ids), 'comments': len(comments),
+            'votes': len(votes), 'routes': len(routes)}
+
+# ========================================
+# 측정
+# ========================================
+def benchmark_cases(gen):
+    """(이름, 요청 생성 함수) 목록 - 요청 생성 함수는 (method, url, json) 반환"""
+    rng = gen.rng
+    user_id = lambda: f'bench_user_{rng.randrange(args.users)}'
+
+    def messages_in_view():
+        min_x, min_y, max_x, max_y = gen.bounds()
+        return 'GET', f'/api/messages?min_x={min_x}&max_x={max_x}&min_y={min_y}&max_y={max_y}', None
+
+    def message_clusters():
+        min_x, min_y, max_x, max_y = gen.bounds(0.2)
+        return 'GET', f'/api/messages?cluster=1&min_x={min_x}&max_x={max_x}&min_y={min_y}&max_y={max_y}', None
+
+    def trajectories(zoom):
+        def make():
+            bounds = ','.join(str(v) for v in gen.bounds(0.05))
+            return 'GET', f'/api/trajectories?bounds={bounds}' + (f'&zoom={zoom}' if zoom else ''), None
+        return make
+
+    def vote():
+        message_id = f'bench_msg_{rng.randrange(max(1, args.messages))}'
+        return 'POST', f'/api/messages/{message_id}/vote', {'userId': user_id(), 'type': rng.choice(['up', 'down'])}
+
+    return [
+        ('get_messages', lambda: ('GET', '/api/messages', None)),
+        ('get_messages_bounds', messages_in_view),
+        ('get_messages_cluster', message_clusters),
+        ('get_trajectories', trajectories(None)),
+        ('get_trajectories_zoom14', trajectories(14)),
+        ('get_user_dashboard', lambda: ('GET', f'/api/user/{user_id()}/dashboard', None)),
+        ('vote_message', vote),
+        ('save_user_route', lambda: ('POST', f'/api/users/{user_id()}/routes', gen.route_payload(args.route_points))),
+    ]
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def run_case(client, make_request, query_log):
+    for _ in range(args.warmup):
+        method, url, body = make_request()
+        client.open(url, method=method, json=body)
+
+    latencies, queries, statuses, sizes = [], [], {}, []
+    for _ in range(args.iterations):
+        method, url, body = make_request()
+        query_log.clear()
+        started = time.perf_counter()
+        response = client.open(url, method=method, json=body)
+        data = response.get_data()
+        latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(len(query_log))
+        sizes.append(len(data))
+        statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    return {
+        'iterations': len(latencies),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'mean_ms': round(sum(latencies) / len(latencies), 3),
+        'max_ms': round(max(latencies), 3),
+        'queries_mean': round(sum(queries) / len(queries), 2),
+        'queries_max': max(queries),
+        'bytes_mean': int(sum(sizes) / len(sizes)),
+        'status': statuses,
+    }
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, previous_path):
+    """이전 결과 대비 p50/쿼리 수 변화 출력"""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = json.load(f)
+    print(f"\n📈 비교: {previous['meta'].get('commit')} → {results['meta'].get('commit')}")
+    for name, current in results['endpoints'].items():
+        before = previous.get('endpoints', {}).get(name)
+        if not before:
+            print(f"  {name:<26} (이전 결과 없음)")
+            continue
+        change = (current['p50_ms'] - before['p50_ms']) / before['p50_ms'] * 100 if before['p50_ms'] else 0
+        print(f"  {name:<26} p50 {before['p50_ms']:>8.2f} → {current['p50_ms']:>8.2f} ms ({change:+.0f}%)"
+              f"  queries {before['queries_mean']} → {current['queries_mean']}")
+
+def main():
+    gen = FootmapGenerator(args.seed, args.clusters, args.spread)
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+        dataset = seed_database(gen)
+        print(f"🌱 데이터 생성 {time.perf_counter() - started:.1f}초: {dataset}")
+
+        query_log = []
+        event.listen(db.engine, 'before_cursor_execute', lambda *a: query_log.append(a[2]))
+
+        client = app.test_client()
+        endpoints = {}
+        for name, make_request in benchmark_cases(gen):
+            endpoints[name] = result = run_case(client, make_request, query_log)
+            print(f"  {name:<26} p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms"
+                  f"  queries {result['queries_mean']:>5} (max {result['queries_max']})  {result['status']}")
+
+    results = {
+        'meta': {
+            'commit': git_commit(),
+            'createdAt': get_kst_now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'params': {k: v for k, v in vars(args).items() if k not in ('output', 'compare', 'db')},
+            'dataset': dataset,
+        },
+        'endpoints': endpoints,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"✅ 결과 저장: {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
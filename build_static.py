@@ -0,0 +1,267 @@
+"""
+정적 자산 빌드 스크립트 (배포 전 실행)
+- index.html이 불러오는 로컬 js/ 모듈과 css 파일을 각각 하나로 묶고 압축(minify)합니다.
+- 결과물은 내용 해시가 붙은 파일명(dist/js/app.<hash>.js, dist/css/app.<hash>.css)으로 저장되고,
+  번들을 참조하는 dist/index.html과 dist/asset-manifest.json을 생성합니다.
+- server.py는 manifest가 있으면 dist/index.html을 제공하고, 해시 파일은 immutable로 캐시합니다.
+- 빌드 후 precompress_static.py로 .gz/.br 압축본까지 생성합니다.
+
+사용법:
+    python build_static.py
+    python build_static.py --no-minify    # 디버깅용 (묶기만 수행)
+"""
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+from datetime import datetime
+
+from precompress_static import precompress
+
+# 설치되어 있으면 검증된 minifier 사용 (없으면 아래 보수적 minifier 사용)
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DIST_DIR = os.path.join(ROOT, 'dist')
+INDEX_PATH = os.path.join(ROOT, 'index.html')
+MANIFEST_NAME = 'asset-manifest.json'
+HASH_LENGTH = 10
+MINIFY = '--no-minify' not in sys.argv
+
+SCRIPT_TAG = re.compile(r'[ \t]*<script\s+src="(?!https?:|//)([^"?]+)(?:\?[^"]*)?"[^>]*>\s*</script>[ \t]*\n?')
+# preload + noscript 쌍으로 불러오는 로컬 스타일시트
+STYLE_TAG = re.compile(
+    r'[ \t]*<link rel="preload" href="(?!https?:|//)([^"?]+\.css)(?:\?[^"]*)?" as="style"[^>]*>\s*\n'
+    r'[ \t]*<noscript><link rel="stylesheet" href="[^"]*"></noscript>[ \t]*\n?'
+)
+
+# ========================================
+# 보수적 minifier (주석/들여쓰기/빈 줄 제거, 줄바꿈은 유지하여 ASI 안전)
+# ========================================
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw', 'yield', 'await'}
+
+def minify_js(source):
+    if rjsmin is not None:
+        return rjsmin.jsmin(source)
+
+    out = []
+    i, n = 0, len(source)
+    stack = []  # 템플릿 리터럴 중첩: ${ } 안의 중괄호 깊이
+
+    def last_significant():
+        for chunk in reversed(out):
+            stripped = chunk.rstrip()
+            if stripped:
+                return stripped
+        return ''
+
+    def regex_allowed():
+        prev = last_significant()
+        if not prev:
+            return True
+        if prev[-1] in REGEX_PRECEDERS:
+            return True
+        word = re.search(r'[A-Za-z_$][\w$]*$', prev)
+        return bool(word) and word.group(0) in REGEX_KEYWORDS
+
+    def newline():
+        # 줄 끝 공백 제거 + 빈 줄 생략
+        while out and out[-1] in (' ', '\t'):
+            out.pop()
+        if out and out[-1] != '\n':
+            out.append('\n')
+
+    at_line_start = True
+    while i < n:
+        c = source[i]
+
+        if c == '\n':
+            newline()
+            at_line_start = True
+            i += 1
+            continue
+        if c in ' \t\r' and (at_line_start or (out and out[-1] in (' ', '\n'))):
+            i += 1
+            continue
+        at_line_start = False
+
+        # 주석
+        if source.startswith('//', i):
+            end = source.find('\n', i)
+            i = n if end == -1 else end
+            continue
+        if source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            comment = source[i:n if end == -1 else end + 2]
+            i = n if end == -1 else end + 2
+            out.append('\n' if '\n' in comment else ' ')  # 토큰이 붙지 않도록
+            continue
+
+        # 문자열 / 템플릿 리터럴 / 정규식은 그대로 복사
+        if c in '\'"' or c == '`' or (c == '/' and regex_allowed()):
+            j = i + 1
+            in_class = False
+            while j < n:
+                d = source[j]
+                if d == '\\':
+                    j += 2
+                    continue
+                if c == '`' and source.startswith('${', j):
+                    stack.append(0)
+                    j += 2
+                    break
+                if c == '/' and d == '[':
+                    in_class = True
+                elif c == '/' and d == ']':
+                    in_class = False
+                elif d == c and not in_class:
+                    j += 1
+                    break
+                j += 1
+            out.append(source[i:j])
+            i = j
+            continue
+
+        # 템플릿 리터럴 ${ } 표현식 종료 → 템플릿 나머지 복사
+        if stack:
+            if c == '{':
+                stack[-1] += 1
+            elif c == '}':
+                if stack[-1] == 0:
+                    stack.pop()
+                    j = i + 1
+                    while j < n:
+                        d = source[j]
+                        if d == '\\':
+                            j += 2
+                            continue
+                        if source.startswith('${', j):
+                            stack.append(0)
+                            j += 2
+                            break
+                        if d == '`':
+                            j += 1
+                            break
+                        j += 1
+                    out.append(source[i:j])
+                    i = j
+                    continue
+                stack[-1] -= 1
+
+        out.append(' ' if c in '\t\r' else c)
+        i += 1
+
+    newline()
+    return ''.join(out)
+
+def minify_css(source):
+    if rcssmin is not None:
+        return rcssmin.cssmin(source)
+    # 문자열 밖의 주석 제거 후 공백 정리
+    parts = re.split(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')', source)
+    for k in range(0, len(parts), 2):
+        text = re.sub(r'/\*.*?\*/', '', parts[k], flags=re.S)
+        text = re.sub(r'\s+', ' ', text)
+        text = re.sub(r'\s*([{};,])\s*', r'\1', text)
+        parts[k] = text.replace(';}', '}')
+    return ''.join(parts).strip() + '\n'
+
+# ========================================
+# 번들 생성
+# ========================================
+def read_sources(paths):
+    contents = []
+    for path in paths:
+        with open(os.path.join(ROOT, path), encoding='utf-8') as f:
+            contents.append(f.read())
+    return contents
+
+def write_hashed(kind, content):
+    """dist/<kind>/app.<hash>.<kind> 저장 → 루트 기준 상대 경로"""
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+    rel_path = f"dist/{kind}/app.{digest}.{kind}"
+    os.makedirs(os.path.join(ROOT, 'dist', kind), exist_ok=True)
+    with open(os.path.join(ROOT, rel_path), 'w', encoding='utf-8') as f:
+        f.write(content)
+    return rel_path
+
+def build():
+    with open(INDEX_PATH, encoding='utf-8') as f:
+        html = f.read()
+
+    scripts = SCRIPT_TAG.findall(html)
+    styles = STYLE_TAG.findall(html)
+    if not scripts:
+        print("❌ index.html에서 로컬 스크립트를 찾지 못했습니다")
+        return False
+
+    # 이전 빌드 결과 정리
+    if os.path.isdir(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+
+    # 1. JS: index.html 순서대로 이어 붙임 (각 파일은 전역 스코프를 공유하므로 감싸지 않음)
+    js_sources = read_sources(scripts)
+    if MINIFY:
+        js_sources = [minify_js(src) for src in js_sources]
+    bundle_js = ''.join(f"/* {path} */\n{src.rstrip()}\n;\n" for path, src in zip(scripts, js_sources))
+    js_path = write_hashed('js', bundle_js)
+
+    # 2. CSS
+    css_path = None
+    if styles:
+        css_sources = read_sources(styles)
+        if MINIFY:
+            css_sources = [minify_css(src) for src in css_sources]
+        css_path = write_hashed('css', ''.join(f"/* {path} */\n{src.rstrip()}\n" for path, src in zip(styles, css_sources)))
+
+    # 3. index.html: 로컬 스크립트는 마지막 위치(app.js 자리)에 번들 하나로, 스타일은 첫 위치에 번들 하나로 교체
+    script_matches = list(SCRIPT_TAG.finditer(html))
+    last = script_matches[-1]
+    bundle_tag = f'    <script src="{js_path}" defer></script>\n'
+    html = html[:last.start()] + '\u0000BUNDLE_JS\u0000' + html[last.end():]
+    html = SCRIPT_TAG.sub('', html).replace('\u0000BUNDLE_JS\u0000', bundle_tag)
+    if css_path:
+        css_tag = (
+            f'    <link rel="preload" href="{css_path}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+            f'    <noscript><link rel="stylesheet" href="{css_path}"></noscript>\n'
+        )
+        first = STYLE_TAG.search(html)
+        html = html[:first.start()] + '\u0000BUNDLE_CSS\u0000' + html[first.end():]
+        html = STYLE_TAG.sub('', html).replace('\u0000BUNDLE_CSS\u0000', css_tag)
+
+    with open(os.path.join(DIST_DIR, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(html)
+
+    manifest = {
+        'index': 'dist/index.html',
+        'js': js_path,
+        'css': css_path,
+        'sources': {'js': scripts, 'css': styles},
+        'builtAt': datetime.now().isoformat(timespec='seconds'),
+    }
+    with open(os.path.join(DIST_DIR, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    original = sum(os.path.getsize(os.path.join(ROOT, p)) for p in scripts + styles)
+    bundled = os.path.getsize(os.path.join(ROOT, js_path)) + (os.path.getsize(os.path.join(ROOT, css_path)) if css_path else 0)
+    print(f"✅ JS {len(scripts)}개 → {js_path}")
+    if css_path:
+        print(f"✅ CSS {len(styles)}개 → {css_path}")
+    print(f"   {original} → {bundled} bytes (minify: {'on' if MINIFY else 'off'})")
+    return True
+
+if __name__ == "__main__":
+    if build():
+        precompress()
+    else:
+        sys.exit(1)
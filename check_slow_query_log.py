@@ -0,0 +1,91 @@
+"""
+느린 쿼리 로그(SlowQueryLog) 검사 스크립트
+- 임계값을 사실상 0으로 낮춰 모든 쿼리를 느린 쿼리로 기록한 뒤 아래를 확인합니다.
+  1. 요청 처리 중에는 EXPLAIN을 실행하지 않음 (커서 이벤트에서는 기록만)
+  2. 관리자 페이지 조회 시 조회 문장(SELECT)의 실행 계획 수집 - executemany/다중 행 파라미터 포함 실패 없음
+  3. 쓰기 문장(INSERT ... ON CONFLICT 등)은 빈 계획 대신 '수집 안 함' 표시
+
+사용법:
+    python check_slow_query_log.py
+"""
+import os
+import sys
+import tempfile
+
+# server import 전에 임계값/DB 지정
+os.environ['SLOW_QUERY_MS'] = '0.000001'
+if not os.environ.get('DATABASE_URL'):
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'slow_query_check.db')
+
+import server
+from server import app, slow_query_log, ADMIN_SECRET_KEY
+
+def exercise(client):
+    """SELECT / executemany upsert(밀도 격자) / 다중 행 INSERT(클러스터)를 모두 거치는 요청"""
+    points = [{'coords': f'{127.0 + i * 0.001},{37.5 + i * 0.001}', 'timestamp': i} for i in range(20)]
+    assert client.post('/api/users/sq_user/routes', json={
+        'mode': 'walking', 'distance': 1.2, 'duration': 600, 'points': points
+    }).status_code == 201
+    assert client.post('/api/messages', json={
+        'userId': 'sq_user', 'text': 'slow query check', 'coords': [127.0, 37.5]
+    }).status_code == 201
+    assert client.get('/api/messages?bounds=126.9,37.4,127.1,37.6').status_code == 200
+    assert client.get('/api/trajectories?bounds=126.9,37.4,127.1,37.6').status_code == 200
+
+def main():
+    client = app.test_client()
+    ok = True
+
+    # 1. 요청 처리 중 EXPLAIN 호출 횟수
+    explain_calls = []
+    original = server.SlowQueryLog.explain
+
+    def counting_explain(self, statement, parameters):
+        explain_calls.append(statement)
+        return original(self, statement, parameters)
+
+    server.SlowQueryLog.explain = counting_explain
+    try:
+        exercise(client)
+        # executemany 형식(행 목록) 파라미터로 기록된 SELECT도 첫 행으로 EXPLAIN
+        with app.app_context():
+            placeholder = '%s' if server.db.engine.dialect.name == 'postgresql' else '?'
+        slow_query_log.record(f'SELECT id FROM message WHERE user_id = {placeholder}', [('sq_user',), ('other',)], 1.0, True)
+        in_request = len(explain_calls)
+        print(f"📊 요청 처리 중 EXPLAIN {in_request}회")
+        if in_request:
+            print("❌ 요청 처리 경로에서 EXPLAIN 실행")
+            ok = False
+
+        # 2. 조회 시 계획 수집
+        with app.app_context():
+            entries = slow_query_log.entries()
+    finally:
+        server.SlowQueryLog.explain = original
+
+    selects = [e for e in entries if e['sql'].lower().startswith(('select', 'with'))]
+    writes = [e for e in entries if not e['sql'].lower().startswith(('select', 'with'))]
+    executemany = [e for e in entries if isinstance(e['params'], dict) and 'rows' in e['params']]
+    failed = [e for e in entries if (e['plan'] or '').startswith('EXPLAIN 실패')]
+    empty = [e for e in selects if not e['plan'] or e['plan'].startswith('(')]
+    unmarked = [e for e in writes if not e['plan']]
+    print(f"📊 기록 {len(entries)}건 (SELECT {len(selects)}, 쓰기 {len(writes)}, executemany {len(executemany)}), "
+          f"EXPLAIN {len(explain_calls)}회")
+    for e, reason in [(e, '실패') for e in failed] + [(e, '빈 계획') for e in empty] + [(e, '표시 없음') for e in unmarked]:
+        print(f"❌ {reason}: {e['sql'][:120]} → {e['plan']}")
+        ok = False
+    if not selects or not executemany:
+        print("❌ 검사 대상 쿼리(SELECT / executemany)가 기록되지 않음")
+        ok = False
+
+    # 3. 관리자 페이지 렌더링
+    r = client.get(f'/admin/db?key={ADMIN_SECRET_KEY}&section=slow')
+    if r.status_code != 200 or 'EXPLAIN 실패' in r.get_data(as_text=True):
+        print(f"❌ 관리자 페이지 오류: {r.status_code}")
+        ok = False
+
+    print("✅ 느린 쿼리 로그 정상" if ok else "❌ 검사 실패")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
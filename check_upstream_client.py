@@ -0,0 +1,138 @@
+"""
+외부 API 클라이언트(UpstreamClient) 검사 스크립트
+- 로컬 스텁 HTTP 서버를 카카오 API 대신 띄우고 /api/search, /api/reverse-geo/batch 프록시를 통해 확인합니다.
+  1. 같은 검색어 동시 요청 → 외부 호출 1회 (요청 병합)
+  2. 순차 요청 → keep-alive 연결 재사용
+  3. 읽기 타임아웃을 넘는 느린 응답 → 504 (타임아웃 시간 내 반환)
+  4. /api/reverse-geo/batch → 요청 순서대로 응답, 잘못된 좌표 형식은 400
+
+사용법:
+    python check_upstream_client.py
+    python check_upstream_client.py 32      # 동시 요청 수
+"""
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+import urllib.parse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CONCURRENCY = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+UPSTREAM_DELAY = 0.3  # 일반 응답 지연 (동시 요청이 겹치도록)
+SLOW_DELAY = 3.0  # 느린 응답 지연 (읽기 타임아웃보다 길게)
+READ_TIMEOUT = 0.5
+
+class StubHandler(BaseHTTPRequestHandler):
+    """카카오 검색 API 스텁 (query=slow는 SLOW_DELAY 후 응답)"""
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    calls = Counter()
+    connections = set()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query).get('query', [''])[0]
+        with self.lock:
+            self.calls[query] += 1
+            self.connections.add(self.client_address)
+        time.sleep(SLOW_DELAY if query == 'slow' else UPSTREAM_DELAY)
+        body = json.dumps({'documents': [], 'meta': {'query': query}}).encode('utf-8')
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 타임아웃으로 클라이언트가 먼저 끊은 경우
+
+    def log_message(self, *args):
+        pass
+
+stub = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+stub.daemon_threads = True
+threading.Thread(target=stub.serve_forever, daemon=True).start()
+
+# server import 전에 카카오 API 주소/타임아웃을 스텁으로 지정
+os.environ['KAKAO_API_BASE'] = f"http://127.0.0.1:{stub.server_address[1]}"
+os.environ['KAKAO_READ_TIMEOUT'] = str(READ_TIMEOUT)
+os.environ['KAKAO_CACHE_BACKEND'] = 'memory'
+if not os.environ.get('DATABASE_URL'):
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'upstream_check.db')
+
+from server import app, kakao_client
+
+def search(query):
+    r = app.test_client().get('/api/search', query_string={'query': query})
+    return r.status_code
+
+def check_coalescing():
+    """같은 검색어 CONCURRENCY건 동시 요청 → 외부 호출 1회"""
+    barrier = threading.Barrier(CONCURRENCY)
+
+    def run(_):
+        barrier.wait()
+        return search('coalesce')
+
+    before = kakao_client.coalesced
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        statuses = Counter(pool.map(run, range(CONCURRENCY)))
+    calls = StubHandler.calls['coalesce']
+    print(f"📊 동시 {CONCURRENCY}건 → 외부 호출 {calls}회, 병합 {kakao_client.coalesced - before}건, 응답 {dict(statuses)}")
+    ok = calls == 1 and statuses == Counter({200: CONCURRENCY})
+    if not ok:
+        print("❌ 동시 요청이 하나의 외부 호출로 병합되지 않음")
+    return ok
+
+def check_keepalive():
+    """서로 다른 검색어 순차 요청 → 연결 1개 재사용"""
+    StubHandler.connections.clear()
+    statuses = [search(f'keepalive {i}') for i in range(5)]
+    connections = len(StubHandler.connections)
+    print(f"📊 순차 5건 → 연결 {connections}개, 응답 {statuses}")
+    ok = connections == 1 and statuses == [200] * 5
+    if not ok:
+        print("❌ keep-alive 연결이 재사용되지 않음")
+    return ok
+
+def check_timeout():
+    """읽기 타임아웃을 넘는 응답 → 504, 타임아웃 직후 반환"""
+    started = time.perf_counter()
+    status = search('slow')
+    elapsed = time.perf_counter() - started
+    print(f"📊 느린 응답 → {status} ({elapsed:.2f}초, 읽기 타임아웃 {READ_TIMEOUT}초)")
+    ok = status == 504 and elapsed < SLOW_DELAY
+    if not ok:
+        print("❌ 느린 외부 응답이 504로 끊기지 않음")
+    return ok
+
+def check_reverse_geo_batch():
+    """일괄 주소 변환: 반올림 후 같은 좌표는 한 번만 조회, 잘못된 항목은 400"""
+    client = app.test_client()
+    coords = [[127.00001, 37.5], [127.00002, 37.5], [127.1, 37.6]]  # 앞의 두 좌표는 같은 캐시 키
+    before = sum(StubHandler.calls.values())
+    r = client.post('/api/reverse-geo/batch', json={'coords': coords})
+    results = (r.get_json() or {}).get('results', [])
+    calls = sum(StubHandler.calls.values()) - before
+    print(f"📊 일괄 주소 변환 {len(coords)}건 → {r.status_code}, 외부 호출 {calls}회")
+    ok = r.status_code == 200 and [x['status'] for x in results] == [200] * len(coords) and calls == 2
+    invalid = [{'x': 127.0, 'y': 37.5}, [127.0], ['127.0', '37.5'], [127.0, 37.5, 1]]
+    statuses = [client.post('/api/reverse-geo/batch', json={'coords': [c]}).status_code for c in invalid]
+    print(f"📊 잘못된 좌표 형식 → {statuses}")
+    if not ok or statuses != [400] * len(invalid):
+        print("❌ 일괄 주소 변환 응답 이상")
+        ok = False
+    return ok
+
+def main():
+    results = [check_coalescing(), check_keepalive(), check_timeout(), check_reverse_geo_batch()]
+    stub.shutdown()
+    ok = all(results)
+    print("✅ 외부 API 클라이언트 정상" if ok else "❌ 검사 실패")
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,118 @@
+"""
+투표 동시성 검사 스크립트
+- 여러 사용자가 한 메시지에 동시에 투표(추가/변경/취소/연타)한 뒤
+  likes/dislikes 카운터가 Vote 행 수 및 기대값과 정확히 일치하는지 확인하고 처리량을 출력합니다.
+
+사용법:
+    python check_vote_concurrency.py                 # 임시 SQLite DB 사용
+    python check_vote_concurrency.py 500 16          # 사용자 수, 동시 스레드 수
+    DATABASE_URL=postgresql://... python check_vote_concurrency.py
+        (검사용 메시지/사용자는 vc_ 접두사로 생성 후 삭제)
+"""
+import os
+import sys
+import time
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+if not os.environ.get('DATABASE_URL'):
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'vote_check.db')
+
+from server import app, db, User, Message, Vote, UserStats
+
+USERS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+WORKERS = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+MESSAGE_ID = 'vc_message'
+AUTHOR_ID = 'vc_author'
+
+# 사용자별 순차 투표 시나리오 → 최종 상태
+SCENARIOS = [
+    (['up'], 'up'),                  # 신규 좋아요
+    (['down'], 'down'),              # 신규 싫어요
+    (['up', 'up'], None),            # 좋아요 후 취소
+    (['up', 'down'], 'down'),        # 좋아요 → 싫어요 변경
+    (['down', 'up', 'up', 'up'], 'up'),
+]
+
+def vote(client, user_id, vote_type):
+    r = client.post(f'/api/messages/{MESSAGE_ID}/vote', json={'userId': user_id, 'type': vote_type})
+    if r.status_code != 200:
+        raise RuntimeError(f"{user_id} {vote_type}: {r.status_code} {r.get_data(as_text=True)}")
+
+def run_user(i):
+    client = app.test_client()
+    votes, _ = SCENARIOS[i % len(SCENARIOS)]
+    for vote_type in votes:
+        vote(client, f'vc_user_{i}', vote_type)
+    return len(votes)
+
+def run_double_click(i):
+    """같은 사용자의 동일 요청 2건 동시 전송 (결과는 타이밍에 따라 다르므로 카운터 = 행 수만 검사)"""
+    client = app.test_client()
+    vote(client, f'vc_dbl_{i}', 'up')
+    return 1
+
+def cleanup():
+    Vote.query.filter(Vote.message_id == MESSAGE_ID).delete(synchronize_session=False)
+    Message.query.filter_by(id=MESSAGE_ID).delete(synchronize_session=False)
+    UserStats.query.filter(UserStats.user_id.like('vc\\_%', escape='\\')).delete(synchronize_session=False)
+    User.query.filter(User.id.like('vc\\_%', escape='\\')).delete(synchronize_session=False)
+    db.session.commit()
+
+def counters():
+    db.session.expire_all()
+    msg = Message.query.get(MESSAGE_ID)
+    rows = dict(db.session.query(Vote.vote_type, db.func.count(Vote.id))
+                .filter(Vote.message_id == MESSAGE_ID).group_by(Vote.vote_type).all())
+    return msg.likes, msg.dislikes, rows.get('up', 0), rows.get('down', 0)
+
+def main():
+    with app.app_context():
+        db.create_all()
+        cleanup()
+        db.session.add(User(id=AUTHOR_ID))
+        db.session.add(Message(id=MESSAGE_ID, user_id=AUTHOR_ID, text='vote concurrency check', coord_x=127.0, coord_y=37.5))
+        db.session.commit()
+        # 사용자 미리 생성 (ensure_user 생성 경합은 검사 대상 아님)
+        db.session.add_all([User(id=f'vc_user_{i}') for i in range(USERS)] +
+                           [User(id=f'vc_dbl_{i}') for i in range(USERS // 10)])
+        db.session.commit()
+
+        ok = True
+        try:
+            # 1. 사용자별 시나리오 병렬 실행
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+                requests_sent = sum(pool.map(run_user, range(USERS)))
+            elapsed = time.perf_counter() - started
+
+            expected_up = sum(1 for i in range(USERS) if SCENARIOS[i % len(SCENARIOS)][1] == 'up')
+            expected_down = sum(1 for i in range(USERS) if SCENARIOS[i % len(SCENARIOS)][1] == 'down')
+            likes, dislikes, up_rows, down_rows = counters()
+            print(f"📊 {requests_sent}건 / {elapsed:.2f}초 ({requests_sent / elapsed:.0f} req/s, 스레드 {WORKERS})")
+            print(f"   likes={likes} (기대 {expected_up}, 행 {up_rows}) / dislikes={dislikes} (기대 {expected_down}, 행 {down_rows})")
+            if (likes, dislikes) != (expected_up, expected_down) or (likes, dislikes) != (up_rows, down_rows):
+                print("❌ 카운터 불일치")
+                ok = False
+
+            # 2. 같은 사용자 연타 (동일 요청 동시 2건)
+            with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+                list(pool.map(run_double_click, [i for i in range(USERS // 10) for _ in range(2)]))
+            likes, dislikes, up_rows, down_rows = counters()
+            print(f"   연타 후 likes={likes} (행 {up_rows}) / dislikes={dislikes} (행 {down_rows})")
+            if (likes, dislikes) != (up_rows, down_rows):
+                print("❌ 연타 후 카운터 불일치")
+                ok = False
+
+            stats = UserStats.query.get(AUTHOR_ID)
+            if stats is None or stats.likes_received != likes:
+                print(f"❌ 작성자 likes_received 불일치: {stats.likes_received if stats else None} != {likes}")
+                ok = False
+        finally:
+            cleanup()
+
+        print("✅ 투표 카운터 정확" if ok else "❌ 검사 실패")
+        return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
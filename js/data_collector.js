@@ -143,6 +143,9 @@ const DataCollector = {
 
     // 서버 전송 및 로컬 저장 통합
     async saveRoute(routeData) {
+        // [Phase 15] 재전송 시 서버 중복 저장 방지용 멱등성 키 (IDB 레코드와 함께 보관)
+        routeData.idempotencyKey = routeData.idempotencyKey || Utils.generateUUID();
+
         // 1. IndexedDB 저장 (항상 수행)
         const idbId = await this.saveToIndexedDB(routeData);
 
@@ -204,6 +207,7 @@ const DataCollector = {
                 startCoords: routeData.startCoords,
                 endCoords: routeData.endCoords,
                 approachPath: routeData.approachPath || [], // [Phase 7] 접근 경로 추가
+                idempotencyKey: routeData.idempotencyKey, // [Phase 15]
                 timestamp: Date.now(),
                 synced: false // 초기 상태는 미동기화
             };
@@ -216,10 +220,12 @@ const DataCollector = {
 
     async saveToServer(routeData) {
         const userId = AppState.userId;
+        // [Phase 15] 키가 없는 기존 IDB 레코드는 레코드 ID + 생성 시각으로 고정 키 생성
+        const idempotencyKey = routeData.idempotencyKey || `idb-${routeData.id}-${routeData.timestamp}`;
         try {
             const response = await fetch(`/api/users/${encodeURIComponent(userId)}/routes`, {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
+                headers: { 'Content-Type': 'application/json', 'Idempotency-Key': idempotencyKey },
                 body: JSON.stringify({
                     distance: routeData.distance,
                     duration: routeData.duration,
@@ -237,14 +243,34 @@ const DataCollector = {
         }
     },
 
-    async fetchTrajectories(bounds) {
+    // [Phase 15] 궤적 스트리밍 조회: 서버가 경로를 읽는 대로 onRoute(route, index) 호출
+    // signal: AbortController.signal (지도 이동 시 이전 요청 취소용)
+    // [Phase 10] zoom 전달 시 서버에서 해당 줌에 맞게 단순화된 궤적 수신
+    // 궤적은 압축 형식(pointsEncoded)으로 받음 → Utils.decodeTrack()으로 복원
+    async streamTrajectories(bounds, zoom, onRoute, signal) {
+        try {
+            const zoomParam = zoom != null ? `&zoom=${Math.round(zoom)}` : '';
+            const response = await fetch(
+                `/api/trajectories?bounds=${bounds.join(',')}${zoomParam}&format=polyline&stream=ndjson`,
+                { signal }
+            );
+            if (!response.ok) throw new Error('API fetch failed');
+            return await Utils.readNdjson(response, onRoute);
+        } catch (e) {
+            if (e.name !== 'AbortError') console.error('Failed to stream trajectories:', e);
+            return 0;
+        }
+    },
+
+    // [Phase 10] 궤적 밀도 격자 조회 (저배율 줌용 집계 레이어)
+    async fetchTrajectoryDensity(bounds) {
         try {
-            const response = await fetch(`/api/trajectories?bounds=${bounds.join(',')}`);
+            const response = await fetch(`/api/trajectories/density?bounds=${bounds.join(',')}`);
             if (!response.ok) throw new Error('API fetch failed');
             return await response.json();
         } catch (e) {
-            console.error('Failed to fetch trajectories:', e);
-            return [];
+            console.error('Failed to fetch trajectory density:', e);
+            return { cells: [] };
         }
     },
 
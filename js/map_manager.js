@@ -88,21 +88,55 @@ const MapManager = {
     },
 
     // 좌표로 주소 가져오기 (Reverse Geocoding)
-    async getAddressFromCoords(coords) {
-        try {
-            const lon = coords[0];
-            const lat = coords[1];
-            const response = await fetch(`/api/reverse-geo?x=${lon}&y=${lat}`);
-            const data = await response.json();
+    // [Phase 12] 개별 호출을 짧게 모아 /api/reverse-geo/batch 한 번으로 처리 (마커/스레드 등 동시 호출 병합)
+    reverseGeoQueue: [],
+    reverseGeoTimer: null,
+    REVERSE_GEO_BATCH_DELAY: 30, // ms
+    REVERSE_GEO_BATCH_MAX: 100, // 서버 REVERSE_GEO_BATCH_MAX와 동일
+
+    getAddressFromCoords(coords) {
+        const lon = coords[0];
+        const lat = coords[1];
+        return new Promise(resolve => {
+            this.reverseGeoQueue.push({ coords: [lon, lat], resolve });
+            if (this.reverseGeoQueue.length >= this.REVERSE_GEO_BATCH_MAX) {
+                this.flushReverseGeoQueue();
+            } else if (!this.reverseGeoTimer) {
+                this.reverseGeoTimer = setTimeout(() => this.flushReverseGeoQueue(), this.REVERSE_GEO_BATCH_DELAY);
+            }
+        }).then(address => address || `선택한 위치 (${lat.toFixed(5)}, ${lon.toFixed(5)})`);
+    },
+
+    async flushReverseGeoQueue() {
+        clearTimeout(this.reverseGeoTimer);
+        this.reverseGeoTimer = null;
+        const pending = this.reverseGeoQueue.splice(0);
+        if (pending.length === 0) return;
+        const addresses = await this.getAddressesFromCoords(pending.map(p => p.coords));
+        pending.forEach((p, i) => p.resolve(addresses[i]));
+    },
 
-            if (data.documents && data.documents.length > 0) {
-                const doc = data.documents[0];
+    // [Phase 12] 여러 좌표를 한 번의 요청으로 주소 변환
+    // coordsList: [[lon, lat], ...] → 같은 순서의 주소 문자열 배열 (실패 시 null)
+    async getAddressesFromCoords(coordsList) {
+        if (!coordsList || coordsList.length === 0) return [];
+        try {
+            const response = await fetch('/api/reverse-geo/batch', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ coords: coordsList })
+            });
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            const { results } = await response.json();
+            return results.map(r => {
+                const doc = r.status === 200 && r.data.documents && r.data.documents[0];
+                if (!doc) return null;
                 return doc.road_address ? doc.road_address.address_name : doc.address.address_name;
-            }
+            });
         } catch (e) {
             console.error('Reverse Geocoding Error:', e);
+            return coordsList.map(() => null);
         }
-        return `선택한 위치 (${lat.toFixed(5)}, ${lon.toFixed(5)})`;
     },
 
     // 클릭으로 목적지 설정
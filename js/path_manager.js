@@ -12,20 +12,32 @@ const PathManager = {
         const extent = AppState.map.getView().calculateExtent(AppState.map.getSize());
         const bounds = ol.proj.transformExtent(extent, 'EPSG:3857', 'EPSG:4326');
 
-        const trajectories = await DataCollector.fetchTrajectories(bounds);
-
         const source = AppState.trajectoryLayer.getSource();
-        source.clear();
 
         // [NEW] 줌 레벨에 따른 샘플링 및 간격 조절 상수
         const currentZoom = AppState.map?.getView()?.getZoom() || 15;
 
-        // 1. 줌 14 이하: 궤적 및 발자국 표시 안 함
+        // 1. 줌 14 이하: 개별 궤적 대신 밀도 격자 표시
         if (currentZoom <= 14) {
+            const density = await DataCollector.fetchTrajectoryDensity(bounds);
             source.clear();
+            density.cells.forEach(([lon, lat, traversals, userCount]) => {
+                source.addFeature(new ol.Feature({
+                    geometry: new ol.geom.Point(ol.proj.fromLonLat([lon, lat])),
+                    traversals: traversals,
+                    userCount: userCount,
+                    type: 'density'
+                }));
+            });
             return;
         }
 
+        // [Phase 10] 현재 줌에 맞게 단순화된 궤적 요청
+        // [Phase 15] 스트리밍 수신: 경로가 도착하는 대로 그림 (이전 요청은 취소)
+        if (this._trajectoryAbort) this._trajectoryAbort.abort();
+        const abort = new AbortController();
+        this._trajectoryAbort = abort;
+
         // 2. 경로 샘플링 비율 (수식: 15→20%, 16→40% ... 19→100%)
         const routeSampleRate = Math.min(1.0, (currentZoom - 14) * 0.2);
 
@@ -35,40 +47,58 @@ const PathManager = {
         // [NEW] 샘플링 간격 (1이면 모두 표시, 5면 1/5만 표시)
         const sampleStep = Math.round(1 / routeSampleRate);
 
-        trajectories.forEach((route, index) => {
+        let cleared = false;
+        await DataCollector.streamTrajectories(bounds, currentZoom, (route, index) => {
+            if (abort.signal.aborted) return;
+            // 첫 경로 도착 시 기존 궤적 제거 (응답 대기 중 빈 화면 방지)
+            if (!cleared) {
+                source.clear();
+                cleared = true;
+            }
+
             // [NEW] 샘플링: 비율에 따라 일부 경로만 처리
             // (랜덤 대신 인덱스 기반으로 화면 이동 시 깜빡임 방지)
             if (sampleStep > 1 && index % sampleStep !== 0) {
                 return;
             }
+            this.addTrajectoryFeatures(source, route, stepDist);
+        }, abort.signal);
+
+        // 범위 내 경로가 없으면 기존 궤적 제거
+        if (!cleared && !abort.signal.aborted) source.clear();
+    },
+
+    // 경로 1개의 라인 + 발자국 피처 추가
+    addTrajectoryFeatures(source, route, stepDist) {
+        // 1. 기본 라인 피처 (도로 이동)
+        const points = route.pointsEncoded !== undefined
+            ? Utils.decodeTrack(route.pointsEncoded)
+            : JSON.parse(route.points || '[]');
+        const coords = points.map(p => ol.proj.fromLonLat(p.coords));
+        if (coords.length < 2) return;
+
+        const lineFeature = new ol.Feature({
+            geometry: new ol.geom.LineString(coords),
+            userCount: route.userCount || 1,
+            type: 'road'
+        });
+        source.addFeature(lineFeature);
+
+        // 2. 발자국 피처 (접근로/골목 시각화)
+        const dist = new ol.geom.LineString(coords).getLength();
 
-            // 1. 기본 라인 피처 (도로 이동)
-            const coords = JSON.parse(route.points).map(p => ol.proj.fromLonLat(p.coords));
-            if (coords.length < 2) return;
+        for (let i = 0; i <= dist; i += stepDist) {
+            const fraction = i / dist;
+            const coord = lineFeature.getGeometry().getCoordinateAt(fraction);
 
-            const lineFeature = new ol.Feature({
-                geometry: new ol.geom.LineString(coords),
+            const footFeature = new ol.Feature({
+                geometry: new ol.geom.Point(coord),
                 userCount: route.userCount || 1,
-                type: 'road'
+                type: 'footprint',
+                rotation: this.getSegmentRotation(coords, fraction)
             });
-            source.addFeature(lineFeature);
-
-            // 2. 발자국 피처 (접근로/골목 시각화)
-            const dist = new ol.geom.LineString(coords).getLength();
-
-            for (let i = 0; i <= dist; i += stepDist) {
-                const fraction = i / dist;
-                const coord = lineFeature.getGeometry().getCoordinateAt(fraction);
-
-                const footFeature = new ol.Feature({
-                    geometry: new ol.geom.Point(coord),
-                    userCount: route.userCount || 1,
-                    type: 'footprint',
-                    rotation: this.getSegmentRotation(coords, fraction)
-                });
-                source.addFeature(footFeature);
-            }
-        });
+            source.addFeature(footFeature);
+        }
     },
 
     // 선분의 방향(회전) 계산
@@ -98,6 +128,15 @@ const PathManager = {
                     width: 3
                 })
             });
+        } else if (type === 'density') {
+            // [Phase 10] 밀도 셀: 고유 사용자 수에 비례한 원 크기
+            const userCount = feature.get('userCount') || 1;
+            return new ol.style.Style({
+                image: new ol.style.Circle({
+                    radius: Math.min(12, 3 + Math.log2(userCount + 1) * 2),
+                    fill: new ol.style.Fill({ color: 'rgba(0, 212, 170, 0.45)' })
+                })
+            });
         } else if (type === 'footprint') {
             // [FIX] 발자국 표시 줌 미만에서는 발자국 숨김
             if (currentZoom < minZoom) {
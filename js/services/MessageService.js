@@ -15,6 +15,21 @@ const MessageService = {
         return (Date.now() - parseInt(savedTime)) < 5 * 60 * 1000;
     },
 
+    // [Phase 15] 멱등성 키를 붙여 POST (네트워크 오류 시 같은 키로 1회 재전송 → 서버에서 중복 생성 안 됨)
+    async postIdempotent(path, body, idempotencyKey = Utils.generateUUID()) {
+        const options = {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json', 'Idempotency-Key': idempotencyKey },
+            body: JSON.stringify(body)
+        };
+        try {
+            return await fetch(this.getApiUrl(path), options);
+        } catch (error) {
+            console.warn('POST 재전송:', path, error);
+            return await fetch(this.getApiUrl(path), options);
+        }
+    },
+
     _lastFetchTime: 0,
     canFetch() {
         return Date.now() - this._lastFetchTime > 3000; // 3초 쿨다운
@@ -66,19 +81,31 @@ const MessageService = {
         }
     },
 
+    // [Phase 14] 화면 범위의 메시지 클러스터 조회 (응답 크기는 메시지 수와 무관하게 일정)
+    // bounds: [minLon, minLat, maxLon, maxLat]
+    // 반환: { level, cellSize, clusters: [{ coords: [lon, lat], count, topMessageIds }] }
+    async fetchMessageClusters(bounds) {
+        const [minX, minY, maxX, maxY] = bounds;
+        const params = `cluster=1&min_x=${minX}&max_x=${maxX}&min_y=${minY}&max_y=${maxY}`;
+        try {
+            const response = await fetch(this.getApiUrl(`/api/messages?${params}`));
+            if (!response.ok) throw new Error('API fetch failed');
+            return await response.json();
+        } catch (error) {
+            console.error('fetchMessageClusters 실패:', error);
+            return { clusters: [] };
+        }
+    },
+
     // 새 메시지 저장
     async saveMessage(messageData) {
         try {
-            const response = await fetch(this.getApiUrl('/api/messages'), {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    userId: messageData.userId,
-                    text: messageData.text,
-                    tags: messageData.tags || '',
-                    coords: messageData.coords,
-                    address: messageData.address || ''
-                })
+            const response = await this.postIdempotent('/api/messages', {
+                userId: messageData.userId,
+                text: messageData.text,
+                tags: messageData.tags || '',
+                coords: messageData.coords,
+                address: messageData.address || ''
             });
 
             if (!response.ok) throw new Error('Save failed');
@@ -133,13 +160,9 @@ const MessageService = {
     // 댓글 작성
     async postComment(messageId, userId, text) {
         try {
-            const response = await fetch(this.getApiUrl(`/api/messages/${messageId}/comments`), {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    userId: userId,
-                    text: text
-                })
+            const response = await this.postIdempotent(`/api/messages/${messageId}/comments`, {
+                userId: userId,
+                text: text
             });
 
             if (!response.ok) throw new Error('Comment failed');
@@ -24,7 +24,10 @@ const SocialManager = {
         // 지도 이동 시 말풍선 위치 업데이트
         if (AppState.map) {
             AppState.map.on('postrender', () => this.updateBubblePositions());
-            AppState.map.on('moveend', () => this.showNearbyMessages(true)); // 지도 이동 후 목록 갱신
+            AppState.map.on('moveend', () => {
+                this.showNearbyMessages(true); // 지도 이동 후 목록 갱신
+                this.renderMessageMarkers(); // [Phase 14] 줌에 따라 클러스터/개별 마커 전환
+            });
         }
     },
 
@@ -1336,24 +1339,75 @@ const SocialManager = {
 
     // 마커 레이어 (지도상 아이콘)
     initMessageLayer() {
+        const markerStyle = new ol.style.Style({
+            image: new ol.style.Circle({
+                radius: 6,
+                fill: new ol.style.Fill({ color: Config.COLORS.SOCIAL_MARKER }),
+                stroke: new ol.style.Stroke({ color: Config.COLORS.WHITE, width: 2 })
+            })
+        });
         this.messageLayer = new ol.layer.Vector({
             source: new ol.source.Vector(),
-            style: new ol.style.Style({
-                image: new ol.style.Circle({
-                    radius: 6,
-                    fill: new ol.style.Fill({ color: Config.COLORS.SOCIAL_MARKER }),
-                    stroke: new ol.style.Stroke({ color: Config.COLORS.WHITE, width: 2 })
-                })
-            }),
+            // [Phase 14] 클러스터는 메시지 수에 비례한 원 + 개수 표시
+            style: (feature) => {
+                const count = feature.get('count');
+                if (!count) return markerStyle;
+                return new ol.style.Style({
+                    image: new ol.style.Circle({
+                        radius: Math.min(28, 10 + Math.log2(count) * 3),
+                        fill: new ol.style.Fill({ color: Config.COLORS.SOCIAL_MARKER }),
+                        stroke: new ol.style.Stroke({ color: Config.COLORS.WHITE, width: 2 })
+                    }),
+                    text: new ol.style.Text({
+                        text: String(count),
+                        fill: new ol.style.Fill({ color: Config.COLORS.WHITE }),
+                        font: 'bold 12px sans-serif'
+                    })
+                });
+            },
             zIndex: 50
         });
-        if (AppState.map) AppState.map.addLayer(this.messageLayer);
+        if (AppState.map) {
+            AppState.map.addLayer(this.messageLayer);
+            // 클러스터 클릭 → 해당 위치로 확대
+            AppState.map.on('singleclick', (evt) => {
+                AppState.map.forEachFeatureAtPixel(evt.pixel, (feature) => {
+                    if (!feature.get('count')) return false;
+                    const view = AppState.map.getView();
+                    view.animate({ center: feature.getGeometry().getCoordinates(), zoom: view.getZoom() + 2, duration: 300 });
+                    return true;
+                }, { layerFilter: layer => layer === this.messageLayer });
+            });
+        }
         this.renderMessageMarkers();
     },
 
+    _clusterRequestId: 0,
     renderMessageMarkers() {
         if (!this.messageLayer) return;
         const source = this.messageLayer.getSource();
+
+        // [Phase 14] 넓은 화면은 서버 클러스터 조회 (응답 크기가 메시지 수와 무관)
+        const view = AppState.map?.getView();
+        if (view && view.getZoom() < Config.MESSAGE_CLUSTER_MAX_ZOOM) {
+            const extent = view.calculateExtent(AppState.map.getSize());
+            const bounds = ol.proj.transformExtent(extent, 'EPSG:3857', 'EPSG:4326');
+            const requestId = ++this._clusterRequestId;
+            MessageService.fetchMessageClusters(bounds).then(({ clusters }) => {
+                if (requestId !== this._clusterRequestId) return; // 더 최근 요청이 있으면 무시
+                source.clear();
+                clusters.forEach(c => {
+                    source.addFeature(new ol.Feature({
+                        geometry: new ol.geom.Point(ol.proj.fromLonLat(c.coords)),
+                        count: c.count,
+                        topMessageIds: c.topMessageIds
+                    }));
+                });
+            });
+            return;
+        }
+
+        this._clusterRequestId++; // 진행 중인 클러스터 응답 무시
         source.clear();
         this.messages.forEach(msg => {
             if (!msg.coords) return;
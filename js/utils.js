@@ -156,6 +156,67 @@ const Utils = {
         return simplifyRecursive(points, 0, points.length - 1, epsilon);
     },
 
+    // [Phase 10] 서버 압축 궤적 디코딩 (server.py encode_track 형식)
+    // 첫 글자: 차원 수('2' = 위도/경도, '3' = + timestamp), 이후 델타 polyline (1e-6도 정밀도)
+    // timestamp는 32bit를 넘으므로 비트 연산 대신 산술 연산 사용
+    // 반환: [{coords: [lon, lat], timestamp?}, ...]
+    decodeTrack(encoded) {
+        if (!encoded) return [];
+        const dims = Number(encoded[0]);
+        const values = [];
+        let result = 0;
+        let factor = 1;
+        for (let i = 1; i < encoded.length; i++) {
+            const b = encoded.charCodeAt(i) - 63;
+            result += (b % 32) * factor;
+            factor *= 32;
+            if (b < 32) {
+                values.push(result % 2 === 1 ? -(result + 1) / 2 : result / 2);
+                result = 0;
+                factor = 1;
+            }
+        }
+
+        const points = [];
+        const prev = new Array(dims).fill(0);
+        for (let i = 0; i + dims <= values.length; i += dims) {
+            for (let d = 0; d < dims; d++) prev[d] += values[i + d];
+            const point = { coords: [prev[1] / 1e6, prev[0] / 1e6] };
+            if (dims === 3) point.timestamp = prev[2];
+            points.push(point);
+        }
+        return points;
+    },
+
+    // [Phase 15] NDJSON 스트리밍 응답을 한 줄(객체)씩 읽으며 onItem(item, index) 호출
+    // 응답 전체를 기다리지 않고 도착하는 대로 처리 → 반환: 처리한 객체 수
+    async readNdjson(response, onItem) {
+        let count = 0;
+        const handleLine = (line) => {
+            if (line.trim()) onItem(JSON.parse(line), count++);
+        };
+
+        // ReadableStream 미지원 브라우저는 전체 수신 후 처리
+        if (!response.body || !response.body.getReader) {
+            (await response.text()).split('\n').forEach(handleLine);
+            return count;
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop(); // 마지막 조각은 다음 청크와 이어 붙임
+            lines.forEach(handleLine);
+        }
+        handleLine(buffer + decoder.decode());
+        return count;
+    },
+
     // 두 좌표 간 거리 계산 (Haversine formula, 단위: 미터)
     calculateDistance(coord1, coord2) {
         if (!coord1 || !coord2) return 0;
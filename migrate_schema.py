@@ -0,0 +1,286 @@
+"""
+DB 스키마 마이그레이션 + 백필 스크립트 (SQLite / PostgreSQL 공용)
+- server.py 모델 기준으로 기존 테이블에 누락된 컬럼/인덱스를 추가하고 FK 삭제 동작(ON DELETE)을 맞춥니다.
+  모델에서 제거된 인덱스(OBSOLETE_INDEXES)는 삭제합니다.
+  (db.create_all()은 새 테이블만 만들고 기존 테이블은 변경하지 않음)
+- 파생 컬럼(공간 인덱스 등)이 비어 있는 기존 레코드를 채웁니다.
+
+사용법:
+    python migrate_schema.py            # 컬럼/인덱스 추가 + 전체 백필
+    python migrate_schema.py --no-backfill
+    python migrate_schema.py --drop-json    # 압축 인코딩 후 레거시 JSON 궤적 컬럼 비우기
+"""
+import sys
+import json
+from sqlalchemy import inspect, text
+
+from server import (
+    app, db, Route, RouteLOD, RouteCell, Message, Comment, MessageCluster,
+    index_route_geometry, build_route_lods, build_route_cells, encode_track, update_trajectory_cells,
+    reconcile_user_stats, update_message_clusters, compute_cluster_top
+)
+
+BATCH_SIZE = 500
+DROP_JSON = '--drop-json' in sys.argv
+# 모델에서 제거된 인덱스 (이전 버전으로 생성된 DB에서 삭제)
+# - route 좌표 인덱스: 화면 범위 조회가 RouteCell 격자 셀 키로 대체됨
+OBSOLETE_INDEXES = ['ix_route_start_lonlat', 'ix_route_end_lonlat', 'ix_route_bbox']
+
+def add_missing_columns():
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {c['name'] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            col_type = column.type.compile(dialect=db.engine.dialect)
+            print(f"➕ {table.name}.{column.name} ({col_type}) 추가")
+            with db.engine.begin() as conn:
+                conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {col_type}'))
+
+def update_foreign_key_actions():
+    """모델의 ondelete 설정이 기존 FK 제약과 다르면 제약 재생성 (PostgreSQL)
+
+    SQLite는 제약 변경(ALTER)을 지원하지 않으며 FK 검사도 기본 비활성이라 건너뜀
+    """
+    if db.engine.dialect.name != 'postgresql':
+        return
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = inspector.get_foreign_keys(table.name)
+        for fk in table.foreign_key_constraints:
+            if not fk.ondelete:
+                continue
+            columns = [c.name for c in fk.columns]
+            for current in existing:
+                if current['constrained_columns'] != columns or current['referred_table'] != fk.referred_table.name:
+                    continue
+                if (current.get('options') or {}).get('ondelete', '').upper() == fk.ondelete.upper():
+                    continue
+                name = current['name']
+                referred = ', '.join(f'"{e.column.name}"' for e in fk.elements)
+                cols = ', '.join(f'"{c}"' for c in columns)
+                print(f"🔗 {table.name}.{name} → ON DELETE {fk.ondelete}")
+                with db.engine.begin() as conn:
+                    conn.execute(text(f'ALTER TABLE "{table.name}" DROP CONSTRAINT "{name}"'))
+                    conn.execute(text(
+                        f'ALTER TABLE "{table.name}" ADD CONSTRAINT "{name}" FOREIGN KEY ({cols}) '
+                        f'REFERENCES "{fk.referred_table.name}" ({referred}) ON DELETE {fk.ondelete}'
+                    ))
+
+def create_missing_indexes():
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+    print("✅ 인덱스 확인 완료")
+
+def drop_obsolete_indexes():
+    for name in OBSOLETE_INDEXES:
+        with db.engine.begin() as conn:
+            conn.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+    print(f"✅ 사용하지 않는 인덱스 정리 완료: {', '.join(OBSOLETE_INDEXES)}")
+
+def backfill_route_encoding():
+    """JSON 궤적만 있는 Route 레코드를 압축 형식(points_enc/approach_enc)으로 인코딩
+
+    --drop-json 지정 시 인코딩 후 points_json/approach_path를 비움
+    (좌표/timestamp 외 점별 부가정보(heading 등)는 보존되지 않음)
+    """
+    total = 0
+    last_id = 0
+    while True:
+        routes = (Route.query
+                  .filter(Route.id > last_id, Route.points_enc.is_(None), Route.points_json.isnot(None))
+                  .order_by(Route.id)
+                  .limit(BATCH_SIZE)
+                  .all())
+        if not routes:
+            break
+        for r in routes:
+            r.points_enc = encode_track(r.track_points())
+            r.approach_enc = encode_track(r.approach_points())
+            if DROP_JSON:
+                r.points_json = None
+                r.approach_path = None
+        last_id = routes[-1].id
+        db.session.commit()
+        total += len(routes)
+        print(f"  ... {total}개 처리 (마지막 ID {last_id})")
+    print(f"✅ Route 궤적 압축 인코딩 완료: {total}개")
+
+def backfill_route_geometry():
+    """공간 인덱스 컬럼(시작/끝점, Bounding Box)이 비어 있는 Route 레코드 채우기"""
+    total = 0
+    last_id = 0
+    while True:
+        routes = (Route.query
+                  .filter(Route.id > last_id, Route.min_lon.is_(None))
+                  .order_by(Route.id)
+                  .limit(BATCH_SIZE)
+                  .all())
+        if not routes:
+            break
+        for r in routes:
+            index_route_geometry(r)
+        last_id = routes[-1].id
+        db.session.commit()
+        total += len(routes)
+        print(f"  ... {total}개 처리 (마지막 ID {last_id})")
+    print(f"✅ Route 공간 인덱스 백필 완료: {total}개")
+
+def backfill_route_lods():
+    """단순화 궤적(RouteLOD)이 없거나 구형식인 Route 레코드에 대해 (재)생성"""
+    total = 0
+    last_id = 0
+    has_lod = db.exists().where(RouteLOD.route_id == Route.id, RouteLOD.points_enc.isnot(None))
+    while True:
+        routes = (Route.query
+                  .filter(Route.id > last_id, ~has_lod)
+                  .order_by(Route.id)
+                  .limit(BATCH_SIZE)
+                  .all())
+        if not routes:
+            break
+        # 구형식 LOD 삭제 후 재생성
+        RouteLOD.query.filter(RouteLOD.route_id.in_([r.id for r in routes])).delete(synchronize_session=False)
+        for r in routes:
+            for lod in build_route_lods(r):
+                lod.route_id = r.id
+                db.session.add(lod)
+        last_id = routes[-1].id
+        db.session.commit()
+        total += len(routes)
+        print(f"  ... {total}개 처리 (마지막 ID {last_id})")
+    print(f"✅ Route 단순화 궤적 백필 완료: {total}개")
+
+def backfill_route_cells():
+    """격자 셀 키(RouteCell)가 없는 Route 레코드에 대해 생성"""
+    total = 0
+    last_id = 0
+    has_cell = db.exists().where(RouteCell.route_id == Route.id)
+    while True:
+        routes = (Route.query
+                  .filter(Route.id > last_id, ~has_cell)
+                  .order_by(Route.id)
+                  .limit(BATCH_SIZE)
+                  .all())
+        if not routes:
+            break
+        for r in routes:
+            r.cells = build_route_cells(r)
+        last_id = routes[-1].id
+        db.session.commit()
+        total += len(routes)
+        print(f"  ... {total}개 처리 (마지막 ID {last_id})")
+    print(f"✅ Route 격자 셀 키 백필 완료: {total}개")
+
+def backfill_trajectory_cells():
+    """밀도 격자에 반영되지 않은 Route 레코드 반영 (격자 도입 이전 데이터)
+
+    진행 여부는 경로별 표시(density_indexed)로 판단 → 배포 후 마이그레이션 전에 저장된 경로가 있어도 누락 없음
+    """
+    total = 0
+    last_id = 0
+    pending = db.or_(Route.density_indexed.is_(None), Route.density_indexed == db.false())
+    while True:
+        routes = Route.query.filter(Route.id > last_id, pending).order_by(Route.id).limit(BATCH_SIZE).all()
+        if not routes:
+            break
+        update_trajectory_cells(*routes)
+        last_id = routes[-1].id
+        db.session.commit()
+        total += len(routes)
+        print(f"  ... {total}개 처리 (마지막 ID {last_id})")
+    print(f"✅ 밀도 격자 백필 완료: {total}개 경로")
+
+def backfill_user_stats():
+    """사용자 통계 카운터를 원본 테이블 기준으로 재계산 (누락 사용자 생성 + 어긋난 행 수정)
+
+    배포 후 마이그레이션 전에 작성된 활동은 증분(delta)만 담긴 행을 만들므로,
+    테이블이 비어 있는지와 무관하게 항상 실행 (다른 백필 이후 마지막 단계)
+    """
+    fixed = reconcile_user_stats()
+    print(f"✅ 사용자 통계 재계산 완료: {fixed}명 수정")
+
+def backfill_message_comment_counts():
+    """comment_count가 비어 있는 Message 레코드를 실제 댓글 수로 채우기"""
+    counts = db.session.query(Comment.message_id, db.func.count(Comment.id)) \
+        .join(Message, Message.id == Comment.message_id) \
+        .filter(Message.comment_count.is_(None)) \
+        .group_by(Comment.message_id).all()
+    for message_id, count in counts:
+        Message.query.filter_by(id=message_id).update({Message.comment_count: count})
+    # 댓글이 없는 나머지 메시지는 0
+    Message.query.filter(Message.comment_count.is_(None)).update({Message.comment_count: 0})
+    db.session.commit()
+    print(f"✅ 메시지 댓글 수 백필 완료: 댓글 있는 메시지 {len(counts)}개")
+
+def backfill_message_clusters():
+    """클러스터 격자에 반영되지 않은 Message 레코드 반영 (격자 도입 이전 데이터)
+
+    진행 여부는 메시지별 표시(clustered)로 판단 → 배포 후 마이그레이션 전에 작성된 메시지가 있어도 누락 없음
+    """
+    total = 0
+    last_id = ''
+    pending = db.or_(Message.clustered.is_(None), Message.clustered == db.false())
+    while True:
+        messages = Message.query.filter(Message.id > last_id, pending).order_by(Message.id).limit(BATCH_SIZE).all()
+        if not messages:
+            break
+        for m in messages:
+            update_message_clusters(m, 1)
+        last_id = messages[-1].id
+        db.session.commit()
+        total += len(messages)
+        print(f"  ... {total}개 처리 (마지막 ID {last_id})")
+    print(f"✅ 메시지 클러스터 백필 완료: {total}개 메시지")
+
+def backfill_message_cluster_tops():
+    """대표 메시지 목록(top_messages)이 없는 클러스터 셀을 메시지 테이블로부터 채우기"""
+    total = 0
+    while True:
+        cells = MessageCluster.query.filter(MessageCluster.top_messages.is_(None)).limit(BATCH_SIZE).all()
+        if not cells:
+            break
+        for c in cells:
+            c.top_messages = json.dumps(compute_cluster_top(c.level, c.cx, c.cy))
+        db.session.commit()
+        total += len(cells)
+        print(f"  ... {total}개 셀 처리")
+    print(f"✅ 클러스터 대표 메시지 백필 완료: {total}개 셀")
+
+BACKFILLS = [
+    backfill_route_encoding,
+    backfill_route_geometry,
+    backfill_route_lods,
+    backfill_route_cells,
+    backfill_trajectory_cells,
+    backfill_message_comment_counts,
+    backfill_message_clusters,
+    backfill_message_cluster_tops,
+    backfill_user_stats,  # 원본 테이블 전체 기준 재계산이므로 마지막
+]
+
+def migrate(run_backfill=True):
+    with app.app_context():
+        try:
+            add_missing_columns()
+            update_foreign_key_actions()
+            drop_obsolete_indexes()
+            create_missing_indexes()
+            if run_backfill:
+                for backfill in BACKFILLS:
+                    backfill()
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Migration failed: {e}")
+            raise
+
+if __name__ == "__main__":
+    migrate(run_backfill='--no-backfill' not in sys.argv)
@@ -0,0 +1,78 @@
+"""
+정적 파일 사전 압축 스크립트 (배포/빌드 시 실행)
+- 정적 파일마다 .gz (brotli 설치 시 .br 포함) 압축본을 생성합니다.
+- server.py는 Accept-Encoding에 맞는 압축본이 원본보다 최신이면 압축본을 그대로 전송합니다.
+  (요청마다 압축하지 않으므로 최고 압축률 사용)
+
+사용법:
+    python precompress_static.py           # 변경된 파일만 압축
+    python precompress_static.py --clean   # 생성된 압축본 삭제
+"""
+import os
+import sys
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIRS = ['.', 'js', 'css', 'dist']  # '.'은 하위 폴더 제외 (루트 파일만)
+EXTENSIONS = ('.html', '.js', '.css', '.json', '.svg', '.txt')
+MIN_SIZE = 1024  # 이보다 작은 파일은 압축 이득이 거의 없음
+
+def static_files():
+    for static_dir in STATIC_DIRS:
+        base = os.path.join(ROOT, static_dir)
+        if not os.path.isdir(base):
+            continue
+        for dirpath, dirnames, filenames in os.walk(base):
+            if static_dir == '.':
+                dirnames.clear()
+            for name in filenames:
+                if name.endswith(EXTENSIONS):
+                    yield os.path.join(dirpath, name)
+
+def write_variant(path, suffix, data):
+    """압축본이 원본보다 작을 때만 저장 → 생성 여부"""
+    target = path + suffix
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+        return False
+    compressed = gzip.compress(data, compresslevel=9, mtime=0) if suffix == '.gz' else brotli.compress(data, quality=11)
+    if len(compressed) >= len(data):
+        return False
+    with open(target, 'wb') as f:
+        f.write(compressed)
+    return True
+
+def precompress():
+    written = 0
+    total_before = total_after = 0
+    for path in static_files():
+        if os.path.getsize(path) < MIN_SIZE:
+            continue
+        with open(path, 'rb') as f:
+            data = f.read()
+        suffixes = ['.gz'] + (['.br'] if brotli is not None else [])
+        for suffix in suffixes:
+            if write_variant(path, suffix, data):
+                written += 1
+                total_before += len(data)
+                total_after += os.path.getsize(path + suffix)
+                print(f"  {os.path.relpath(path + suffix, ROOT)} ({len(data)} → {os.path.getsize(path + suffix)} bytes)")
+    if brotli is None:
+        print("⚠️ brotli 미설치 - .gz만 생성 (pip install brotli)")
+    print(f"✅ 압축본 {written}개 생성 ({total_before} → {total_after} bytes)")
+
+def clean():
+    removed = 0
+    for path in static_files():
+        for suffix in ('.gz', '.br'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+                removed += 1
+    print(f"✅ 압축본 {removed}개 삭제")
+
+if __name__ == "__main__":
+    clean() if '--clean' in sys.argv else precompress()
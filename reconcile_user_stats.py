@@ -0,0 +1,21 @@
+"""
+사용자 통계 카운터(UserStats) 재계산 스크립트
+- Route / Message / Comment / SavedMessage 원본 테이블에서 다시 집계하여
+  증분 갱신 과정에서 생긴 오차(drift)를 바로잡습니다.
+- 주기 실행(cron) 또는 장애 복구 후 수동 실행용
+"""
+from server import app, db, reconcile_user_stats
+
+def main():
+    with app.app_context():
+        try:
+            print("🔍 사용자 통계 재계산 중...")
+            fixed = reconcile_user_stats()
+            print(f"✅ 완료: {fixed}명 수정")
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ 재계산 실패: {e}")
+            raise
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,38 @@
-from flask import Flask, request, jsonify, send_from_directory, render_template
+from flask import Flask, request, jsonify, send_from_directory, render_template, url_for, make_response, Response, stream_with_context, g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
-import urllib.request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from werkzeug.security import safe_join
+import http.client
+import queue
+import socket
 import urllib.parse
 import os
+import json
+import math
+import re
+import time
+import hashlib
+import base64
+import gzip
+import zlib
+import mimetypes
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
 from dotenv import load_dotenv
 
+# [Phase 15] brotli는 선택 설치 (없으면 gzip만 사용)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 load_dotenv()
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 
 # KST 타임존 설정
@@ -28,10 +53,11 @@ if not DATABASE_URL:
 
 print(f"Using Database: {DATABASE_URL}")
 
-app = Flask(__name__, static_folder='.', static_url_path='', template_folder='templates')
+# [Phase 15] 정적 파일은 serve_static()에서 직접 처리 (사전 압축본 + 캐시 정책)
+app = Flask(__name__, static_folder=None, template_folder='templates')
 app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-CORS(app)
+CORS(app, expose_headers=['X-Next-Cursor', 'Link', 'ETag'])
 
 db = SQLAlchemy(app)
 
@@ -52,7 +78,7 @@ class User(db.Model):
     dist_wheelchair = db.Column(db.Float, default=0.0)
     dist_vehicle = db.Column(db.Float, default=0.0)
     bio = db.Column(db.String(200))
-    created_at = db.Column(db.DateTime, default=get_kst_now)
+    created_at = db.Column(db.DateTime, default=get_kst_now, index=True)  # [Phase 15] 관리자 목록 keyset 정렬
 
     def to_dict(self):
         return {
@@ -82,10 +108,18 @@ class Message(db.Model):
     shares = db.Column(db.Integer, default=0)
     edited = db.Column(db.Boolean, default=False)
     timestamp = db.Column(db.DateTime, default=get_kst_now, index=True)
+    comment_count = db.Column(db.Integer, default=0)  # [Phase 11] 댓글 수 (add/delete_comment에서 갱신)
+    clustered = db.Column(db.Boolean, default=False)  # [Phase 14] 클러스터 격자 반영 여부 (마이그레이션 백필 진행 표시)
     comments = db.relationship('Comment', backref='message', lazy=True, cascade='all, delete-orphan')
     # [Phase 5] N+1 쿼리 최적화용 관계
     author = db.relationship('User', lazy='joined')
 
+    # [Phase 13] 커서 페이지네이션 정렬 순서와 동일한 복합 인덱스
+    __table_args__ = (
+        db.Index('ix_message_likes_ts_id', 'likes', 'timestamp', 'id'),
+        db.Index('ix_message_user_ts_id', 'user_id', 'timestamp', 'id'),
+    )
+
     def to_dict(self, include_comments=False):
         # [Phase 5] N+1 없이 author 관계 활용
         nickname = self.author.nickname if self.author else self.user_id
@@ -104,7 +138,7 @@ class Message(db.Model):
             'shares': self.shares,
             'edited': self.edited,
             'timestamp': int(self.timestamp.replace(tzinfo=KST).timestamp() * 1000),
-            'commentCount': len(self.comments)
+            'commentCount': self.comment_count or 0  # 댓글 로드 없이 카운터 사용 (N+1 방지)
         }
         if include_comments:
             result['comments'] = [c.to_dict() for c in sorted(self.comments, key=lambda x: x.timestamp)]
@@ -119,6 +153,8 @@ class Comment(db.Model):
     # [Phase 5] N+1 쿼리 최적화용 관계
     author = db.relationship('User', lazy='joined')
 
+    __table_args__ = (db.Index('ix_comment_user_ts_id', 'user_id', 'timestamp', 'id'),)
+
     def to_dict(self):
         # [Phase 5] N+1 없이 author 관계 활용
         nickname = self.author.nickname if self.author else self.user_id
@@ -149,12 +185,61 @@ class Route(db.Model):
     mode = db.Column(db.String(20))  # 'pedestrian' or 'wheelchair'
     start_coords = db.Column(db.String(50))  # "lon,lat"
     end_coords = db.Column(db.String(50))  # "lon,lat"
-    points_json = db.Column(db.Text)  # 전체 이동 궤적 (JSON string of coordinates)
-    approach_path = db.Column(db.Text)  # [Phase 6] 도보 접근 경로 (100m zone)
+    points_json = db.Column(db.Text)  # 전체 이동 궤적 (JSON string of coordinates) - 레거시, 신규 저장은 points_enc
+    approach_path = db.Column(db.Text)  # [Phase 6] 도보 접근 경로 (100m zone) - 레거시, 신규 저장은 approach_enc
     timestamp = db.Column(db.DateTime, default=get_kst_now, index=True)
+    # [Phase 10] 압축 궤적 (encode_track 형식: 델타 + 고정소수점 polyline)
+    points_enc = db.Column(db.Text)
+    approach_enc = db.Column(db.Text)
+    # [Phase 10] 공간 인덱스용 숫자 좌표 (start_coords/end_coords 문자열에서 파생)
+    start_lon = db.Column(db.Float)
+    start_lat = db.Column(db.Float)
+    end_lon = db.Column(db.Float)
+    end_lat = db.Column(db.Float)
+    # [Phase 10] 경로 전체의 Bounding Box (화면과 교차하는 경로 조회용)
+    min_lon = db.Column(db.Float)
+    min_lat = db.Column(db.Float)
+    max_lon = db.Column(db.Float)
+    max_lat = db.Column(db.Float)
+    # [Phase 10] 밀도 격자(TrajectoryCell) 반영 여부 (마이그레이션 백필 진행 표시)
+    density_indexed = db.Column(db.Boolean, default=False)
+
+    # 화면 범위 조회는 RouteCell(격자 셀 키)로 인덱스 탐색 → 좌표 컬럼 자체에는 인덱스를 두지 않음
+    # (복합 인덱스는 첫 컬럼(min_lon)으로만 범위 탐색이 가능해 교차 판정에 비효율적)
+    __table_args__ = (
+        db.Index('ix_route_user_ts_id', 'user_id', 'timestamp', 'id'),
+    )
+    # [Phase 10] 줌 레벨별 단순화 궤적 (LOD)
+    # DB 제약(ON DELETE CASCADE)에 삭제를 맡김 → 원시 DELETE FROM route(cleanup_duplicates.py)도 안전
+    lods = db.relationship('RouteLOD', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
+    cells = db.relationship('RouteCell', lazy=True, cascade='all, delete-orphan', passive_deletes=True)
+
+    def track_points(self):
+        """전체 궤적 [(lon, lat, timestamp), ...] (압축 컬럼 우선, 레거시 JSON 호환)"""
+        return decode_track(self.points_enc) if self.points_enc else parse_track(self.points_json)
+
+    def approach_points(self):
+        """접근 경로 [(lon, lat, timestamp), ...]"""
+        return decode_track(self.approach_enc) if self.approach_enc else parse_track(self.approach_path)
+
+    def to_dict(self, lod_enc=None, compact=False):
+        """궤적 직렬화
+
+        - lod_enc: 원본 대신 사용할 단순화 궤적 (접근 경로 생략)
+        - compact: JSON 대신 압축 문자열(pointsEncoded/approachPathEncoded)로 응답
+        """
+        if lod_enc is not None:
+            points_enc, approach_enc = lod_enc, None
+        else:
+            points_enc = self.points_enc
+            approach_enc = self.approach_enc
+            # 레거시 레코드 (마이그레이션 전)
+            if compact and points_enc is None and self.points_json:
+                points_enc = encode_track(self.track_points())
+            if compact and approach_enc is None and self.approach_path:
+                approach_enc = encode_track(self.approach_points())
 
-    def to_dict(self):
-        return {
+        result = {
             'id': self.id,
             'userId': self.user_id,
             'distance': self.distance,
@@ -162,10 +247,66 @@ class Route(db.Model):
             'mode': self.mode,
             'startCoords': self.start_coords,
             'endCoords': self.end_coords,
-            'points': self.points_json, # 프론트에서 JSON.parse() 필요
-            'approachPath': getattr(self, 'approach_path', None),  # [Phase 6] 안전한 접근
             'timestamp': int(self.timestamp.replace(tzinfo=KST).timestamp() * 1000)
         }
+        if compact:
+            result['pointsEncoded'] = points_enc
+            result['approachPathEncoded'] = approach_enc
+        elif lod_enc is not None:
+            result['points'] = track_to_json(decode_track(lod_enc))
+            result['approachPath'] = None
+        else:
+            # 프론트에서 JSON.parse() 필요
+            result['points'] = track_to_json(decode_track(points_enc)) if points_enc else self.points_json
+            result['approachPath'] = track_to_json(decode_track(approach_enc)) if approach_enc else self.approach_path
+        return result
+
+class RouteLOD(db.Model):
+    """[Phase 10] 줌 레벨별로 미리 단순화해 둔 궤적 (Douglas-Peucker)"""
+    route_id = db.Column(db.Integer, db.ForeignKey('route.id', ondelete='CASCADE'), primary_key=True)
+    level = db.Column(db.Integer, primary_key=True)  # 기준 줌 레벨 (LOD_LEVELS)
+    points_enc = db.Column(db.Text)  # encode_track 형식 (경위도 2차원)
+    point_count = db.Column(db.Integer)
+
+class RouteCell(db.Model):
+    """[Phase 10] 경로가 지나가는 격자 셀 (ROUTE_CELL_SIZE 고정 크기, 화면 범위 조회용 공간 키)
+
+    PK (cx, cy, route_id) 순서 → 화면 범위의 cx 구간 탐색 + cy 필터를 인덱스만으로 처리
+    """
+    cx = db.Column(db.Integer, primary_key=True)  # floor(lon / ROUTE_CELL_SIZE)
+    cy = db.Column(db.Integer, primary_key=True)  # floor(lat / ROUTE_CELL_SIZE)
+    route_id = db.Column(db.Integer, db.ForeignKey('route.id', ondelete='CASCADE'), primary_key=True, index=True)
+
+class TrajectoryCell(db.Model):
+    """[Phase 10] 궤적 밀도 격자 셀 (경로 저장 시 증분 갱신)"""
+    level = db.Column(db.Integer, primary_key=True)  # DENSITY_CELL_SIZES 인덱스
+    mode = db.Column(db.String(20), primary_key=True)  # 이동 수단 ('all' = 전체 합산)
+    cx = db.Column(db.Integer, primary_key=True)  # floor(lon / cell_size)
+    cy = db.Column(db.Integer, primary_key=True)  # floor(lat / cell_size)
+    traversals = db.Column(db.Integer, default=0)  # 셀을 지나간 경로 수
+    user_count = db.Column(db.Integer, default=0)  # 셀을 지나간 고유 사용자 수
+
+class MessageCluster(db.Model):
+    """[Phase 14] 메시지 클러스터 격자 (레벨별 셀 단위 메시지 수 + 좌표 합)
+
+    메시지 작성/삭제 시 증분 갱신되며, 중심점은 sum / count로 계산
+    """
+    level = db.Column(db.Integer, primary_key=True)  # DENSITY_CELL_SIZES 인덱스
+    cx = db.Column(db.Integer, primary_key=True)  # floor(lon / cell_size)
+    cy = db.Column(db.Integer, primary_key=True)  # floor(lat / cell_size)
+    message_count = db.Column(db.Integer, default=0)
+    sum_lon = db.Column(db.Float, default=0.0)
+    sum_lat = db.Column(db.Float, default=0.0)
+    # 셀 대표 메시지 상위 K개 JSON [[likes, timestamp(ms), id], ...] (작성/삭제/투표 시 갱신)
+    top_messages = db.Column(db.Text)
+
+class TrajectoryCellUser(db.Model):
+    """[Phase 10] 셀별 고유 사용자 집합 (user_count 증분 계산용)"""
+    level = db.Column(db.Integer, primary_key=True)
+    mode = db.Column(db.String(20), primary_key=True)
+    cx = db.Column(db.Integer, primary_key=True)
+    cy = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.String(100), primary_key=True)
 
 class SavedMessage(db.Model):
     """저장된 메시지 (스크랩/북마크)"""
@@ -174,7 +315,10 @@ class SavedMessage(db.Model):
     message_id = db.Column(db.String(50), db.ForeignKey('message.id'), nullable=False, index=True)
     timestamp = db.Column(db.DateTime, default=get_kst_now)
 
-    __table_args__ = (db.UniqueConstraint('user_id', 'message_id'),)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'message_id'),
+        db.Index('ix_saved_message_user_ts_id', 'user_id', 'timestamp', 'id'),
+    )
 
     def to_dict(self):
         return {
@@ -184,16 +328,1049 @@ class SavedMessage(db.Model):
             'timestamp': int(self.timestamp.replace(tzinfo=KST).timestamp() * 1000)
         }
 
+class UserStats(db.Model):
+    """[Phase 11] 사용자 활동 통계 카운터 (쓰기 API에서 증분 갱신, 대시보드는 읽기만)"""
+    user_id = db.Column(db.String(100), db.ForeignKey('user.id'), primary_key=True)
+    route_count = db.Column(db.Integer, default=0, nullable=False)
+    total_distance = db.Column(db.Float, default=0.0, nullable=False)
+    total_duration = db.Column(db.Integer, default=0, nullable=False)
+    message_count = db.Column(db.Integer, default=0, nullable=False)
+    comment_count = db.Column(db.Integer, default=0, nullable=False)
+    likes_received = db.Column(db.Integer, default=0, nullable=False)
+    saved_count = db.Column(db.Integer, default=0, nullable=False)
+
+    def points_breakdown(self):
+        """포인트 산정 (이동 1km당 10, 메시지 50, 받은 좋아요 5, 댓글 20)"""
+        movement_points = int((self.total_distance or 0) * 10)
+        message_points = (self.message_count or 0) * 50
+        like_points = (self.likes_received or 0) * 5
+        comment_points = (self.comment_count or 0) * 20
+        return {
+            'fromMovement': movement_points,
+            'fromMessages': message_points,
+            'fromLikes': like_points,
+            'fromComments': comment_points,
+            'total': movement_points + message_points + like_points + comment_points
+        }
+
+class IdempotencyKey(db.Model):
+    """[Phase 15] 쓰기 요청 멱등성 키 (재전송된 요청을 기본 키 조회 한 번으로 판별)"""
+    key = db.Column(db.String(200), primary_key=True)  # "{종류}:{user_id}:{클라이언트 키}"
+    resource_id = db.Column(db.String(50))  # 생성된 Route/Message/Comment ID
+    created_at = db.Column(db.DateTime, default=get_kst_now, index=True)  # TTL 정리용
+
+# ========================================
+# [Phase 10] 경로 공간 인덱스 유틸
+# ========================================
+def parse_lonlat(value):
+    """"lon,lat" 문자열 또는 [lon, lat] 배열을 (lon, lat) 튜플로 변환 (실패 시 None)"""
+    try:
+        if isinstance(value, (list, tuple)):
+            lon, lat = float(value[0]), float(value[1])
+        elif value:
+            lon, lat = map(float, str(value).split(',')[:2])
+        else:
+            return None
+    except (ValueError, IndexError, TypeError):
+        return None
+    if not (-180 <= lon <= 180 and -90 <= lat <= 90):
+        return None
+    return lon, lat
+
+def parse_track(raw):
+    """궤적 JSON 문자열을 [(lon, lat, timestamp), ...] 리스트로 변환
+
+    [{"coords": [lon, lat], "timestamp": ms, ...}] 형태와 [[lon, lat], ...] 형태를
+    모두 허용하며, 파싱할 수 없는 점은 건너뜀. timestamp가 없으면 None.
+    """
+    if not raw:
+        return []
+    try:
+        points = json.loads(raw) if isinstance(raw, str) else raw
+    except ValueError:
+        return []
+    if not isinstance(points, list):
+        return []
+
+    track = []
+    for p in points:
+        if isinstance(p, dict):
+            lonlat = parse_lonlat(p.get('coords'))
+            ts = p.get('timestamp')
+        else:
+            lonlat, ts = parse_lonlat(p), None
+        if lonlat:
+            track.append((lonlat[0], lonlat[1], int(ts) if isinstance(ts, (int, float)) else None))
+    return track
+
+def index_route_geometry(route):
+    """Route의 좌표/궤적으로부터 공간 인덱스 컬럼을 채움 (저장/백필 공용)"""
+    start = parse_lonlat(route.start_coords)
+    end = parse_lonlat(route.end_coords)
+    route.start_lon, route.start_lat = start if start else (None, None)
+    route.end_lon, route.end_lat = end if end else (None, None)
+
+    # Bounding Box: 궤적 + 접근 경로 + 시작/끝점 전체 포함
+    coords = [(p[0], p[1]) for p in route.track_points() + route.approach_points()]
+    coords += [c for c in (start, end) if c]
+    if coords:
+        lons = [c[0] for c in coords]
+        lats = [c[1] for c in coords]
+        route.min_lon, route.max_lon = min(lons), max(lons)
+        route.min_lat, route.max_lat = min(lats), max(lats)
+    else:
+        route.min_lon = route.max_lon = route.min_lat = route.max_lat = None
+
+# ========================================
+# [Phase 10] 궤적 압축 인코딩 (델타 + 고정소수점 polyline)
+# ========================================
+# 형식: 첫 글자는 차원 수('2' = 위도/경도, '3' = 위도/경도/timestamp(ms)),
+# 이후 각 점의 값을 직전 점과의 차이로 Google polyline 방식 인코딩.
+# 위경도는 1e-6도(약 0.1m) 정밀도.
+TRACK_PRECISION = 1e6
+
+def _encode_value(value, out):
+    value = ~(value << 1) if value < 0 else value << 1
+    while value >= 0x20:
+        out.append(chr((0x20 | (value & 0x1f)) + 63))
+        value >>= 5
+    out.append(chr(value + 63))
+
+def encode_track(points):
+    """[(lon, lat[, timestamp]), ...]를 압축 문자열로 인코딩 (빈 궤적은 None)"""
+    if not points:
+        return None
+    dims = 3 if all(len(p) > 2 and p[2] is not None for p in points) else 2
+    out = [str(dims)]
+    prev = [0] * dims
+    for p in points:
+        values = [round(p[1] * TRACK_PRECISION), round(p[0] * TRACK_PRECISION)]
+        if dims == 3:
+            values.append(int(p[2]))
+        for i, v in enumerate(values):
+            _encode_value(v - prev[i], out)
+            prev[i] = v
+    return ''.join(out)
+
+def decode_track(encoded):
+    """encode_track 문자열을 [(lon, lat, timestamp), ...]로 디코딩 (timestamp 없으면 None)"""
+    if not encoded:
+        return []
+    dims = int(encoded[0])
+    values = []
+    shift = result = 0
+    for ch in encoded[1:]:
+        b = ord(ch) - 63
+        result |= (b & 0x1f) << shift
+        shift += 5
+        if b < 0x20:
+            values.append(~(result >> 1) if result & 1 else result >> 1)
+            shift = result = 0
+
+    track = []
+    prev = [0] * dims
+    for i in range(0, len(values) - dims + 1, dims):
+        for d in range(dims):
+            prev[d] += values[i + d]
+        track.append((prev[1] / TRACK_PRECISION, prev[0] / TRACK_PRECISION, prev[2] if dims == 3 else None))
+    return track
+
+def track_to_json(track):
+    """디코딩된 궤적을 구버전 클라이언트용 JSON 문자열로 변환"""
+    points = []
+    for lon, lat, ts in track:
+        point = {'coords': [lon, lat]}
+        if ts is not None:
+            point['timestamp'] = ts
+        points.append(point)
+    return json.dumps(points, separators=(',', ':'))
+
+# 압축 궤적 응답을 요청하는 방법: ?format=polyline 또는 Accept 헤더
+COMPACT_TRACK_MIMETYPE = 'application/vnd.footmap.track+json'
+
+def wants_compact_tracks():
+    """클라이언트가 압축 궤적 응답을 지원하는지 확인"""
+    if request.args.get('format') == 'polyline':
+        return True
+    return any(mimetype == COMPACT_TRACK_MIMETYPE for mimetype, _ in request.accept_mimetypes)
+
+# ========================================
+# [Phase 10] 줌 레벨별 궤적 단순화 (Level of Detail)
+# ========================================
+# 단순화 궤적을 미리 만들어 두는 기준 줌 레벨 (이보다 확대하면 원본 사용)
+LOD_LEVELS = [10, 12, 14, 16]
+# 허용 오차 (화면 픽셀 단위)
+LOD_PIXEL_TOLERANCE = 1.0
+
+def to_mercator_unit(lon, lat):
+    """경위도를 0~1 범위의 Web Mercator 좌표로 변환 (줌 0 기준 타일 1장)"""
+    lat = max(-85.05112878, min(85.05112878, lat))
+    x = (lon + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return x, y
+
+def simplify_douglas_peucker(coords, tolerance):
+    """Douglas-Peucker 단순화 (반복 구현, tolerance는 Mercator 단위)"""
+    if len(coords) < 3:
+        return list(coords)
+
+    projected = [to_mercator_unit(lon, lat) for lon, lat in coords]
+    keep = [False] * len(coords)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(coords) - 1)]
+    tol_sq = tolerance * tolerance
+
+    while stack:
+        first, last = stack.pop()
+        x1, y1 = projected[first]
+        x2, y2 = projected[last]
+        dx, dy = x2 - x1, y2 - y1
+        seg_len_sq = dx * dx + dy * dy
+
+        max_dist_sq, index = 0.0, None
+        for i in range(first + 1, last):
+            px, py = projected[i]
+            if seg_len_sq == 0:
+                dist_sq = (px - x1) ** 2 + (py - y1) ** 2
+            else:
+                t = max(0.0, min(1.0, ((px - x1) * dx + (py - y1) * dy) / seg_len_sq))
+                dist_sq = (px - x1 - t * dx) ** 2 + (py - y1 - t * dy) ** 2
+            if dist_sq > max_dist_sq:
+                max_dist_sq, index = dist_sq, i
+
+        if index is not None and max_dist_sq > tol_sq:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+
+    return [c for c, k in zip(coords, keep) if k]
+
+def lod_tolerance(level):
+    """줌 레벨에서 LOD_PIXEL_TOLERANCE 픽셀에 해당하는 Mercator 거리"""
+    return LOD_PIXEL_TOLERANCE / (256 * 2 ** level)
+
+def pick_lod_level(zoom):
+    """요청 줌 이상인 가장 거친 LOD 레벨 선택 (없으면 None = 원본)"""
+    if zoom is None:
+        return None
+    for level in LOD_LEVELS:
+        if zoom <= level:
+            return level
+    return None
+
+def build_route_lods(route):
+    """Route 궤적의 레벨별 단순화 결과를 RouteLOD 목록으로 생성 (저장/백필 공용)"""
+    coords = [(p[0], p[1]) for p in route.track_points()]
+    lods = []
+    for level in LOD_LEVELS:
+        simplified = simplify_douglas_peucker(coords, lod_tolerance(level))
+        lods.append(RouteLOD(
+            level=level,
+            points_enc=encode_track(simplified),
+            point_count=len(simplified)
+        ))
+    return lods
+
+# ========================================
+# [Phase 10] 경로 격자 셀 키 (화면 범위 조회)
+# ========================================
+# 셀 크기 (도 단위, 약 1km)
+ROUTE_CELL_SIZE = 0.01
+# 화면이 이보다 많은 셀을 덮으면 (넓은 화면) 셀 탐색 대신 최신순 스캔 + Bounding Box 필터
+ROUTE_CELL_MAX_SCAN = 4096
+
+def build_route_cells(route):
+    """Route 궤적/접근 경로/시작·끝점이 지나가는 셀을 RouteCell 목록으로 생성 (저장/백필 공용)"""
+    cells = set()
+    for track in (route.track_points(), route.approach_points()):
+        cells |= track_cells([(p[0], p[1]) for p in track], ROUTE_CELL_SIZE)
+    for coords in (parse_lonlat(route.start_coords), parse_lonlat(route.end_coords)):
+        if coords:
+            cells |= track_cells([coords], ROUTE_CELL_SIZE)
+    return [RouteCell(cx=cx, cy=cy) for cx, cy in sorted(cells)]
+
+def filter_routes_in_bounds(query, min_lon, min_lat, max_lon, max_lat):
+    """화면과 교차하는 경로만 남기는 필터
+
+    격자 셀 키(RouteCell)로 후보를 인덱스 탐색한 뒤 Bounding Box로 셀 경계의 경로를 걸러냄.
+    화면이 넓어 셀 수가 ROUTE_CELL_MAX_SCAN을 넘으면 대부분의 경로가 해당되므로 Bounding Box만 적용
+    """
+    query = query.filter(
+        Route.min_lon <= max_lon,
+        Route.max_lon >= min_lon,
+        Route.min_lat <= max_lat,
+        Route.max_lat >= min_lat
+    )
+    cx_min, cx_max = math.floor(min_lon / ROUTE_CELL_SIZE), math.floor(max_lon / ROUTE_CELL_SIZE)
+    cy_min, cy_max = math.floor(min_lat / ROUTE_CELL_SIZE), math.floor(max_lat / ROUTE_CELL_SIZE)
+    if (cx_max - cx_min + 1) * (cy_max - cy_min + 1) > ROUTE_CELL_MAX_SCAN:
+        return query
+    return query.filter(Route.id.in_(
+        db.select(RouteCell.route_id).where(
+            RouteCell.cx.between(cx_min, cx_max),
+            RouteCell.cy.between(cy_min, cy_max)
+        )
+    ))
+
+# ========================================
+# [Phase 10] 궤적 밀도 격자 (집계 레이어)
+# ========================================
+# 레벨별 셀 크기 (도 단위, 약 50m / 200m / 800m / 3.2km / 13km)
+DENSITY_CELL_SIZES = [0.0005, 0.002, 0.008, 0.032, 0.128]
+# 화면 한 축당 최대 셀 수 (응답 크기 상한: 약 64 x 64)
+DENSITY_MAX_CELLS_PER_AXIS = 64
+DENSITY_ALL_MODES = 'all'
+UPSERT_CHUNK_SIZE = 500
+
+def dialect_insert(model):
+    """DB 종류에 맞는 INSERT (ON CONFLICT 지원) 생성"""
+    if db.engine.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+def track_cells(coords, cell_size):
+    """궤적이 지나가는 격자 셀 집합 (점 사이 구간은 셀 크기의 절반 간격으로 보간)"""
+    cells = set()
+    step = cell_size / 2
+    for i, (lon, lat) in enumerate(coords):
+        cells.add((math.floor(lon / cell_size), math.floor(lat / cell_size)))
+        if i == 0:
+            continue
+        prev_lon, prev_lat = coords[i - 1]
+        n = int(max(abs(lon - prev_lon), abs(lat - prev_lat)) / step)
+        for k in range(1, n + 1):
+            t = k / (n + 1)
+            ilon = prev_lon + (lon - prev_lon) * t
+            ilat = prev_lat + (lat - prev_lat) * t
+            cells.add((math.floor(ilon / cell_size), math.floor(ilat / cell_size)))
+    return cells
+
+def update_trajectory_cells(*routes):
+    """경로들을 밀도 격자에 반영 (여러 경로는 셀별로 합산하여 한 번에 반영, 호출한 쪽에서 commit)"""
+    traversals = {}  # (level, mode, cx, cy) -> 통과 경로 수
+    cell_users = set()  # (level, mode, cx, cy, user_id)
+    for route in routes:
+        route.density_indexed = True
+        coords = [(p[0], p[1]) for p in route.track_points()]
+        if not coords:
+            continue
+        modes = {route.mode or 'walking', DENSITY_ALL_MODES}
+        for level, size in enumerate(DENSITY_CELL_SIZES):
+            for cx, cy in track_cells(coords, size):
+                for mode in modes:
+                    key = (level, mode, cx, cy)
+                    traversals[key] = traversals.get(key, 0) + 1
+                    cell_users.add(key + (route.user_id,))
+    if not traversals:
+        return
+
+    # 1. 셀-사용자 쌍 등록 → 새로 등록된 쌍 수만큼 고유 사용자 수 증가
+    new_users = {}
+    pairs = sorted(cell_users)
+    for i in range(0, len(pairs), UPSERT_CHUNK_SIZE):
+        stmt = dialect_insert(TrajectoryCellUser).on_conflict_do_nothing().returning(
+            TrajectoryCellUser.level, TrajectoryCellUser.mode, TrajectoryCellUser.cx, TrajectoryCellUser.cy
+        )
+        rows = db.session.execute(stmt, [
+            {'level': level, 'mode': mode, 'cx': cx, 'cy': cy, 'user_id': user_id}
+            for level, mode, cx, cy, user_id in pairs[i:i + UPSERT_CHUNK_SIZE]
+        ])
+        for key in rows:
+            key = tuple(key)
+            new_users[key] = new_users.get(key, 0) + 1
+
+    # 2. 셀 통과 횟수 증가 (없으면 생성)
+    stmt = dialect_insert(TrajectoryCell)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['level', 'mode', 'cx', 'cy'],
+        set_={
+            'traversals': TrajectoryCell.traversals + stmt.excluded.traversals,
+            'user_count': TrajectoryCell.user_count + stmt.excluded.user_count
+        }
+    )
+    keys = sorted(traversals)
+    for i in range(0, len(keys), UPSERT_CHUNK_SIZE):
+        db.session.execute(stmt, [
+            {'level': k[0], 'mode': k[1], 'cx': k[2], 'cy': k[3],
+             'traversals': traversals[k], 'user_count': new_users.get(k, 0)}
+            for k in keys[i:i + UPSERT_CHUNK_SIZE]
+        ])
+
+def pick_density_level(min_lon, min_lat, max_lon, max_lat, max_cells=DENSITY_MAX_CELLS_PER_AXIS):
+    """화면 범위가 축당 max_cells 이하의 셀로 덮이는 가장 세밀한 레벨"""
+    span = max(max_lon - min_lon, max_lat - min_lat)
+    for level, size in enumerate(DENSITY_CELL_SIZES):
+        if span / size <= max_cells:
+            return level
+    return len(DENSITY_CELL_SIZES) - 1
+
+def density_rollup_factor(min_lon, min_lat, max_lon, max_lat, level, max_cells=DENSITY_MAX_CELLS_PER_AXIS):
+    """가장 거친 레벨로도 축당 max_cells를 넘는 넓은 화면이면 k x k 셀을 하나로 묶는 배수 k (그 외 1)"""
+    span = max(max_lon - min_lon, max_lat - min_lat)
+    return max(1, math.ceil(span / (DENSITY_CELL_SIZES[level] * max_cells)))
+
+# ========================================
+# [Phase 14] 메시지 클러스터링
+# ========================================
+# 밀도 격자와 같은 셀 크기를 사용하되, 마커용이므로 화면 한 축당 셀 수를 더 작게 제한
+MESSAGE_CLUSTER_MAX_CELLS_PER_AXIS = 16
+MESSAGE_CLUSTER_TOP_K = 3  # 클러스터별 대표 메시지 수
+
+def message_rank_key(likes, timestamp, message_id):
+    """클러스터 대표 메시지 정렬 키 (좋아요 > 최신 > ID, 클수록 앞)"""
+    return [likes or 0, int(timestamp.replace(tzinfo=KST).timestamp() * 1000), message_id]
+
+def message_cluster_cells(coord_x, coord_y):
+    """메시지 좌표가 속한 레벨별 셀 [(level, cx, cy), ...]"""
+    return [
+        (level, math.floor(coord_x / size), math.floor(coord_y / size))
+        for level, size in enumerate(DENSITY_CELL_SIZES)
+    ]
+
+def cluster_top_query(level, cx, cy):
+    """셀 범위의 대표 메시지 상위 K개 조회문 (좌표 인덱스 범위 조회)"""
+    size = DENSITY_CELL_SIZES[level]
+    return db.select(Message.likes, Message.timestamp, Message.id).where(
+        Message.coord_x >= cx * size, Message.coord_x < (cx + 1) * size,
+        Message.coord_y >= cy * size, Message.coord_y < (cy + 1) * size
+    ).order_by(Message.likes.desc(), Message.timestamp.desc(), Message.id.desc()).limit(MESSAGE_CLUSTER_TOP_K)
+
+def compute_cluster_top(level, cx, cy):
+    """셀 하나의 대표 메시지 상위 K개를 다시 계산 (백필용)"""
+    return [message_rank_key(*r) for r in db.session.execute(cluster_top_query(level, cx, cy))]
+
+def compute_cluster_tops(cells):
+    """여러 셀의 대표 메시지 상위 K개를 UNION ALL 한 번으로 다시 계산 → {(level, cx, cy): top}"""
+    if not cells:
+        return {}
+    parts = []
+    for i, cell in enumerate(cells):
+        sub = cluster_top_query(*cell).add_columns(db.literal(i).label('cell')).subquery()
+        parts.append(db.select(sub))
+    rows = db.session.execute(db.union_all(*parts) if len(parts) > 1 else parts[0])
+    tops = {cell: [] for cell in cells}
+    for likes, timestamp, message_id, i in rows:
+        tops[cells[i]].append(message_rank_key(likes, timestamp, message_id))
+    return {cell: sorted(top, reverse=True) for cell, top in tops.items()}
+
+def update_cluster_tops(message_id, coord_x, coord_y, key):
+    """메시지 1개의 변경(작성/투표: key, 삭제: None)을 레벨별 셀 대표 목록에 반영
+
+    목록 안의 메시지가 삭제되거나 순위가 내려간 셀만 다시 계산(전체 레벨 한 번의 쿼리)하고,
+    나머지는 기존 목록과 병합 → 조회 1회 + (필요 시) 재계산 1회 + 일괄 UPDATE 1회
+    """
+    cells = message_cluster_cells(coord_x, coord_y)
+    rows = db.session.query(
+        MessageCluster.level, MessageCluster.cx, MessageCluster.cy, MessageCluster.top_messages
+    ).filter(
+        db.tuple_(MessageCluster.level, MessageCluster.cx, MessageCluster.cy).in_(cells)
+    ).with_for_update().all()  # PostgreSQL: 같은 셀의 동시 갱신 직렬화
+
+    updates = {}
+    recompute = []
+    for level, cx, cy, top_json in rows:
+        top = json.loads(top_json) if top_json else None
+        if top is None:
+            recompute.append((level, cx, cy))
+            continue
+        previous = next((t for t in top if t[2] == message_id), None)
+        others = [t for t in top if t[2] != message_id]
+        if previous is not None and len(top) >= MESSAGE_CLUSTER_TOP_K and (key is None or key < previous):
+            # 목록 밖 메시지가 대신 들어올 수 있으므로 다시 계산
+            recompute.append((level, cx, cy))
+            continue
+        merged = sorted(others + ([key] if key is not None else []), reverse=True)[:MESSAGE_CLUSTER_TOP_K]
+        if merged != top:
+            updates[(level, cx, cy)] = merged
+    updates.update(compute_cluster_tops(recompute))
+    if updates:
+        db.session.execute(db.update(MessageCluster), [
+            {'level': level, 'cx': cx, 'cy': cy, 'top_messages': json.dumps(top)}
+            for (level, cx, cy), top in updates.items()
+        ])
+
+def update_message_clusters(msg, delta):
+    """메시지 1개를 모든 레벨의 클러스터 격자에 반영 (delta: +1 작성 / -1 삭제, 호출한 쪽에서 commit)"""
+    if msg.timestamp is None:
+        msg.timestamp = get_kst_now()  # 대표 메시지 정렬 키와 저장 값을 일치시킴 (기본값과 동일)
+    key = message_rank_key(msg.likes, msg.timestamp, msg.id) if delta > 0 else None
+    stmt = dialect_insert(MessageCluster).values([
+        {
+            'level': level,
+            'cx': cx,
+            'cy': cy,
+            'message_count': delta,
+            'sum_lon': msg.coord_x * delta,
+            'sum_lat': msg.coord_y * delta,
+            # 새로 생기는 셀의 대표 목록은 이 메시지 하나 (기존 셀은 아래에서 병합)
+            'top_messages': json.dumps([key] if key else []),
+        }
+        for level, cx, cy in message_cluster_cells(msg.coord_x, msg.coord_y)
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['level', 'cx', 'cy'],
+        set_={
+            'message_count': MessageCluster.message_count + stmt.excluded.message_count,
+            'sum_lon': MessageCluster.sum_lon + stmt.excluded.sum_lon,
+            'sum_lat': MessageCluster.sum_lat + stmt.excluded.sum_lat,
+        }
+    )
+    db.session.execute(stmt)
+    if delta > 0:
+        msg.clustered = True
+        db.session.flush()  # 셀 재계산 시 새 메시지가 조회되도록
+    update_cluster_tops(msg.id, msg.coord_x, msg.coord_y, key)
+
+def get_message_clusters(min_lon, min_lat, max_lon, max_lat):
+    """화면 범위의 메시지 클러스터 (셀 수가 화면 크기와 무관하게 약 16 x 16 이내)
+
+    개수/중심점/대표 메시지 ID 모두 클러스터 격자에서 조회 (메시지 수와 무관한 비용)
+    """
+    level = pick_density_level(min_lon, min_lat, max_lon, max_lat, MESSAGE_CLUSTER_MAX_CELLS_PER_AXIS)
+    size = DENSITY_CELL_SIZES[level]
+    k = density_rollup_factor(min_lon, min_lat, max_lon, max_lat, level, MESSAGE_CLUSTER_MAX_CELLS_PER_AXIS)
+    cx_min, cx_max = math.floor(min_lon / size), math.floor(max_lon / size)
+    cy_min, cy_max = math.floor(min_lat / size), math.floor(max_lat / size)
+
+    cells = MessageCluster.query.filter(
+        MessageCluster.level == level,
+        MessageCluster.cx.between(cx_min, cx_max),
+        MessageCluster.cy.between(cy_min, cy_max),
+        MessageCluster.message_count > 0
+    ).all()
+
+    # 넓은 화면(k > 1)은 k x k 셀을 묶어 합산 (대표 메시지는 각 셀 상위 K개 병합)
+    groups = {}
+    for c in cells:
+        g = groups.setdefault((c.cx // k, c.cy // k), {'count': 0, 'sum_lon': 0.0, 'sum_lat': 0.0, 'top': []})
+        g['count'] += c.message_count
+        g['sum_lon'] += c.sum_lon
+        g['sum_lat'] += c.sum_lat
+        g['top'].extend(json.loads(c.top_messages or '[]'))
+
+    return {
+        'level': level,
+        'cellSize': size * k,
+        'clusters': [
+            {
+                'coords': [round(g['sum_lon'] / g['count'], 6), round(g['sum_lat'] / g['count'], 6)],
+                'count': g['count'],
+                'topMessageIds': [t[2] for t in sorted(g['top'], reverse=True)[:MESSAGE_CLUSTER_TOP_K]],
+            }
+            for g in groups.values()
+        ]
+    }
+
+# ========================================
+# [Phase 10] XYZ 타일 캐시
+# ========================================
+TILE_CACHE_SIZE = int(os.environ.get('TILE_CACHE_SIZE', 1024))
+# 워커 간 무효화가 공유되지 않으므로 TTL로 최대 지연 시간 제한
+TILE_CACHE_TTL = int(os.environ.get('TILE_CACHE_TTL', 30))
+TILE_MAX_ZOOM = 22
+TILE_ROUTE_MIN_ZOOM = 12  # 이보다 저배율 타일에는 궤적 미포함 (밀도 격자 사용)
+TILE_MAX_ROUTES = 200
+TILE_MAX_MESSAGES = 200
+
+def tile_bounds(z, x, y):
+    """XYZ 타일의 경위도 범위 (min_lon, min_lat, max_lon, max_lat)"""
+    n = 2 ** z
+    def lat_at(ty):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+    return x / n * 360.0 - 180.0, lat_at(y + 1), (x + 1) / n * 360.0 - 180.0, lat_at(y)
+
+class TileCache:
+    """타일 응답 LRU 캐시 (변경된 영역과 겹치는 타일만 무효화)"""
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # (z, x, y) -> (만료 시각, body, etag)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[2]
+
+    def set(self, key, body, etag):
+        with self._lock:
+            self._entries[key] = (time.time() + self.ttl, body, etag)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, min_lon, min_lat, max_lon, max_lat):
+        """범위와 겹치는 캐시 타일 삭제"""
+        with self._lock:
+            for key in list(self._entries):
+                t_min_lon, t_min_lat, t_max_lon, t_max_lat = tile_bounds(*key)
+                if t_min_lon <= max_lon and t_max_lon >= min_lon and t_min_lat <= max_lat and t_max_lat >= min_lat:
+                    del self._entries[key]
+
+tile_cache = TileCache(TILE_CACHE_SIZE, TILE_CACHE_TTL)
+
+# ========================================
+# [Phase 15] 요청별 SQL 계측 + 엔드포인트 지표 (/metrics)
+# ========================================
+# SQLAlchemy 커서 이벤트로 요청마다 쿼리 수 / DB 시간 / 반환 행 수를 모으고,
+# 응답 시점에 Flask 엔드포인트별 카운터·히스토그램에 합산 (워커 프로세스별 집계).
+REQUEST_METRICS_ENABLED = os.environ.get('REQUEST_METRICS', '1') != '0'
+N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 5))  # 한 요청에서 같은 SQL이 이 횟수 이상이면 N+1 의심
+DB_TIME_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5]
+STATEMENT_BUCKETS = [1, 2, 3, 5, 10, 20, 50, 100]
+RESPONSE_BYTES_BUCKETS = [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304]
+N_PLUS_ONE_LOG_LIMIT = 200  # 경고를 출력한 (엔드포인트, SQL) 조합 최대 개수
+
+class RequestSqlStats:
+    """한 요청 동안 실행된 SQL 집계"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.statements = 0
+        self.db_time = 0.0
+        self.rows = 0
+        self.shapes = {}  # SQL 문 → 실행 횟수 (파라미터는 바인딩되므로 같은 문장 = 같은 형태)
+
+    def record(self, statement, elapsed, rowcount):
+        self.statements += 1
+        self.db_time += elapsed
+        # SELECT 행 수는 드라이버가 알려줄 때만 집계 (psycopg2는 제공, sqlite3는 -1)
+        if rowcount and rowcount > 0:
+            self.rows += rowcount
+        self.shapes[statement] = self.shapes.get(statement, 0) + 1
+
+    def repeated_statements(self):
+        return [(sql, n) for sql, n in self.shapes.items() if n >= N_PLUS_ONE_THRESHOLD]
+
+class EndpointMetrics:
+    def __init__(self):
+        self.requests = {}  # (method, status) -> 횟수
+        self.duration = LatencyHistogram()
+        self.db_time = LatencyHistogram(DB_TIME_BUCKETS)
+        self.statements = LatencyHistogram(STATEMENT_BUCKETS)
+        self.response_bytes = LatencyHistogram(RESPONSE_BYTES_BUCKETS)
+        self.statements_total = 0
+        self.rows_total = 0
+        self.n_plus_one = 0
+
+class RequestMetrics:
+    """Flask 엔드포인트별 요청 지표 저장소"""
+
+    def __init__(self):
+        self._endpoints = {}
+        self._warned = set()
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint, method, status, stats, response_bytes):
+        with self._lock:
+            metrics = self._endpoints.get(endpoint)
+            if metrics is None:
+                metrics = self._endpoints[endpoint] = EndpointMetrics()
+            key = (method, status)
+            metrics.requests[key] = metrics.requests.get(key, 0) + 1
+            metrics.statements_total += stats.statements
+            metrics.rows_total += stats.rows
+        metrics.duration.observe(time.perf_counter() - stats.started)
+        metrics.db_time.observe(stats.db_time)
+        metrics.statements.observe(stats.statements)
+        if response_bytes is not None:
+            metrics.response_bytes.observe(response_bytes)
+
+        repeated = stats.repeated_statements()
+        if repeated:
+            with self._lock:
+                metrics.n_plus_one += 1
+                new = [(sql, n) for sql, n in repeated
+                       if (endpoint, sql) not in self._warned and len(self._warned) < N_PLUS_ONE_LOG_LIMIT]
+                self._warned.update((endpoint, sql) for sql, _ in new)
+            for sql, n in new:
+                print(f"⚠️ N+1 의심 [{endpoint}] 같은 쿼리 {n}회: {' '.join(sql.split())[:200]}")
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._endpoints)
+
+request_metrics = RequestMetrics()
+
+def current_sql_stats():
+    """현재 요청의 SQL 집계 (요청 밖 - 백그라운드 드레이너 등 - 이면 None)"""
+    return g.get('sql_stats') if has_request_context() else None
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _sql_started(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._metrics_started = time.perf_counter()
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _sql_finished(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_metrics_started', None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    stats = current_sql_stats()
+    if stats is not None:
+        stats.record(statement, elapsed, cursor.rowcount)
+    if SLOW_QUERY_SECONDS > 0 and elapsed >= SLOW_QUERY_SECONDS:
+        slow_query_log.record(statement, parameters, elapsed, executemany)
+
+@app.before_request
+def start_request_metrics():
+    if REQUEST_METRICS_ENABLED:
+        g.sql_stats = RequestSqlStats()
+
+# 압축 후 실제 전송 크기를 기록하도록 compress_response보다 먼저 등록 (after_request는 등록 역순 실행)
+@app.after_request
+def record_request_metrics(response):
+    stats = g.get('sql_stats')
+    if stats is None:
+        return response
+    endpoint = request.endpoint or 'unmatched'
+    method, status = request.method, response.status_code
+    if response.is_streamed:
+        # 스트리밍 응답은 본문을 생성하며 쿼리가 이어지므로 전송이 끝난 뒤 기록 (크기는 미집계)
+        response.call_on_close(lambda: request_metrics.observe(endpoint, method, status, stats, None))
+    else:
+        request_metrics.observe(endpoint, method, status, stats, response.calculate_content_length())
+    return response
+
+def prometheus_labels(**labels):
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in labels.values())
+    return '{' + ','.join(f'{k}="{v}"' for k, v in zip(labels, escaped)) + '}'
+
+def prometheus_histogram(lines, name, labels, snapshot):
+    for bound, count in snapshot['buckets'].items():
+        lines.append(f"{name}_bucket{prometheus_labels(**labels, le=bound)} {count}")
+    lines.append(f"{name}_sum{prometheus_labels(**labels)} {snapshot['sum']}")
+    lines.append(f"{name}_count{prometheus_labels(**labels)} {snapshot['count']}")
+
+def render_prometheus_metrics():
+    """Prometheus 텍스트 형식 (v0.0.4)"""
+    endpoints = sorted(request_metrics.snapshot().items())
+    lines = []
+
+    def section(name, kind, help_text):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    section('balgil_http_requests_total', 'counter', 'HTTP requests by endpoint, method and status')
+    for endpoint, m in endpoints:
+        for (method, status), count in sorted(m.requests.items()):
+            lines.append(f"balgil_http_requests_total{prometheus_labels(endpoint=endpoint, method=method, status=status)} {count}")
+
+    histograms = [
+        ('balgil_http_request_duration_seconds', 'duration', 'Request handling time including DB and serialization'),
+        ('balgil_db_time_seconds', 'db_time', 'Time spent executing SQL per request'),
+        ('balgil_db_statements_per_request', 'statements', 'SQL statements executed per request'),
+        ('balgil_http_response_bytes', 'response_bytes', 'Response body size (after compression)'),
+    ]
+    for name, attr, help_text in histograms:
+        section(name, 'histogram', help_text)
+        for endpoint, m in endpoints:
+            prometheus_histogram(lines, name, {'endpoint': endpoint}, getattr(m, attr).snapshot())
+
+    counters = [
+        ('balgil_db_statements_total', 'statements_total', 'SQL statements executed'),
+        ('balgil_db_rows_total', 'rows_total', 'Rows returned or affected (when reported by the driver)'),
+        ('balgil_n_plus_one_requests_total', 'n_plus_one', f'Requests repeating one statement {N_PLUS_ONE_THRESHOLD}+ times'),
+    ]
+    for name, attr, help_text in counters:
+        section(name, 'counter', help_text)
+        for endpoint, m in endpoints:
+            lines.append(f"{name}{prometheus_labels(endpoint=endpoint)} {getattr(m, attr)}")
+
+    # 기존 캐시/외부 API/큐 통계 (/admin/cache-stats와 같은 값)
+    section('balgil_kakao_cache_requests_total', 'counter', 'Kakao proxy cache lookups by kind and result')
+    for kind, counts in kakao_cache.stats().items():
+        for result, count in counts.items():
+            lines.append(f"balgil_kakao_cache_requests_total{prometheus_labels(kind=kind, result=result)} {count}")
+    upstream = kakao_client.stats()
+    section('balgil_upstream_latency_seconds', 'histogram', 'Kakao API request latency')
+    prometheus_histogram(lines, 'balgil_upstream_latency_seconds', {'upstream': 'kakao'}, upstream['latencySeconds'])
+    section('balgil_upstream_coalesced_total', 'counter', 'Kakao API requests served by an in-flight identical request')
+    lines.append(f"balgil_upstream_coalesced_total{prometheus_labels(upstream='kakao')} {upstream['coalesced']}")
+    if route_queue is not None:
+        section('balgil_route_queue_items', 'gauge', 'Route ingest queue items by state')
+        for state, count in route_queue.stats().items():
+            lines.append(f"balgil_route_queue_items{prometheus_labels(state=state)} {count}")
+
+    return '\n'.join(lines) + '\n'
+
+# ========================================
+# [Phase 15] 느린 쿼리 로그 + 실행 계획
+# ========================================
+# 임계값 이상 걸린 SQL을 (파라미터 값은 가린 채) 엔드포인트와 함께 기록하고,
+# 같은 형태의 문장이 처음 느렸을 때 한 번만 EXPLAIN 결과를 저장 (관리자 페이지에서 조회).
+SLOW_QUERY_SECONDS = float(os.environ.get('SLOW_QUERY_MS', 200)) / 1000  # 0 이하면 비활성화
+SLOW_QUERY_LOG_SIZE = int(os.environ.get('SLOW_QUERY_LOG_SIZE', 100))  # 최근 N건만 보관 (링 버퍼)
+SLOW_QUERY_MAX_PLANS = 500  # 실행 계획을 보관할 문장 형태 최대 개수
+# 실행 계획은 조회 문장만 수집 (INSERT ... VALUES / ON CONFLICT 등 쓰기 문장은 계획이 비어 있거나 의미 없음)
+EXPLAINABLE_PREFIXES = ('select', 'with')
+# IN (?, ?, ?) 처럼 개수만 다른 파라미터 목록은 같은 형태로 취급
+PLACEHOLDER_LIST = re.compile(r'\(\s*(?:\?|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%\(\w+\)s|:\w+))+\s*\)')
+
+def redact_param(value):
+    """파라미터 값은 남기지 않고 타입(문자열은 길이)만 기록 (좌표/사용자 ID 등 노출 방지)"""
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return f"<str:{len(value)}>"
+    if isinstance(value, (bytes, bytearray)):
+        return f"<bytes:{len(value)}>"
+    return f"<{type(value).__name__}>"
+
+def redact_params(parameters, executemany):
+    if executemany:
+        rows = list(parameters or [])
+        return {'rows': len(rows), 'first': redact_params(rows[0], False) if rows else None}
+    if isinstance(parameters, dict):
+        return {k: redact_param(v) for k, v in parameters.items()}
+    return [redact_param(v) for v in (parameters or ())]
+
+def explain_parameters(parameters, executemany):
+    """EXPLAIN에 넘길 한 행 분량의 파라미터 (executemany는 첫 행, 목록은 DBAPI가 받는 tuple로)"""
+    if executemany or (isinstance(parameters, (list, tuple)) and parameters
+                       and isinstance(parameters[0], (list, tuple, dict))):
+        parameters = parameters[0] if parameters else ()
+    if isinstance(parameters, dict):
+        return dict(parameters)
+    return tuple(parameters or ())
+
+def statement_shape(statement):
+    """(공백 정리한 SQL, 형태 ID)"""
+    sql = ' '.join(statement.split())
+    return sql, hashlib.sha1(PLACEHOLDER_LIST.sub('(?+)', sql).encode('utf-8')).hexdigest()[:12]
+
+class SlowQueryLog:
+    """최근 느린 쿼리 링 버퍼 + 문장 형태별 실행 계획
+
+    커서 이벤트에서는 기록만 하고, 실행 계획(EXPLAIN)은 관리자 페이지 조회 시 별도 연결에서 수집
+    (요청 처리 경로에 추가 쿼리를 넣지 않음)
+    """
+
+    def __init__(self, size):
+        self._entries = deque(maxlen=size)
+        self._samples = {}  # shape id -> (원본 문장, 한 행 파라미터) - EXPLAIN 대기 (메모리에만 보관, 화면에 표시하지 않음)
+        self._plans = {}  # shape id -> 실행 계획 문자열
+        self._lock = threading.Lock()
+
+    def record(self, statement, parameters, elapsed, executemany):
+        sql, shape = statement_shape(statement)
+        with self._lock:
+            if shape not in self._plans and shape not in self._samples and \
+                    len(self._plans) + len(self._samples) < SLOW_QUERY_MAX_PLANS:
+                if statement.lstrip().lower().startswith(EXPLAINABLE_PREFIXES):
+                    self._samples[shape] = (statement, explain_parameters(parameters, executemany))
+                else:
+                    self._plans[shape] = '(쓰기 문장 - 실행 계획 수집 안 함)'
+
+        endpoint = request.endpoint if has_request_context() else threading.current_thread().name
+        entry = {
+            'at': get_kst_now().isoformat(timespec='seconds'),
+            'endpoint': endpoint or 'unmatched',
+            'durationMs': round(elapsed * 1000, 1),
+            'shape': shape,
+            'sql': sql,
+            'params': redact_params(parameters, executemany),
+        }
+        with self._lock:
+            self._entries.append(entry)
+        print(f"🐢 느린 쿼리 {entry['durationMs']}ms [{entry['endpoint']}] {sql[:300]} params={entry['params']}")
+
+    def explain(self, statement, parameters):
+        """별도 연결에서 EXPLAIN 실행 (실제 실행 없음). 이벤트 재귀를 피하려고 DBAPI 커서를 직접 사용"""
+        with db.engine.connect() as conn:
+            postgres = conn.dialect.name == 'postgresql'
+            cursor = conn.connection.cursor()
+            try:
+                cursor.execute(('EXPLAIN ' if postgres else 'EXPLAIN QUERY PLAN ') + statement, parameters)
+                rows = cursor.fetchall()
+            except Exception as e:
+                return f"EXPLAIN 실패: {e}"
+            finally:
+                cursor.close()
+                conn.rollback()
+        if not rows:
+            return '(실행 계획 없음)'
+        if postgres:
+            return '\n'.join(row[0] for row in rows)
+        # SQLite: (id, parent, notused, detail) → 부모-자식 들여쓰기
+        depth = {0: 0}
+        lines = []
+        for node_id, parent, _, detail in rows:
+            depth[node_id] = depth.get(parent, 0) + 1
+            lines.append('  ' * (depth[node_id] - 1) + detail)
+        return '\n'.join(lines)
+
+    def collect_plans(self):
+        """대기 중인 문장 형태의 실행 계획 수집 (관리자 페이지 조회 시 호출)"""
+        with self._lock:
+            pending = list(self._samples.items())
+        for shape, (statement, parameters) in pending:
+            plan = self.explain(statement, parameters)
+            with self._lock:
+                self._samples.pop(shape, None)
+                self._plans[shape] = plan
+
+    def entries(self):
+        """최근 순 목록 (각 항목에 해당 형태의 실행 계획 포함)"""
+        self.collect_plans()
+        with self._lock:
+            return [dict(e, plan=self._plans.get(e['shape'])) for e in reversed(self._entries)]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+slow_query_log = SlowQueryLog(SLOW_QUERY_LOG_SIZE)
+
+# ========================================
+# [Phase 15] 응답 압축 + 정적 파일 캐시 정책
+# ========================================
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))  # 이보다 작은 응답은 압축하지 않음 (bytes)
+COMPRESS_GZIP_LEVEL = 6
+COMPRESS_BROTLI_QUALITY = 5  # 동적 응답용 (빌드 시 사전 압축은 precompress_static.py에서 최고 압축)
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'application/javascript', 'application/x-ndjson', 'application/xml', 'image/svg+xml'
+}
+# 내용 해시가 파일명에 들어간 빌드 결과물(build_static.py)만 장기 캐시
+# (index.html의 ?v= 값은 수동 관리라 갱신이 누락될 수 있으므로 일반 정적 파일과 같이 재검증)
+STATIC_IMMUTABLE_MAX_AGE = 31536000  # 1년
+STATIC_MAX_AGE = int(os.environ.get('STATIC_MAX_AGE', 3600))  # 버전 없는 정적 파일 (이후 ETag 재검증)
+STATIC_REVALIDATE_SUFFIXES = ('.js', '.css', '.html')
+# [Phase 15] build_static.py 빌드 결과 (번들 + 해시 파일명). 없으면 원본 index.html / js 모듈 제공
+ASSET_MANIFEST_PATH = os.path.join('dist', 'asset-manifest.json')
+
+def is_compressible(mimetype):
+    return bool(mimetype) and (
+        mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES or mimetype.endswith('+json')
+    )
+
+def negotiate_encoding():
+    """Accept-Encoding 협상 → 'br' / 'gzip' / None"""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+@app.after_request
+def compress_response(response):
+    """API/HTML 응답을 협상된 인코딩(brotli/gzip)으로 압축 (정적 파일/스트리밍 응답 제외)"""
+    if (response.direct_passthrough or response.is_streamed or response.status_code != 200
+            or 'Content-Encoding' in response.headers or not is_compressible(response.mimetype)):
+        return response
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    encoding = negotiate_encoding() if len(data) >= COMPRESS_MIN_SIZE else None
+    if encoding is None:
+        return response
+
+    if encoding == 'br':
+        response.set_data(brotli.compress(data, quality=COMPRESS_BROTLI_QUALITY))
+    else:
+        response.set_data(gzip.compress(data, compresslevel=COMPRESS_GZIP_LEVEL))
+    response.headers['Content-Encoding'] = encoding
+    # 압축된 표현은 바이트가 달라지므로 약한 ETag로 변환 (If-None-Match는 약한 비교로 판정)
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+_asset_manifest = {'mtime': None, 'data': None}
+
+def asset_manifest():
+    """dist/asset-manifest.json 로드 (파일이 바뀌면 다시 읽음 → 재배포 없이 재빌드 반영)"""
+    path = os.path.join(app.root_path, ASSET_MANIFEST_PATH)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    if _asset_manifest['mtime'] != mtime:
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ asset manifest 로드 실패: {e}")
+            data = None
+        _asset_manifest.update(mtime=mtime, data=data)
+    return _asset_manifest['data']
+
+def is_hashed_asset(path):
+    """빌드된 해시 파일명(내용이 바뀌면 이름도 바뀜)인지 확인"""
+    manifest = asset_manifest()
+    return bool(manifest) and path in (manifest.get('js'), manifest.get('css'))
+
+def send_static_asset(path, max_age=None):
+    """정적 파일 전송: 빌드 시 만들어 둔 .br/.gz 사전 압축본(precompress_static.py)이 있으면 우선 사용"""
+    response = None
+    versioned = max_age is None and is_hashed_asset(path)
+    # 빌드 전 개별 모듈(js/css)은 서로 버전이 섞이지 않도록 매번 ETag로 재검증 (변경 없으면 304)
+    revalidate = not versioned and path.endswith(STATIC_REVALIDATE_SUFFIXES)
+    if max_age is None:
+        max_age = STATIC_IMMUTABLE_MAX_AGE if versioned else 0 if revalidate else STATIC_MAX_AGE
+    encoding = negotiate_encoding()
+    variants = [('br', '.br'), ('gzip', '.gz')] if encoding == 'br' else [('gzip', '.gz')] if encoding else []
+    full_path = safe_join(app.root_path, path)
+    for name, suffix in (variants if full_path else []):
+        try:
+            # 원본보다 오래된 압축본은 무시 (재빌드 전 수정된 파일)
+            if os.path.getmtime(full_path + suffix) < os.path.getmtime(full_path):
+                continue
+        except OSError:
+            continue
+        response = send_from_directory('.', path + suffix, mimetype=mimetypes.guess_type(path)[0], max_age=max_age)
+        response.headers['Content-Encoding'] = name
+        break
+    if response is None:
+        response = send_from_directory('.', path, max_age=max_age)
+
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    if versioned:
+        response.cache_control.immutable = True
+    elif revalidate:
+        response.cache_control.no_cache = True
+    return response
+
 # ========================================
 # 정적 파일 서빙 (index.html 등)
 # ========================================
 @app.route('/')
 def serve_index():
-    return send_from_directory('.', 'index.html')
+    manifest = asset_manifest()
+    index_path = manifest.get('index') if manifest else None
+    if not index_path or not os.path.isfile(os.path.join(app.root_path, index_path)):
+        index_path = 'index.html'
+    response = send_static_asset(index_path, max_age=0)
+    response.cache_control.no_cache = True  # 번들 해시 갱신이 바로 반영되도록 매번 재검증
+    return response
+
+# 저장소 루트를 그대로 서빙하므로 로컬 저장소(instance/의 캐시·큐·버전 DB 등)와 숨김 파일은 제외
+STATIC_BLOCKED_DIRS = {'instance'}
+STATIC_BLOCKED_SUFFIXES = ('.db', '.db-journal', '.db-wal', '.db-shm', '.sqlite', '.sqlite3')
+
+def is_blocked_static_path(path):
+    parts = os.path.normpath(path).replace('\\', '/').split('/')
+    return (parts[0] in STATIC_BLOCKED_DIRS
+            or any(p.startswith('.') for p in parts)
+            or path.lower().endswith(STATIC_BLOCKED_SUFFIXES))
 
 @app.route('/<path:path>')
 def serve_static(path):
-    return send_from_directory('.', path)
+    if is_blocked_static_path(path):
+        return "Not Found", 404
+    return send_static_asset(path)
 
 # ========================================
 # 사용자 & 프로필 API
@@ -204,7 +1381,11 @@ def get_user_profile(user_id):
     if not user:
         # 미가입 사용자면 기본 정보 반환
         return jsonify({'id': user_id, 'points': 0, 'totalDistance': 0}), 200
-    return jsonify(user.to_dict())
+    result = user.to_dict()
+    stats = UserStats.query.get(user_id)
+    if stats:
+        result['points'] = stats.points_breakdown()['total']  # [Phase 11] 최신 포인트
+    return jsonify(result)
 
 @app.route('/api/users/<user_id>', methods=['POST', 'PUT'])
 def update_user_profile(user_id):
@@ -220,6 +1401,7 @@ def update_user_profile(user_id):
         if 'nickname' in data: user.nickname = data['nickname'] # 별명 수정 허용
 
         db.session.commit()
+        change_versions.bump('users')  # [Phase 14] 메시지 응답의 작성자 별명 갱신
         return jsonify(user.to_dict())
     except Exception as e:
         db.session.rollback()
@@ -269,59 +1451,123 @@ def get_level_info(points):
         'progress': (points - current['points']) / (next_level['points'] - current['points']) if next_level else 1.0
     }
 
-@app.route('/api/user/<user_id>/dashboard', methods=['GET'])
-def get_user_dashboard(user_id):
-    """대시보드용 통합 통계 API"""
-    user = ensure_user(user_id)
-
-    # 1. 이동 통계
-    routes = Route.query.filter_by(user_id=user_id).all()
-    total_distance = sum(r.distance or 0 for r in routes)
-    total_duration = sum(r.duration or 0 for r in routes)
-    movement_points = int(total_distance * 10)
-
-    recent_routes = sorted(routes, key=lambda r: r.timestamp, reverse=True)[:5]
+# ========================================
+# [Phase 11] 사용자 통계 카운터
+# ========================================
+USER_STATS_FIELDS = [
+    'route_count', 'total_distance', 'total_duration',
+    'message_count', 'comment_count', 'likes_received', 'saved_count'
+]
 
-    # 2. 소셜 통계
-    messages = Message.query.filter_by(user_id=user_id).all()
-    comments = Comment.query.filter_by(user_id=user_id).all()
-    saved_messages = SavedMessage.query.filter_by(user_id=user_id).all()
+def bump_user_stats(user_id, **deltas):
+    """사용자 통계 카운터 원자적 증감 (행이 없으면 생성, 호출한 쪽 트랜잭션에서 commit)"""
+    deltas = {k: v for k, v in deltas.items() if v}
+    if not user_id or not deltas:
+        return
+    values = {field: 0 for field in USER_STATS_FIELDS}
+    values.update(deltas)
+    stmt = dialect_insert(UserStats).values(user_id=user_id, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['user_id'],
+        set_={field: getattr(UserStats, field) + getattr(stmt.excluded, field) for field in deltas}
+    )
+    db.session.execute(stmt)
+
+def compute_user_stats():
+    """원본 테이블에서 사용자별 통계를 다시 집계 → {user_id: {field: value}}"""
+    stats = {}
+
+    def merge(rows, fields):
+        for row in rows:
+            entry = stats.setdefault(row[0], {field: 0 for field in USER_STATS_FIELDS})
+            for field, value in zip(fields, row[1:]):
+                entry[field] = value or 0
+
+    merge(db.session.query(Route.user_id, db.func.count(Route.id), db.func.sum(Route.distance), db.func.sum(Route.duration))
+          .group_by(Route.user_id), ['route_count', 'total_distance', 'total_duration'])
+    merge(db.session.query(Message.user_id, db.func.count(Message.id), db.func.sum(Message.likes))
+          .group_by(Message.user_id), ['message_count', 'likes_received'])
+    merge(db.session.query(Comment.user_id, db.func.count(Comment.id))
+          .group_by(Comment.user_id), ['comment_count'])
+    merge(db.session.query(SavedMessage.user_id, db.func.count(SavedMessage.id))
+          .group_by(SavedMessage.user_id), ['saved_count'])
+    return stats
+
+def reconcile_user_stats():
+    """UserStats를 원본 테이블 기준으로 재계산하여 어긋난 행을 수정 (수정된 사용자 수 반환)"""
+    expected = compute_user_stats()
+    current = {s.user_id: s for s in UserStats.query.all()}
+    known_users = {u for (u,) in db.session.query(User.id)}
+    fixed = 0
+
+    for user_id in set(expected) | set(current):
+        values = expected.get(user_id, {field: 0 for field in USER_STATS_FIELDS})
+        row = current.get(user_id)
+        if row is None:
+            if user_id not in known_users:
+                continue
+            row = UserStats(user_id=user_id)
+            db.session.add(row)
+        elif all(abs((getattr(row, f) or 0) - values[f]) < 1e-9 for f in USER_STATS_FIELDS):
+            continue
+        for field in USER_STATS_FIELDS:
+            setattr(row, field, values[field])
+        # 관리자 페이지 표시용 User 컬럼도 함께 맞춤
+        user = User.query.get(user_id)
+        if user:
+            user.points = row.points_breakdown()['total']
+            user.total_distance = row.total_distance
+        fixed += 1
 
-    message_count = len(messages)
-    comment_count = len(comments)
-    likes_received = sum(m.likes or 0 for m in messages)
+    db.session.commit()
+    return fixed
 
-    message_points = message_count * 50
-    like_points = likes_received * 5
-    comment_points = comment_count * 20
+@app.route('/api/user/<user_id>/dashboard', methods=['GET'])
+def get_user_dashboard(user_id):
+    """대시보드용 통합 통계 API (통계 카운터 읽기 전용, 쿼리 수 고정)"""
+    # 1. 통계는 카운터 테이블에서 한 행만 조회 (GET에서 쓰기 없음)
+    stats = UserStats.query.get(user_id) or UserStats(
+        user_id=user_id, **{field: 0 for field in USER_STATS_FIELDS}
+    )
+    total_distance = stats.total_distance
+    breakdown = stats.points_breakdown()
+    level_info = get_level_info(breakdown['total'])
 
-    # 3. 총점 계산 및 레벨
-    total_points = movement_points + message_points + like_points + comment_points
+    recent_routes = Route.query.filter_by(user_id=user_id).order_by(Route.timestamp.desc()).limit(5).all()
 
-    # User 레코드 업데이트
-    user.points = total_points
-    user.total_distance = total_distance
-    db.session.commit()
+    # 2. 최근 활동 타임라인 (메시지 + 댓글 통합) - 필요한 컬럼만 최근 5개씩
+    def shorten(text):
+        return text[:50] + '...' if len(text) > 50 else text
 
-    level_info = get_level_info(total_points)
+    recent_messages = db.session.query(Message.text, Message.timestamp, Message.coord_x, Message.coord_y) \
+        .filter(Message.user_id == user_id).order_by(Message.timestamp.desc()).limit(5).all()
+    recent_comments = db.session.query(Comment.text, Comment.timestamp) \
+        .filter(Comment.user_id == user_id).order_by(Comment.timestamp.desc()).limit(5).all()
 
-    # 4. 최근 활동 타임라인 (메시지 + 댓글 통합)
     recent_activity = []
-    for m in sorted(messages, key=lambda x: x.timestamp, reverse=True)[:5]:
+    for m in recent_messages:
         recent_activity.append({
             'type': 'message',
-            'text': m.text[:50] + '...' if len(m.text) > 50 else m.text,
+            'text': shorten(m.text),
             'timestamp': int(m.timestamp.timestamp() * 1000),
             'coords': [m.coord_x, m.coord_y]
         })
-    for c in sorted(comments, key=lambda x: x.timestamp, reverse=True)[:5]:
+    for c in recent_comments:
         recent_activity.append({
             'type': 'comment',
-            'text': c.text[:50] + '...' if len(c.text) > 50 else c.text,
+            'text': shorten(c.text),
             'timestamp': int(c.timestamp.timestamp() * 1000)
         })
     recent_activity = sorted(recent_activity, key=lambda x: x['timestamp'], reverse=True)[:10]
 
+    # 3. 저장한 메시지 - 메시지 본문과 한 번에 조인 (삭제된 메시지는 빈 값)
+    saved_rows = db.session.query(
+        SavedMessage.message_id, SavedMessage.timestamp,
+        Message.text, Message.user_id, Message.coord_x, Message.coord_y
+    ).outerjoin(Message, Message.id == SavedMessage.message_id) \
+        .filter(SavedMessage.user_id == user_id) \
+        .order_by(SavedMessage.timestamp.desc()).limit(5).all()
+
     return jsonify({
         'profile': {
             'id': user_id,
@@ -329,38 +1575,301 @@ def get_user_dashboard(user_id):
         },
         'movement': {
             'totalDistance': round(total_distance, 2),
-            'totalDuration': total_duration,
+            'totalDuration': stats.total_duration,
             'calories': int(total_distance * 50),
             'trees': round(total_distance * 0.15, 1),
-            'routeCount': len(routes),
+            'routeCount': stats.route_count,
             'recentRoutes': [r.to_dict() for r in recent_routes]
         },
         'social': {
-            'messageCount': message_count,
-            'commentCount': comment_count,
-            'likesReceived': likes_received,
-            'savedCount': len(saved_messages),
+            'messageCount': stats.message_count,
+            'commentCount': stats.comment_count,
+            'likesReceived': stats.likes_received,
+            'savedCount': stats.saved_count,
             'recentActivity': recent_activity,
             'savedMessages': [
                 {
                     'id': sm.message_id,
-                    'text': (Message.query.get(sm.message_id).text[:50] + '...') if Message.query.get(sm.message_id) and len(Message.query.get(sm.message_id).text) > 50 else (Message.query.get(sm.message_id).text if Message.query.get(sm.message_id) else ''),
-                    'userId': Message.query.get(sm.message_id).user_id if Message.query.get(sm.message_id) else '',
-                    'coords': f"{Message.query.get(sm.message_id).coord_x},{Message.query.get(sm.message_id).coord_y}" if Message.query.get(sm.message_id) else '',
+                    'text': shorten(sm.text) if sm.text is not None else '',
+                    'userId': sm.user_id or '',
+                    'coords': f"{sm.coord_x},{sm.coord_y}" if sm.text is not None else '',
                     'timestamp': int(sm.timestamp.timestamp() * 1000)
                 }
-                for sm in sorted(saved_messages, key=lambda x: x.timestamp, reverse=True)[:5]
+                for sm in saved_rows
             ]
         },
-        'pointsBreakdown': {
-            'fromMovement': movement_points,
-            'fromMessages': message_points,
-            'fromLikes': like_points,
-            'fromComments': comment_points,
-            'total': total_points
-        }
+        'pointsBreakdown': breakdown
     })
 
+# ========================================
+# [Phase 12] 응답 캐시 (TTL + LRU, 백엔드 교체 가능)
+# ========================================
+class MemoryCacheBackend:
+    """프로세스 내 TTL/LRU 캐시 (워커별로 따로 유지됨)"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (만료 시각, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+class SqliteCacheBackend:
+    """로컬 SQLite 파일 기반 TTL/LRU 캐시 (같은 서버의 gunicorn 워커 간 공유)"""
+
+    def __init__(self, path, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'key TEXT PRIMARY KEY, value BLOB, expires_at REAL, accessed_at REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_cache_accessed ON cache (accessed_at)')
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(self, key):
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute('SELECT value, expires_at FROM cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                return None
+            conn.execute('UPDATE cache SET accessed_at = ? WHERE key = ?', (now, key))
+            return row[0]
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, value, now + ttl, now)
+            )
+            # LRU: 최대 개수 초과분은 가장 오래 사용되지 않은 항목부터 삭제
+            conn.execute(
+                'DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+
+class ResponseCache:
+    """백엔드를 감싼 캐시 + 종류별 hit/miss 통계"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = {}
+        self.misses = {}
+        self._lock = threading.Lock()
+
+    def get(self, kind, key):
+        value = self.backend.get(f"{kind}:{key}")
+        with self._lock:
+            counter = self.misses if value is None else self.hits
+            counter[kind] = counter.get(kind, 0) + 1
+        return value
+
+    def set(self, kind, key, value, ttl):
+        self.backend.set(f"{kind}:{key}", value, ttl)
+
+    def stats(self):
+        with self._lock:
+            kinds = set(self.hits) | set(self.misses)
+            return {
+                kind: {'hits': self.hits.get(kind, 0), 'misses': self.misses.get(kind, 0)}
+                for kind in sorted(kinds)
+            }
+
+def create_cache_backend(name, path, max_entries):
+    """설정값에 따라 캐시 백엔드 생성 ('memory' 또는 'sqlite')"""
+    if name == 'sqlite':
+        return SqliteCacheBackend(path, max_entries)
+    return MemoryCacheBackend(max_entries)
+
+# 카카오 프록시 캐시 설정
+KAKAO_CACHE_BACKEND = os.environ.get('KAKAO_CACHE_BACKEND', 'memory')  # 'memory' | 'sqlite'
+KAKAO_CACHE_PATH = os.environ.get('KAKAO_CACHE_PATH', os.path.join(app.instance_path, 'kakao_cache.db'))
+KAKAO_CACHE_SIZE = int(os.environ.get('KAKAO_CACHE_SIZE', 10000))
+KAKAO_SEARCH_TTL = int(os.environ.get('KAKAO_SEARCH_TTL', 3600))  # 검색 결과 1시간
+KAKAO_REVERSE_GEO_TTL = int(os.environ.get('KAKAO_REVERSE_GEO_TTL', 86400))  # 주소 변환 1일
+REVERSE_GEO_PRECISION = int(os.environ.get('REVERSE_GEO_PRECISION', 4))  # 소수점 자리수 (4 ≈ 10m)
+
+kakao_cache = ResponseCache(create_cache_backend(KAKAO_CACHE_BACKEND, KAKAO_CACHE_PATH, KAKAO_CACHE_SIZE))
+
+# ========================================
+# [Phase 12] 외부 API 클라이언트 (연결 풀 + 타임아웃 + 요청 병합)
+# ========================================
+class UpstreamTimeout(Exception):
+    """외부 API 응답 시간 초과"""
+
+class UpstreamError(Exception):
+    """외부 API 연결 실패"""
+
+class LatencyHistogram:
+    """응답 시간 히스토그램 (Prometheus 방식 누적 버킷, 초 단위)"""
+    BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+    def __init__(self, buckets=None):
+        self.buckets = buckets or self.BUCKETS  # [Phase 15] 쿼리 수/응답 크기 등 다른 단위에도 사용
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 = +Inf
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    self.counts[i] += 1
+                    break
+            else:
+                self.counts[-1] += 1
+            self.total += seconds
+            self.count += 1
+
+    def snapshot(self):
+        with self._lock:
+            cumulative, buckets = 0, {}
+            for bound, n in zip(self.buckets + ['+Inf'], self.counts):
+                cumulative += n
+                buckets[str(bound)] = cumulative
+            return {'buckets': buckets, 'sum': round(self.total, 6), 'count': self.count}
+
+class _InflightCall:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class UpstreamClient:
+    """keep-alive 연결 풀을 사용하는 GET 전용 HTTP 클라이언트
+
+    - 연결/읽기 타임아웃을 분리 적용 (느린 외부 응답이 워커를 붙잡지 않도록)
+    - 같은 경로를 동시에 요청하면 한 번만 호출하고 결과를 공유 (single-flight)
+    """
+
+    def __init__(self, base_url, headers=None, pool_size=4, connect_timeout=2.0, read_timeout=5.0):
+        parsed = urllib.parse.urlparse(base_url)
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port
+        self.headers = headers or {}
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.latency = LatencyHistogram()
+        self.coalesced = 0
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _new_connection(self):
+        conn_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        return conn_class(self.host, self.port, timeout=self.connect_timeout)
+
+    def _checkout(self):
+        try:
+            return self._pool.get_nowait(), True
+        except queue.Empty:
+            return self._new_connection(), False
+
+    def _checkin(self, conn):
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _request(self, path):
+        """(status, body) 반환. 재사용 연결이 끊겨 있으면 새 연결로 1회 재시도"""
+        for _ in range(2):
+            conn, reused = self._checkout()
+            try:
+                if conn.sock is None:
+                    conn.connect()
+                conn.sock.settimeout(self.read_timeout)
+                conn.request('GET', path, headers=self.headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (socket.timeout, TimeoutError) as e:
+                conn.close()
+                raise UpstreamTimeout(str(e))
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                conn.close()
+                if reused:
+                    continue
+                raise UpstreamError(str(e))
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                raise UpstreamError(str(e))
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._checkin(conn)
+            return response.status, body
+        raise UpstreamError('connection closed by upstream')
+
+    def get(self, path):
+        with self._lock:
+            call = self._inflight.get(path)
+            leader = call is None
+            if leader:
+                call = self._inflight[path] = _InflightCall()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if not call.event.wait(self.connect_timeout + self.read_timeout):
+                raise UpstreamTimeout('coalesced request timed out')
+            if call.error:
+                raise call.error
+            return call.result
+
+        started = time.perf_counter()
+        try:
+            call.result = self._request(path)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            self.latency.observe(time.perf_counter() - started)
+            with self._lock:
+                del self._inflight[path]
+            call.event.set()
+
+    def stats(self):
+        return {'latencySeconds': self.latency.snapshot(), 'coalesced': self.coalesced}
+
+KAKAO_API_BASE = os.environ.get('KAKAO_API_BASE', 'https://dapi.kakao.com')
+KAKAO_POOL_SIZE = int(os.environ.get('KAKAO_POOL_SIZE', 4))
+kakao_client = UpstreamClient(
+    KAKAO_API_BASE,
+    headers={'Authorization': f"KakaoAK {KAKAO_REST_API_KEY}"},
+    pool_size=KAKAO_POOL_SIZE,
+    connect_timeout=float(os.environ.get('KAKAO_CONNECT_TIMEOUT', 2.0)),
+    read_timeout=float(os.environ.get('KAKAO_READ_TIMEOUT', 5.0))
+)
+
 # ========================================
 # 카카오 API 프록시 (기존 기능 유지)
 # ========================================
@@ -370,8 +1879,10 @@ def api_search():
     if not query:
         return jsonify({'error': 'Missing query'}), 400
 
-    api_url = f"https://dapi.kakao.com/v2/local/search/keyword.json?query={urllib.parse.quote(query)}"
-    return proxy_kakao(api_url)
+    # [Phase 12] 공백/대소문자 정규화한 검색어로 캐시
+    normalized = ' '.join(query.split()).lower()
+    api_path = f"/v2/local/search/keyword.json?query={urllib.parse.quote(query)}"
+    return proxy_kakao(api_path, cache_kind='search', cache_key=normalized, ttl=KAKAO_SEARCH_TTL)
 
 @app.route('/api/reverse-geo')
 def api_reverse_geo():
@@ -380,31 +1891,445 @@ def api_reverse_geo():
     if not x or not y:
         return jsonify({'error': 'Missing x or y'}), 400
 
-    api_url = f"https://dapi.kakao.com/v2/local/geo/coord2address.json?x={x}&y={y}"
-    return proxy_kakao(api_url)
+    try:
+        x, y = round_reverse_geo_coords(x, y)
+    except ValueError:
+        return jsonify({'error': 'Invalid x or y'}), 400
+
+    return proxy_kakao(reverse_geo_path(x, y), cache_kind='reverse_geo', cache_key=f"{x},{y}", ttl=KAKAO_REVERSE_GEO_TTL)
+
+def round_reverse_geo_coords(x, y):
+    """[Phase 12] 좌표를 REVERSE_GEO_PRECISION 자리 문자열로 반올림 → 근처 좌표는 같은 캐시 사용"""
+    return f"{float(x):.{REVERSE_GEO_PRECISION}f}", f"{float(y):.{REVERSE_GEO_PRECISION}f}"
 
-def proxy_kakao(api_url):
-    req = urllib.request.Request(api_url)
-    req.add_header("Authorization", f"KakaoAK {KAKAO_REST_API_KEY}")
+def reverse_geo_path(x, y):
+    return f"/v2/local/geo/coord2address.json?x={x}&y={y}"
+
+# 일괄 주소 변환 시 외부 호출 동시 실행 수 (연결 풀 크기와 맞춤)
+REVERSE_GEO_BATCH_MAX = 100
+reverse_geo_executor = ThreadPoolExecutor(max_workers=KAKAO_POOL_SIZE, thread_name_prefix='reverse-geo')
+
+def fetch_reverse_geo(x, y):
+    """캐시 미스 좌표 1개 조회 → (status, 파싱된 응답)"""
     try:
-        with urllib.request.urlopen(req) as response:
-            data = response.read()
-            return app.response_class(response=data, status=200, mimetype='application/json')
-    except urllib.error.HTTPError as e:
-        return app.response_class(response=e.read(), status=e.code, mimetype='application/json')
+        status, data = kakao_client.get(reverse_geo_path(x, y))
+    except UpstreamTimeout:
+        return 504, {'error': 'Upstream timeout'}
+    except UpstreamError:
+        return 502, {'error': 'Upstream unavailable'}
+    if status == 200:
+        kakao_cache.set('reverse_geo', f"{x},{y}", data, KAKAO_REVERSE_GEO_TTL)
+    try:
+        return status, json.loads(data)
+    except ValueError:
+        return 502, {'error': 'Invalid upstream response'}
+
+@app.route('/api/reverse-geo/batch', methods=['POST'])
+def api_reverse_geo_batch():
+    """[Phase 12] 여러 좌표 일괄 주소 변환 (캐시 우선, 미스는 병렬 조회 후 한 번에 응답)
+
+    요청: {"coords": [[x, y], ...]} (최대 REVERSE_GEO_BATCH_MAX개)
+    응답: {"results": [{"x", "y", "status", "data"}, ...]} (요청 순서 유지)
+    """
+    data = request.json or {}
+    coords = data.get('coords')
+    if not isinstance(coords, list) or not coords:
+        return jsonify({'error': 'Missing coords'}), 400
+    if len(coords) > REVERSE_GEO_BATCH_MAX:
+        return jsonify({'error': f'Too many coords (max {REVERSE_GEO_BATCH_MAX})'}), 400
+
+    # 각 항목은 [x, y] 숫자 쌍만 허용 (객체/문자열/길이 불일치는 400)
+    if not all(
+        isinstance(c, (list, tuple)) and len(c) == 2 and
+        all(isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v) for v in c)
+        for c in coords
+    ):
+        return jsonify({'error': 'Invalid coords'}), 400
+    keys = [round_reverse_geo_coords(c[0], c[1]) for c in coords]
+
+    # 1. 캐시 조회 (반올림 후 같은 좌표는 한 번만)
+    answers = {}
+    misses = []
+    for key in dict.fromkeys(keys):
+        cached = kakao_cache.get('reverse_geo', f"{key[0]},{key[1]}")
+        if cached is not None:
+            answers[key] = (200, json.loads(cached))
+        else:
+            misses.append(key)
+
+    # 2. 캐시 미스는 제한된 스레드 풀에서 병렬 조회
+    futures = {key: reverse_geo_executor.submit(fetch_reverse_geo, *key) for key in misses}
+    for key, future in futures.items():
+        answers[key] = future.result()
+
+    return jsonify({
+        'results': [
+            {'x': key[0], 'y': key[1], 'status': answers[key][0], 'data': answers[key][1]}
+            for key in keys
+        ]
+    })
+
+def proxy_kakao(api_path, cache_kind=None, cache_key=None, ttl=0):
+    """카카오 API 호출 (cache_kind 지정 시 성공 응답을 캐시)"""
+    if cache_kind:
+        cached = kakao_cache.get(cache_kind, cache_key)
+        if cached is not None:
+            return app.response_class(response=cached, status=200, mimetype='application/json')
+
+    try:
+        status, data = kakao_client.get(api_path)
+    except UpstreamTimeout:
+        return jsonify({'error': 'Upstream timeout'}), 504
+    except UpstreamError as e:
+        return jsonify({'error': 'Upstream unavailable', 'detail': str(e)}), 502
+
+    if status == 200 and cache_kind:
+        kakao_cache.set(cache_kind, cache_key, data, ttl)
+    return app.response_class(response=data, status=status, mimetype='application/json')
+
+# ========================================
+# [Phase 13] 커서(Keyset) 페이지네이션
+# ========================================
+# 목록 API는 기존처럼 배열을 반환하고, 다음 페이지 커서는 헤더로 전달
+#   X-Next-Cursor: <opaque cursor>   /   Link: <...?cursor=...>; rel="next"
+PAGE_MAX_LIMIT = 200
+
+class InvalidCursor(ValueError):
+    """잘못된 페이지 커서"""
+
+def encode_cursor(values):
+    """정렬 컬럼 값 목록을 불투명 커서 문자열로 인코딩"""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(token, columns):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise InvalidCursor(token)
+        return [
+            datetime.fromisoformat(v) if isinstance(c.type, db.DateTime) else v
+            for c, v in zip(columns, values)
+        ]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(token) from e
+
+def keyset_page(query, columns, default_limit):
+    """정렬 컬럼(모두 내림차순, 마지막은 고유 키) 기준 페이지 조회 → (rows, next_cursor)
+
+    OFFSET 대신 (col1, col2, ...) < (커서 값) 조건을 사용하므로 깊은 페이지도 첫 페이지와 비용이 같음.
+    """
+    rows, next_cursor, _ = keyset_window(query, columns, default_limit)
+    return rows, next_cursor
+
+def keyset_window(query, columns, default_limit):
+    """keyset_page + 이전 페이지 커서 → (rows, next_cursor, prev_cursor)
+
+    ?before=<커서>는 커서보다 앞(더 큰 값)의 페이지를 역순 조회 후 뒤집어 반환 (브라우저 기록 없이 이전 페이지 이동)
+    """
+    limit = max(1, min(request.args.get('limit', default_limit, type=int), PAGE_MAX_LIMIT))
+    cursor_of = lambda row: encode_cursor([getattr(row, c.key) for c in columns])
+    before = request.args.get('before')
+    if before:
+        values = decode_cursor(before, columns)
+        rows = query.filter(db.tuple_(*columns) > db.tuple_(*values)) \
+            .order_by(*[c.asc() for c in columns]).limit(limit + 1).all()
+        has_prev = len(rows) > limit
+        rows = rows[:limit][::-1]
+        return rows, before, cursor_of(rows[0]) if has_prev else None
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        query = query.filter(db.tuple_(*columns) < db.tuple_(*values))
+
+    rows = query.order_by(*[c.desc() for c in columns]).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = cursor_of(rows[-1])
+    prev_cursor = cursor_of(rows[0]) if cursor and rows else None
+    return rows, next_cursor, prev_cursor
+
+def paginated_response(items, next_cursor):
+    """목록 응답 + 다음 페이지 커서 헤더"""
+    response = jsonify(items)
+    if next_cursor:
+        args = {**request.view_args, **request.args.to_dict(), 'cursor': next_cursor}
+        response.headers['X-Next-Cursor'] = next_cursor
+        response.headers['Link'] = f'<{url_for(request.endpoint, **args)}>; rel="next"'
+    return response
+
+@app.errorhandler(InvalidCursor)
+def handle_invalid_cursor(e):
+    return jsonify({'error': 'Invalid cursor'}), 400
+
+# ========================================
+# [Phase 15] NDJSON 스트리밍 응답
+# ========================================
+# ?stream=ndjson 또는 Accept: application/x-ndjson 이면 목록을 한 줄에 한 객체씩 스트리밍.
+# DB 결과도 서버 측 커서(yield_per)로 나눠 읽으므로 요청당 메모리는 배치 크기만큼만 사용.
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_BATCH_SIZE = 100
+
+def wants_ndjson():
+    """클라이언트가 NDJSON 스트리밍 응답을 요청했는지 확인"""
+    if request.args.get('stream') == 'ndjson':
+        return True
+    return any(mimetype == NDJSON_MIMETYPE for mimetype, _ in request.accept_mimetypes)
+
+class StreamCompressor:
+    """스트리밍 응답 증분 압축: 배치마다 flush하여 클라이언트가 받은 만큼 바로 풀 수 있게 함"""
+
+    def __init__(self, encoding):
+        if encoding == 'br':
+            self._brotli = brotli.Compressor(quality=COMPRESS_BROTLI_QUALITY)
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip 헤더
+
+    def chunk(self, data):
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._brotli.finish() if self._brotli is not None else self._zlib.flush()
+
+def ndjson_response(query, serialize):
+    """쿼리 결과를 serialize(row) → dict 로 변환하며 한 줄씩 전송 (세션은 전송이 끝날 때까지 유지)
+
+    [Phase 15] compress_response는 스트리밍 응답을 건너뛰므로 여기서 배치 단위로 직접 압축
+    """
+    encoding = negotiate_encoding()
+    compressor = StreamCompressor(encoding) if encoding else None
+
+    def generate():
+        lines = []
+        for row in query.yield_per(STREAM_BATCH_SIZE):
+            lines.append(json.dumps(serialize(row), ensure_ascii=False, separators=(',', ':')) + '\n')
+            if len(lines) >= STREAM_BATCH_SIZE:
+                data = ''.join(lines).encode('utf-8')
+                lines = []
+                yield compressor.chunk(data) if compressor else data
+        data = ''.join(lines).encode('utf-8')
+        if compressor:
+            yield compressor.chunk(data) + compressor.finish()
+        elif data:
+            yield data
+
+    response = Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+    response.headers['X-Accel-Buffering'] = 'no'  # 프록시(nginx) 버퍼링 없이 바로 전달
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+# ========================================
+# [Phase 14] 변경 버전 + 조건부 GET (ETag / Last-Modified)
+# ========================================
+# 테이블 단위 변경 버전을 쓰기 경로에서 commit 후 올리고, 조회 API는 버전으로 ETag를 만들어
+# 변경이 없으면 DB 조회 없이 304 Not Modified로 응답
+#   'messages' : 메시지/댓글/투표    'routes' : 이동 경로    'users' : 프로필(별명)
+class MemoryVersionStore:
+    """프로세스 내 변경 버전 (단일 워커 전용 - 다른 워커의 쓰기를 알 수 없음)"""
+
+    def __init__(self):
+        self._versions = {}  # name -> (version, 변경 시각)
+        self._started_at = time.time()
+        self._lock = threading.Lock()
+
+    def get(self, names):
+        with self._lock:
+            return [self._versions.get(name, (0, self._started_at)) for name in names]
+
+    def bump(self, name):
+        with self._lock:
+            version, _ = self._versions.get(name, (0, self._started_at))
+            self._versions[name] = (version + 1, time.time())
+
+class SqliteVersionStore:
+    """로컬 SQLite 파일 기반 변경 버전 (같은 서버의 gunicorn 워커 간 공유)
+
+    조회(get)는 304 판정마다 호출되는 경로라 읽기 전용 SELECT만 실행 (쓰기 잠금 경합 없음)
+    """
+
+    def __init__(self, path, names=()):
+        self.path = path
+        self._local = threading.local()  # 스레드별 연결 재사용
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS versions (name TEXT PRIMARY KEY, version INTEGER, updated_at REAL)'
+            )
+        # 알려진 이름은 시작 시 한 번 등록 (워커 간 Last-Modified 일치)
+        self._register(names)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=5)
+        return conn
+
+    def _register(self, names):
+        if not names:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT OR IGNORE INTO versions (name, version, updated_at) VALUES (?, 0, ?)',
+                [(name, now) for name in names]
+            )
+
+    def _select(self, names):
+        return dict((r[0], (r[1], r[2])) for r in self._connect().execute(
+            f"SELECT name, version, updated_at FROM versions WHERE name IN ({','.join('?' * len(names))})",
+            names
+        ))
+
+    def get(self, names):
+        rows = self._select(names)
+        missing = [name for name in names if name not in rows]
+        if missing:
+            # 시작 시 등록되지 않은 이름만 처음 한 번 쓰기
+            self._register(missing)
+            rows.update(self._select(missing))
+        return [rows[name] for name in names]
+
+    def bump(self, name):
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO versions (name, version, updated_at) VALUES (?, 1, ?) '
+                'ON CONFLICT(name) DO UPDATE SET version = version + 1, updated_at = excluded.updated_at',
+                (name, time.time())
+            )
+
+# 여러 서버(호스트)로 확장 시에는 공유 저장소(Redis 등) 구현으로 교체 필요
+CHANGE_VERSION_BACKEND = os.environ.get('CHANGE_VERSION_BACKEND', 'sqlite')  # 'sqlite' | 'memory'
+CHANGE_VERSION_PATH = os.environ.get('CHANGE_VERSION_PATH', os.path.join(app.instance_path, 'change_versions.db'))
+
+CHANGE_VERSION_NAMES = ('messages', 'routes', 'users')
+
+change_versions = (
+    SqliteVersionStore(CHANGE_VERSION_PATH, CHANGE_VERSION_NAMES) if CHANGE_VERSION_BACKEND == 'sqlite'
+    else MemoryVersionStore()
+)
+
+def conditional_get(*names):
+    """변경 버전 기반 ETag/Last-Modified 조건부 GET 데코레이터
+
+    ETag는 버전 + 요청 경로/쿼리 + Accept(응답 형식 협상)로 만들어지므로,
+    304 판정은 뷰 함수(DB 조회) 실행 전에 끝남.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            versions = change_versions.get(list(names))
+            signature = json.dumps([versions, request.full_path, request.headers.get('Accept', '')])
+            etag = hashlib.sha1(signature.encode('utf-8')).hexdigest()[:24]
+            # Last-Modified는 초 단위라 같은 초 안의 후속 쓰기를 구분할 수 없음 →
+            # 마지막 변경 시각의 초가 끝난 뒤에만 내보냄 (그 전에는 ETag로만 재검증)
+            changed_at = int(max(t for _, t in versions))
+            last_modified = datetime.fromtimestamp(changed_at, timezone.utc) if changed_at < int(time.time()) else None
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains_weak(etag)  # 압축 응답은 약한 ETag
+            else:
+                not_modified = (last_modified is not None and request.if_modified_since is not None
+                                and request.if_modified_since >= last_modified)
+
+            if not_modified:
+                response = app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            # 스트리밍 중 압축된 응답(ndjson_response)은 이미 인코딩되어 있으므로 약한 ETag
+            response.set_etag(etag, weak='Content-Encoding' in response.headers)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.cache_control.no_cache = True  # 매번 재검증 (폴링 시 304)
+            return response
+        return wrapper
+    return decorator
+
+# ========================================
+# [Phase 15] 멱등성 키 (Idempotency-Key 헤더)
+# ========================================
+# 클라이언트가 쓰기 요청마다 고유 키를 보내면, 같은 키의 재전송은 새로 만들지 않고
+# 처음 생성된 리소스를 그대로 반환. 키는 리소스와 같은 트랜잭션에서 등록됨.
+IDEMPOTENCY_KEY_TTL_DAYS = int(os.environ.get('IDEMPOTENCY_KEY_TTL_DAYS', 7))  # 오프라인 재전송 고려
+IDEMPOTENCY_CLEANUP_INTERVAL = 3600  # 만료 키 정리 주기 (초, 워커별)
+_last_idempotency_cleanup = 0.0
+
+def idempotency_key(scope, user_id):
+    """요청 헤더의 Idempotency-Key → 저장용 키 (없으면 None)"""
+    client_key = request.headers.get('Idempotency-Key', '').strip()
+    if not client_key:
+        return None
+    return f"{scope}:{user_id}:{client_key[:100]}"
+
+def purge_expired_idempotency_keys():
+    """TTL이 지난 멱등성 키 삭제 (워커별 IDEMPOTENCY_CLEANUP_INTERVAL마다 한 번, 호출한 쪽에서 commit)"""
+    global _last_idempotency_cleanup
+    now = time.time()
+    if now - _last_idempotency_cleanup < IDEMPOTENCY_CLEANUP_INTERVAL:
+        return
+    _last_idempotency_cleanup = now
+    cutoff = get_kst_now() - timedelta(days=IDEMPOTENCY_KEY_TTL_DAYS)
+    IdempotencyKey.query.filter(IdempotencyKey.created_at < cutoff).delete(synchronize_session=False)
+
+def claim_idempotency_keys(keys):
+    """키 일괄 선점 (이미 있는 키는 무시) → 새로 등록된 키 집합 (호출한 쪽에서 commit)"""
+    if not keys:
+        return set()
+    purge_expired_idempotency_keys()
+    stmt = dialect_insert(IdempotencyKey).on_conflict_do_nothing().returning(IdempotencyKey.key)
+    return set(db.session.execute(stmt, [{'key': k} for k in keys]).scalars())
+
+def set_idempotency_resources(resources):
+    """선점한 키에 생성된 리소스 ID 기록 ({key: resource_id}, 호출한 쪽에서 commit)"""
+    if resources:
+        db.session.execute(db.update(IdempotencyKey), [
+            {'key': k, 'resource_id': str(resource_id)} for k, resource_id in resources.items()
+        ])
+
+def replay_idempotent(key, model):
+    """이미 처리된 키의 재전송 → 처음 생성된 리소스를 200으로 반환"""
+    entry = db.session.get(IdempotencyKey, key)
+    resource_id = entry.resource_id if entry else None
+    resource = None
+    if resource_id is not None:
+        id_type = model.__table__.c.id.type.python_type
+        resource = db.session.get(model, id_type(resource_id))
+    if resource is None:
+        # 처리 중(다른 요청이 아직 commit 전)이거나 이후 삭제된 리소스
+        return jsonify({'error': 'Duplicate request'}), 409
+    return jsonify(resource.to_dict()), 200
 
 # ========================================
 # 메시지 API (커뮤니티 기능)
 # ========================================
 @app.route('/api/messages', methods=['GET'])
+@conditional_get('messages', 'users')
 def get_messages():
-    """지도 범위 내 메시지 조회"""
+    """지도 범위 내 메시지 조회
+
+    ?cluster=1 이면 개별 메시지 대신 화면 범위에 맞는 클러스터 목록 반환 (범위 필수)
+    """
     # 선택적: 범위 필터 (min_x, max_x, min_y, max_y)
     min_x = request.args.get('min_x', type=float)
     max_x = request.args.get('max_x', type=float)
     min_y = request.args.get('min_y', type=float)
     max_y = request.args.get('max_y', type=float)
 
+    # [Phase 14] 클러스터 모드
+    if request.args.get('cluster') in ('1', 'true'):
+        if None in (min_x, max_x, min_y, max_y):
+            return jsonify({'error': 'Bounds required for cluster mode'}), 400
+        return jsonify(get_message_clusters(min_x, min_y, max_x, max_y))
+
     query = Message.query
 
     if all([min_x, max_x, min_y, max_y]):
@@ -415,8 +2340,8 @@ def get_messages():
             Message.coord_y <= max_y
         )
 
-    messages = query.order_by(Message.likes.desc(), Message.timestamp.desc()).limit(100).all()
-    return jsonify([m.to_dict() for m in messages])
+    messages, next_cursor = keyset_page(query, [Message.likes, Message.timestamp, Message.id], 100)
+    return paginated_response([m.to_dict() for m in messages], next_cursor)
 
 @app.route('/api/messages', methods=['POST'])
 def create_message():
@@ -427,6 +2352,12 @@ def create_message():
 
     ensure_user(data.get('userId', '익명'))
 
+    # [Phase 15] 재전송 요청이면 기존 메시지 반환
+    key = idempotency_key('message', data.get('userId', '익명'))
+    if key and not claim_idempotency_keys([key]):
+        db.session.rollback()
+        return replay_idempotent(key, Message)
+
     msg = Message(
         id=f"msg_{int(datetime.utcnow().timestamp() * 1000)}",
         user_id=data.get('userId', '익명'),
@@ -436,7 +2367,13 @@ def create_message():
         tags=data.get('tags', '')  # 태그 저장 (없으면 빈 문자열, Frontend에서 처리 권장)
     )
     db.session.add(msg)
+    bump_user_stats(msg.user_id, message_count=1)
+    update_message_clusters(msg, 1)
+    if key:
+        set_idempotency_resources({key: msg.id})
     db.session.commit()
+    change_versions.bump('messages')
+    tile_cache.invalidate(msg.coord_x, msg.coord_y, msg.coord_x, msg.coord_y)
 
     return jsonify(msg.to_dict()), 201
 
@@ -458,6 +2395,7 @@ def update_message(msg_id):
         msg.edited = True
 
     db.session.commit()
+    change_versions.bump('messages')
     return jsonify(msg.to_dict())
 
 @app.route('/api/messages/<msg_id>', methods=['DELETE'])
@@ -472,8 +2410,19 @@ def delete_message(msg_id):
     if data.get('userId') != msg.user_id:
         return jsonify({'error': 'Unauthorized'}), 403
 
+    # [Phase 11] 함께 삭제되는 댓글 작성자들의 통계 차감
+    commenters = db.session.query(Comment.user_id, db.func.count(Comment.id)) \
+        .filter(Comment.message_id == msg_id).group_by(Comment.user_id).all()
+    for commenter_id, count in commenters:
+        bump_user_stats(commenter_id, comment_count=-count)
+    bump_user_stats(msg.user_id, message_count=-1, likes_received=-(msg.likes or 0))
     db.session.delete(msg)
+    db.session.flush()  # 클러스터 대표 메시지 재계산에서 제외되도록 먼저 삭제
+    if msg.clustered:  # 백필 전 메시지는 격자에 없으므로 차감하지 않음
+        update_message_clusters(msg, -1)
     db.session.commit()
+    change_versions.bump('messages')
+    tile_cache.invalidate(msg.coord_x, msg.coord_y, msg.coord_x, msg.coord_y)
     return jsonify({'success': True})
 
 
@@ -506,6 +2455,12 @@ def add_comment(msg_id):
     if not msg:
         return jsonify({'error': 'Message not found'}), 404
 
+    # [Phase 15] 재전송 요청이면 기존 댓글 반환
+    key = idempotency_key('comment', data.get('userId', '익명'))
+    if key and not claim_idempotency_keys([key]):
+        db.session.rollback()
+        return replay_idempotent(key, Comment)
+
     comment = Comment(
         id=f"cmt_{int(datetime.utcnow().timestamp() * 1000)}",
         message_id=msg_id,
@@ -513,7 +2468,12 @@ def add_comment(msg_id):
         text=data['text'][:200]
     )
     db.session.add(comment)
+    bump_user_stats(comment.user_id, comment_count=1)
+    Message.query.filter_by(id=msg_id).update({Message.comment_count: db.func.coalesce(Message.comment_count, 0) + 1})
+    if key:
+        set_idempotency_resources({key: comment.id})
     db.session.commit()
+    change_versions.bump('messages')  # commentCount 변경
 
     return jsonify(comment.to_dict()), 201
 
@@ -530,7 +2490,13 @@ def delete_comment(comment_id):
         return jsonify({'error': 'Unauthorized'}), 403
 
     db.session.delete(comment)
+    bump_user_stats(comment.user_id, comment_count=-1)
+    # NULL(레거시 행)/0 이하는 0으로 (PostgreSQL에는 스칼라 max()가 없어 CASE 사용)
+    Message.query.filter_by(id=comment.message_id).update({
+        Message.comment_count: db.case((Message.comment_count > 0, Message.comment_count - 1), else_=0)
+    })
     db.session.commit()
+    change_versions.bump('messages')
     return jsonify({'success': True})
 
 @app.route('/api/messages/by-address', methods=['GET'])
@@ -562,29 +2528,35 @@ def get_messages_by_address():
 @app.route('/api/users/<user_id>/messages', methods=['GET'])
 def get_user_messages(user_id):
     """사용자가 작성한 메시지 목록"""
-    messages = Message.query.filter_by(user_id=user_id).order_by(Message.timestamp.desc()).limit(50).all()
-    return jsonify([m.to_dict() for m in messages])
+    messages, next_cursor = keyset_page(Message.query.filter_by(user_id=user_id), [Message.timestamp, Message.id], 50)
+    return paginated_response([m.to_dict() for m in messages], next_cursor)
 
 @app.route('/api/users/<user_id>/comments', methods=['GET'])
 def get_user_comments(user_id):
     """사용자가 작성한 댓글 목록"""
-    comments = Comment.query.filter_by(user_id=user_id).order_by(Comment.timestamp.desc()).limit(50).all()
-    return jsonify([c.to_dict() for c in comments])
+    comments, next_cursor = keyset_page(Comment.query.filter_by(user_id=user_id), [Comment.timestamp, Comment.id], 50)
+    return paginated_response([c.to_dict() for c in comments], next_cursor)
 
 @app.route('/api/users/<user_id>/saved', methods=['GET'])
 def get_user_saved_messages(user_id):
     """사용자가 저장한 메시지 목록"""
-    saved = SavedMessage.query.filter_by(user_id=user_id).order_by(SavedMessage.timestamp.desc()).limit(50).all()
+    saved, next_cursor = keyset_page(
+        SavedMessage.query.filter_by(user_id=user_id), [SavedMessage.timestamp, SavedMessage.id], 50
+    )
     message_ids = [s.message_id for s in saved]
     messages = Message.query.filter(Message.id.in_(message_ids)).all() if message_ids else []
     # 저장 시간 순서 유지를 위해 정렬
     messages_dict = {m.id: m for m in messages}
     result = [messages_dict[mid].to_dict() for mid in message_ids if mid in messages_dict]
-    return jsonify(result)
+    return paginated_response(result, next_cursor)
 
 @app.route('/api/messages/<message_id>/vote', methods=['POST'])
 def vote_message(message_id):
-    """메시지 좋아요/싫어요 투표 (토글/스위칭 로직 적용)"""
+    """메시지 좋아요/싫어요 투표 (토글/스위칭 로직 적용)
+
+    [Phase 14] 카운터를 Python에서 읽고 쓰지 않고, 실제로 삭제/추가된 Vote 행 기준의 증감만
+    원자적 UPDATE(likes = likes + :d)로 반영 → 동시 투표에도 카운터 = Vote 행 수 유지
+    """
     data = request.json
     user_id = data.get('userId')
     vote_type = data.get('type')  # 'up' or 'down'
@@ -593,54 +2565,51 @@ def vote_message(message_id):
         return jsonify({'error': 'Invalid data'}), 400
 
     ensure_user(user_id)
-    msg = Message.query.get(message_id)
-    if not msg:
+    if db.session.query(Message.id).filter_by(id=message_id).scalar() is None:
         return jsonify({'error': 'Message not found'}), 404
 
-    # 기존 투표 조회
-    existing_vote = Vote.query.filter_by(message_id=message_id, user_id=user_id).first()
-
-    current_status = None # 'up', 'down', or None
-
-    if existing_vote:
-        if existing_vote.vote_type == vote_type:
-            # Case 1: 같은 버튼 클릭 -> 투표 취소 (Toggle Off)
-            db.session.delete(existing_vote)
-            if vote_type == 'up':
-                msg.likes = max(0, msg.likes - 1)
-            else:
-                msg.dislikes = max(0, msg.dislikes - 1)
-            current_status = None
-        else:
-            # Case 2: 다른 버튼 클릭 -> 투표 변경 (Switch)
-            # 기존꺼 취소
-            if existing_vote.vote_type == 'up':
-                msg.likes = max(0, msg.likes - 1)
-            else:
-                msg.dislikes = max(0, msg.dislikes - 1)
-
-            # 새꺼 반영
-            existing_vote.vote_type = vote_type
-            if vote_type == 'up':
-                msg.likes += 1
-            else:
-                msg.dislikes += 1
+    deltas = {'up': 0, 'down': 0}
+
+    # 1. 기존 투표 제거 (삭제된 행이 있을 때만 이전 투표로 간주)
+    previous = db.session.execute(
+        db.delete(Vote).where(Vote.message_id == message_id, Vote.user_id == user_id).returning(Vote.vote_type)
+    ).scalar()
+    if previous:
+        deltas[previous] -= 1
+
+    # 2. 같은 버튼이면 취소(Toggle Off), 아니면 새 투표 등록 (동시 요청이 먼저 등록했으면 무시)
+    current_status = None
+    if previous != vote_type:
+        inserted = db.session.execute(
+            dialect_insert(Vote).values(message_id=message_id, user_id=user_id, vote_type=vote_type)
+            .on_conflict_do_nothing(index_elements=['message_id', 'user_id'])
+            .returning(Vote.id)
+        ).scalar()
+        if inserted is not None:
+            deltas[vote_type] += 1
             current_status = vote_type
-    else:
-        # Case 3: 신규 투표 (New)
-        new_vote = Vote(message_id=message_id, user_id=user_id, vote_type=vote_type)
-        db.session.add(new_vote)
-        if vote_type == 'up':
-            msg.likes += 1
-        else:
-            msg.dislikes += 1
-        current_status = vote_type
 
+    # 3. 카운터 원자적 증감 (기존 데이터 보호용 0 하한)
+    def shifted(column, delta):
+        value = db.func.coalesce(column, 0) + delta
+        return db.case((value < 0, 0), else_=value)
+
+    likes, dislikes, author_id, coord_x, coord_y, timestamp = db.session.execute(
+        db.update(Message).where(Message.id == message_id)
+        .values(likes=shifted(Message.likes, deltas['up']), dislikes=shifted(Message.dislikes, deltas['down']))
+        .returning(Message.likes, Message.dislikes, Message.user_id, Message.coord_x, Message.coord_y, Message.timestamp)
+    ).one()
+
+    if deltas['up']:
+        bump_user_stats(author_id, likes_received=deltas['up'])  # [Phase 11] 작성자 받은 좋아요
+        # 좋아요 순위가 바뀌므로 클러스터 대표 메시지 갱신
+        update_cluster_tops(message_id, coord_x, coord_y, message_rank_key(likes, timestamp, message_id))
     db.session.commit()
+    change_versions.bump('messages')  # 좋아요 수 + 정렬 순서 변경
 
     return jsonify({
-        'likes': msg.likes,
-        'dislikes': msg.dislikes,
+        'likes': likes,
+        'dislikes': dislikes,
         'userVote': current_status
     })
 
@@ -662,6 +2631,7 @@ def save_message(msg_id):
     ensure_user(user_id)
     saved = SavedMessage(user_id=user_id, message_id=msg_id)
     db.session.add(saved)
+    bump_user_stats(user_id, saved_count=1)
     db.session.commit()
 
     return jsonify({'success': True}), 201
@@ -677,6 +2647,7 @@ def unsave_message(msg_id):
         return jsonify({'error': 'Not saved'}), 404
 
     db.session.delete(saved)
+    bump_user_stats(user_id, saved_count=-1)
     db.session.commit()
 
     return jsonify({'success': True})
@@ -684,149 +2655,496 @@ def unsave_message(msg_id):
 
 @app.route('/api/users/<user_id>/routes', methods=['GET'])
 def get_user_routes(user_id):
-    """사용자의 이동 기록 조회"""
-    routes = Route.query.filter_by(user_id=user_id).order_by(Route.timestamp.desc()).limit(50).all()
-    return jsonify([r.to_dict() for r in routes])
+    """사용자의 이동 기록 조회
+
+    [Phase 15] NDJSON 스트리밍 모드에서는 페이지 제한 없이 전체 기록을 내보냄 (내보내기용)
+    """
+    compact = wants_compact_tracks()
+    if wants_ndjson():
+        query = Route.query.filter_by(user_id=user_id).order_by(Route.timestamp.desc(), Route.id.desc())
+        response = ndjson_response(query, lambda r: r.to_dict(compact=compact))
+        response.vary.add('Accept')
+        return response
+
+    routes, next_cursor = keyset_page(Route.query.filter_by(user_id=user_id), [Route.timestamp, Route.id], 50)
+    response = paginated_response([r.to_dict(compact=compact) for r in routes], next_cursor)
+    response.vary.add('Accept')
+    return response
 
-@app.route('/api/users/<user_id>/routes', methods=['POST'])
-def save_user_route(user_id):
-    """이동 기록 저장 및 통계 업데이트"""
-    data = request.json
-    if not data:
-        return jsonify({'error': 'Missing data'}), 400
+# ========================================
+# [Phase 15] 경로 저장 공통 처리 (동기 저장 / 수집 큐 드레이너 공용)
+# ========================================
+ROUTE_MODES = ['walking', 'wheelchair', 'vehicle']
 
-    ensure_user(user_id)
-    user = User.query.get(user_id)
+def normalize_coords_str(raw):
+    """[Phase 6] 좌표 배열을 "lon,lat" 문자열로 정규화"""
+    if isinstance(raw, list) and len(raw) >= 2:
+        return f"{raw[0]},{raw[1]}"
+    return str(raw) if raw else ''
+
+def validate_route_payload(data):
+    """경로 저장 요청 검증 + 정규화 → (fields, error)
+
+    fields는 JSON 직렬화 가능한 dict (수집 큐에 그대로 저장됨)
+    """
+    if not data:
+        return None, 'Missing data'
 
     # [Phase 5] 입력 검증
-    distance = max(0, data.get('distance', 0))  # 음수 방지
     mode = data.get('mode', 'walking')
-    if mode not in ['walking', 'wheelchair', 'vehicle']:
-        return jsonify({'error': 'Invalid mode'}), 400
+    if mode not in ROUTE_MODES:
+        return None, 'Invalid mode'
+    try:
+        distance = max(0, float(data.get('distance', 0) or 0))  # 음수 방지
+        # 초 단위 정수로 정규화 ("12.5" 같은 문자열/실수도 허용, Route.duration은 Integer)
+        duration = max(0, int(round(float(data.get('duration', 0) or 0))))
+    except (TypeError, ValueError, OverflowError):
+        return None, 'Invalid distance or duration'
+    if not math.isfinite(distance):
+        return None, 'Invalid distance or duration'
 
-    # 통계 업데이트
-    if mode == 'walking':
-        user.dist_walking += distance
-    elif mode == 'wheelchair':
-        user.dist_wheelchair += distance
+    return {
+        'distance': distance,
+        'duration': duration,
+        'mode': mode,
+        'start_coords': normalize_coords_str(data.get('startCoords', '')),
+        'end_coords': normalize_coords_str(data.get('endCoords', '')),
+        # [Phase 10] 궤적은 수신 시 한 번만 압축 인코딩
+        'points_enc': encode_track(parse_track(data.get('points'))),
+        'approach_enc': encode_track(parse_track(data.get('approachPath'))),  # [Phase 6] 접근 경로
+    }, None
+
+def build_route(user_id, fields, timestamp=None):
+    """검증된 필드로 Route 생성 + 파생 데이터(공간 인덱스/격자 셀/LOD) 반영
+
+    밀도 격자는 여러 경로를 모아 update_trajectory_cells()로 반영 (호출한 쪽에서 commit)
+    """
+    route = Route(
+        user_id=user_id,
+        distance=fields['distance'],
+        duration=fields['duration'],
+        mode=fields['mode'],
+        start_coords=fields['start_coords'],
+        end_coords=fields['end_coords'],
+        points_enc=fields['points_enc'],
+        approach_enc=fields['approach_enc'],
+        timestamp=timestamp or get_kst_now()
+    )
+    index_route_geometry(route)  # [Phase 10] 공간 인덱스 컬럼
+    route.lods = build_route_lods(route)  # [Phase 10] 줌 레벨별 단순화 궤적
+    route.cells = build_route_cells(route)  # [Phase 10] 화면 범위 조회용 격자 셀 키
+    db.session.add(route)
+    return route
 
-    user.total_distance += distance
+def apply_route_totals(routes):
+    """저장된 경로들의 거리/횟수를 사용자별로 합산하여 User 누적 거리 + UserStats에 반영"""
+    totals = {}
+    for r in routes:
+        t = totals.setdefault(r.user_id, {'walking': 0.0, 'wheelchair': 0.0, 'distance': 0.0, 'duration': 0, 'count': 0})
+        if r.mode in ('walking', 'wheelchair'):
+            t[r.mode] += r.distance
+        t['distance'] += r.distance
+        t['duration'] += int(r.duration or 0)
+        t['count'] += 1
+
+    for user_id, t in totals.items():
+        # 통계 업데이트 (원자적 증감)
+        User.query.filter_by(id=user_id).update({
+            User.dist_walking: db.func.coalesce(User.dist_walking, 0) + t['walking'],
+            User.dist_wheelchair: db.func.coalesce(User.dist_wheelchair, 0) + t['wheelchair'],
+            User.total_distance: db.func.coalesce(User.total_distance, 0) + t['distance'],
+        }, synchronize_session=False)
+        bump_user_stats(user_id, route_count=t['count'], total_distance=t['distance'], total_duration=t['duration'])  # [Phase 11]
+
+def after_routes_committed(routes):
+    """commit 이후 캐시 무효화"""
+    change_versions.bump('routes')
+    for route in routes:
+        if route.min_lon is not None:
+            tile_cache.invalidate(route.min_lon, route.min_lat, route.max_lon, route.max_lat)
 
-    # [Phase 6] 좌표 배열을 문자열로 정규화
-    start_coords_raw = data.get('startCoords', '')
-    end_coords_raw = data.get('endCoords', '')
+# ========================================
+# [Phase 15] 경로 수집 큐 (Write-behind)
+# ========================================
+# ROUTE_INGEST_MODE=queue 이면 경로 POST는 검증 후 로컬 SQLite 큐에 기록하고 바로 202로 응답.
+# 워커별 백그라운드 드레이너가 큐를 배치 단위로 꺼내 한 트랜잭션으로 저장 + 통계 반영.
+ROUTE_INGEST_MODE = os.environ.get('ROUTE_INGEST_MODE', 'sync')  # 'sync' | 'queue'
+ROUTE_QUEUE_PATH = os.environ.get('ROUTE_QUEUE_PATH', os.path.join(app.instance_path, 'route_queue.db'))
+ROUTE_QUEUE_BATCH_SIZE = int(os.environ.get('ROUTE_QUEUE_BATCH_SIZE', 200))
+ROUTE_QUEUE_POLL_INTERVAL = float(os.environ.get('ROUTE_QUEUE_POLL_INTERVAL', 1.0))  # 초
+ROUTE_QUEUE_LEASE = 300  # 처리 중 워커가 죽으면 이 시간(초) 후 다른 워커가 재처리
+ROUTE_QUEUE_MAX_ATTEMPTS = 5  # 초과 시 큐에 남겨두고 더 이상 처리하지 않음 (수동 확인용)
+
+class RouteIngestQueue:
+    """로컬 SQLite 파일 기반 내구성 큐 (같은 서버의 gunicorn 워커 간 공유)"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS route_queue ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT NOT NULL, payload TEXT NOT NULL, '
+                'enqueued_at TEXT NOT NULL, attempts INTEGER DEFAULT 0, claimed_until REAL DEFAULT 0, last_error TEXT)'
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def append(self, user_id, fields):
+        with self._connect() as conn:
+            cur = conn.execute(
+                'INSERT INTO route_queue (user_id, payload, enqueued_at) VALUES (?, ?, ?)',
+                (user_id, json.dumps(fields), get_kst_now().isoformat())
+            )
+            return cur.lastrowid
+
+    def claim(self, limit):
+        """처리할 항목을 임대(lease) 방식으로 가져옴 → [(id, user_id, fields, enqueued_at), ...]"""
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                'UPDATE route_queue SET claimed_until = ? WHERE id IN ('
+                ' SELECT id FROM route_queue WHERE claimed_until < ? AND attempts < ? ORDER BY id LIMIT ?'
+                ') RETURNING id, user_id, payload, enqueued_at',
+                (now + ROUTE_QUEUE_LEASE, now, ROUTE_QUEUE_MAX_ATTEMPTS, limit)
+            ).fetchall()
+        return sorted(
+            (row_id, user_id, json.loads(payload), datetime.fromisoformat(enqueued_at))
+            for row_id, user_id, payload, enqueued_at in rows
+        )
 
-    if isinstance(start_coords_raw, list) and len(start_coords_raw) >= 2:
-        start_coords = f"{start_coords_raw[0]},{start_coords_raw[1]}"
-    else:
-        start_coords = str(start_coords_raw) if start_coords_raw else ''
+    def ack(self, ids):
+        with self._connect() as conn:
+            conn.executemany('DELETE FROM route_queue WHERE id = ?', [(i,) for i in ids])
+
+    def fail(self, ids, error):
+        with self._connect() as conn:
+            conn.executemany(
+                'UPDATE route_queue SET attempts = attempts + 1, claimed_until = 0, last_error = ? WHERE id = ?',
+                [(error[:500], i) for i in ids]
+            )
+
+    def stats(self):
+        with self._connect() as conn:
+            pending, failed = conn.execute(
+                'SELECT COALESCE(SUM(attempts < ?), 0), COALESCE(SUM(attempts >= ?), 0) FROM route_queue',
+                (ROUTE_QUEUE_MAX_ATTEMPTS, ROUTE_QUEUE_MAX_ATTEMPTS)
+            ).fetchone()
+        return {'pending': pending, 'failed': failed}
+
+route_queue = RouteIngestQueue(ROUTE_QUEUE_PATH) if ROUTE_INGEST_MODE == 'queue' else None
+
+def ingest_route_batch(items):
+    """큐 항목 배치를 한 트랜잭션으로 저장 (사용자 일괄 생성 + 멱등성 키 중복 제외 + 통계 합산)"""
+    user_ids = sorted({user_id for _, user_id, _, _ in items})
+    db.session.execute(dialect_insert(User).values([{'id': u} for u in user_ids]).on_conflict_do_nothing())
+
+    # [Phase 15] 이미 처리된 키(이전 배치/동기 저장) 및 배치 안의 같은 키는 건너뜀
+    claimed = claim_idempotency_keys(sorted({f['idempotency_key'] for _, _, f, _ in items if f.get('idempotency_key')}))
+    routes = []
+    keyed_routes = {}
+    for _, user_id, fields, enqueued_at in items:
+        key = fields.get('idempotency_key')
+        if key and key not in claimed:
+            continue
+        claimed.discard(key)
+        route = build_route(user_id, fields, timestamp=enqueued_at)
+        routes.append(route)
+        if key:
+            keyed_routes[key] = route
+    db.session.flush()  # Route ID 확정
+    set_idempotency_resources({key: route.id for key, route in keyed_routes.items()})
+    update_trajectory_cells(*routes)  # [Phase 10] 밀도 격자 (배치 합산)
+    apply_route_totals(routes)
+    db.session.commit()
+    after_routes_committed(routes)
+    return len(routes)
+
+def drain_route_queue(batch_size=ROUTE_QUEUE_BATCH_SIZE):
+    """큐에서 한 배치를 꺼내 저장 → 처리한 항목 수 (배치 실패 시 항목별로 재시도하여 불량 항목 격리)"""
+    items = route_queue.claim(batch_size)
+    if not items:
+        return 0
+    try:
+        ingest_route_batch(items)
+        route_queue.ack([item[0] for item in items])
+    except Exception as e:
+        db.session.rollback()
+        print(f"[Phase 15] Route batch failed ({len(items)} items), retrying one by one: {e}")
+        for item in items:
+            try:
+                ingest_route_batch([item])
+                route_queue.ack([item[0]])
+            except Exception as item_error:
+                db.session.rollback()
+                route_queue.fail([item[0]], str(item_error))
+    return len(items)
+
+_drainer_pid = None
+_drainer_lock = threading.Lock()
+
+def _route_queue_drainer():
+    while True:
+        try:
+            with app.app_context():
+                processed = drain_route_queue()
+        except Exception as e:
+            print(f"[Phase 15] Route queue drainer error: {e}")
+            processed = 0
+        if not processed:
+            time.sleep(ROUTE_QUEUE_POLL_INTERVAL)
+
+@app.before_request
+def ensure_route_drainer():
+    """큐 모드에서 워커 프로세스마다 드레이너 스레드 1개 시작 (fork 이후 시작되도록 첫 요청 시점에 실행)"""
+    global _drainer_pid
+    if route_queue is None or _drainer_pid == os.getpid():
+        return
+    with _drainer_lock:
+        if _drainer_pid != os.getpid():
+            threading.Thread(target=_route_queue_drainer, name='route-queue-drainer', daemon=True).start()
+            _drainer_pid = os.getpid()
 
-    if isinstance(end_coords_raw, list) and len(end_coords_raw) >= 2:
-        end_coords = f"{end_coords_raw[0]},{end_coords_raw[1]}"
-    else:
-        end_coords = str(end_coords_raw) if end_coords_raw else ''
-
-    # [Phase 9] 중복 경로 감지 (Idempotency Check)
-    # 동일 유저가 1분 이내에 정확히 같은 경로를 보낸 경우 중복으로 간주
-    duration = data.get('duration', 0)
-    one_minute_ago = get_kst_now() - timedelta(minutes=1)
-
-    existing_route = Route.query.filter(
-        Route.user_id == user_id,
-        Route.start_coords == start_coords,
-        Route.end_coords == end_coords,
-        Route.distance == distance,
-        Route.duration == duration,
-        Route.timestamp >= one_minute_ago
-    ).first()
-
-    if existing_route:
-        # 중복 데이터 - 기존 경로 반환 (클라이언트에게 "성공"으로 응답)
-        print(f"[Phase 9] Duplicate route detected for user {user_id}, returning existing route {existing_route.id}")
-        return jsonify(existing_route.to_dict()), 200  # 200 OK (not 201 Created)
+@app.route('/api/users/<user_id>/routes', methods=['POST'])
+def save_user_route(user_id):
+    """이동 기록 저장 및 통계 업데이트
 
-    route = Route(
-        user_id=user_id,
-        distance=distance,
-        duration=duration,
-        mode=mode,
-        start_coords=start_coords,
-        end_coords=end_coords,
-        points_json=data.get('points', ''),
-        approach_path=data.get('approachPath', '')  # [Phase 6] 접근 경로 저장
-    )
-    db.session.add(route)
+    [Phase 15] 큐 모드에서는 검증 후 큐에 기록하고 202 Accepted로 즉시 응답
+    """
+    fields, error = validate_route_payload(request.json)
+    if error:
+        return jsonify({'error': error}), 400
+
+    # [Phase 15] 중복 전송 감지는 멱등성 키로 처리 (기존 1분 이내 동일 경로 검색 대체)
+    key = idempotency_key('route', user_id)
+
+    if route_queue is not None:
+        # 큐에서는 드레이너가 같은 키의 항목을 한 번만 저장
+        queue_id = route_queue.append(user_id, dict(fields, idempotency_key=key))
+        return jsonify({'queued': True, 'queueId': queue_id}), 202
+
+    ensure_user(user_id)
+
+    if key and not claim_idempotency_keys([key]):
+        # 중복 데이터 - 기존 경로 반환 (클라이언트에게 "성공"으로 응답)
+        db.session.rollback()
+        return replay_idempotent(key, Route)  # 200 OK (not 201 Created)
+
+    route = build_route(user_id, fields)
+    update_trajectory_cells(route)  # [Phase 10] 밀도 격자 증분 갱신 (같은 트랜잭션)
+    apply_route_totals([route])
+    if key:
+        db.session.flush()  # Route ID 확정
+        set_idempotency_resources({key: route.id})
     db.session.commit()
+    after_routes_committed([route])
     return jsonify(route.to_dict()), 201
 
 @app.route('/api/trajectories', methods=['GET'])
+@conditional_get('routes')
 def get_trajectories():
-    """지도 범위 내 집단지성 궤적 조회 (익명 궤적 노출)"""
-    bounds_str = request.args.get('bounds', '') # "minLon,minLat,maxLon,maxLat"
-
-    query = Route.query.order_by(Route.timestamp.desc())
-    routes = query.limit(500).all() # 성능 위해 최대 500개까지만 1차 로드
+    """지도 범위 내 집단지성 궤적 조회 (익명 궤적 노출)
 
-    result = []
+    zoom 파라미터가 있으면 해당 줌에 맞게 미리 단순화된 궤적(RouteLOD)을 반환.
+    """
+    bounds_str = request.args.get('bounds', '') # "minLon,minLat,maxLon,maxLat"
+    lod_level = pick_lod_level(request.args.get('zoom', type=float))
+
+    if lod_level is not None:
+        # 원본 궤적 컬럼은 읽지 않고 단순화 궤적만 조인
+        query = db.session.query(Route, RouteLOD.points_enc).outerjoin(
+            RouteLOD, db.and_(RouteLOD.route_id == Route.id, RouteLOD.level == lod_level)
+        ).options(
+            db.defer(Route.points_json), db.defer(Route.approach_path),
+            db.defer(Route.points_enc), db.defer(Route.approach_enc)
+        )
+    else:
+        query = db.session.query(Route, db.null())
 
     # 지도 범위 파싱
-    min_lon, min_lat, max_lon, max_lat = -180, -90, 180, 90
-    filter_bounds = False
-
     if bounds_str:
         try:
             parts = [float(x) for x in bounds_str.split(',')]
-            if len(parts) == 4:
-                min_lon, min_lat, max_lon, max_lat = parts
-                filter_bounds = True
-        except:
-            pass
-
-    import json
-    import random
-
-    for r in routes:
-        # 범위 필터링 (간이 구현: 시작점이나 끝점이 범위 내에 있으면 포함)
-        if filter_bounds:
-            try:
-                # 좌표 문자열 "lon,lat" 파싱
-                slon, slat = map(float, r.start_coords.split(',')) if r.start_coords else (0, 0)
-                elon, elat = map(float, r.end_coords.split(',')) if r.end_coords else (0, 0)
+        except ValueError:
+            parts = []
+        if len(parts) == 4:
+            min_lon, min_lat, max_lon, max_lat = parts
+            # [Phase 10] 격자 셀 키 + Bounding Box로 화면과의 교차 여부를 DB에서 판정
+            # (시작/끝점이 화면 밖이어도 화면을 지나가는 경로 포함)
+            query = filter_routes_in_bounds(query, min_lon, min_lat, max_lon, max_lat)
+
+    query = query.order_by(Route.timestamp.desc()).limit(500) # 성능 위해 최대 500개까지만 로드
+
+    compact = wants_compact_tracks()
+    def serialize(row):
+        r, lod_enc = row
+        d = r.to_dict(lod_enc=lod_enc, compact=compact)
+        d['userCount'] = 1 # 개별 궤적 = 1명 (지역별 사용자 수는 /api/trajectories/density)
+        return d
+
+    # [Phase 15] 스트리밍 모드: 경로를 읽는 대로 한 줄씩 전송 (클라이언트는 받는 즉시 그리기 시작)
+    if wants_ndjson():
+        response = ndjson_response(query, serialize)
+    else:
+        response = jsonify([serialize(row) for row in query.all()])
+    response.vary.add('Accept')
+    return response
+
+@app.route('/api/trajectories/density', methods=['GET'])
+def get_trajectory_density():
+    """지도 범위 내 궤적 밀도 격자 조회 (셀별 통과 횟수 + 고유 사용자 수)
+
+    응답 크기는 화면 크기와 무관하게 약 64 x 64 셀 이내로 제한됨.
+    (가장 거친 레벨로도 넘치는 넓은 화면은 k x k 셀을 묶어 반환 → rollup = k, cellSize = 셀 크기 x k)
+    cells: [[중심 경도, 중심 위도, 통과 횟수, 사용자 수], ...]
+    묶인 셀의 사용자 수는 셀별 고유 사용자 수의 합 (여러 셀을 지난 사용자는 중복 집계되는 상한값)
+    """
+    try:
+        min_lon, min_lat, max_lon, max_lat = [float(x) for x in request.args.get('bounds', '').split(',')]
+    except ValueError:
+        return jsonify({'error': 'Invalid bounds'}), 400
+    mode = request.args.get('mode', DENSITY_ALL_MODES)
+
+    level = pick_density_level(min_lon, min_lat, max_lon, max_lat)
+    size = DENSITY_CELL_SIZES[level]
+    k = density_rollup_factor(min_lon, min_lat, max_lon, max_lat, level)
+
+    # k = 1이면 셀 그대로, k > 1이면 GROUP BY floor(cx / k), floor(cy / k)로 묶음
+    gx = db.func.floor(TrajectoryCell.cx / float(k)) if k > 1 else TrajectoryCell.cx
+    gy = db.func.floor(TrajectoryCell.cy / float(k)) if k > 1 else TrajectoryCell.cy
+    cells = db.session.query(
+        gx, gy, db.func.sum(TrajectoryCell.traversals), db.func.sum(TrajectoryCell.user_count)
+    ).filter(
+        TrajectoryCell.level == level,
+        TrajectoryCell.mode == mode,
+        TrajectoryCell.cx.between(math.floor(min_lon / size), math.floor(max_lon / size)),
+        TrajectoryCell.cy.between(math.floor(min_lat / size), math.floor(max_lat / size))
+    ).group_by(gx, gy).all()
+
+    cell_size = size * k
+    return jsonify({
+        'level': level,
+        'cellSize': cell_size,
+        'rollup': k,
+        'mode': mode,
+        'cells': [
+            [round((int(cx) + 0.5) * cell_size, 6), round((int(cy) + 0.5) * cell_size, 6), int(traversals), int(users)]
+            for cx, cy, traversals, users in cells
+        ]
+    })
 
-                # 시작점이나 끝점이 화면 안에 있거나, 화면이 전체를 포함하는 경우
-                s_in = (min_lon <= slon <= max_lon) and (min_lat <= slat <= max_lat)
-                e_in = (min_lon <= elon <= max_lon) and (min_lat <= elat <= max_lat)
+@app.route('/api/tiles/<int:z>/<int:x>/<int:y>', methods=['GET'])
+def get_tile(z, x, y):
+    """XYZ 타일 단위 궤적 + 메시지 조회 (타일 정렬로 브라우저/HTTP 캐시 활용)
+
+    routes: [[id, mode, 압축 궤적(줌에 맞게 단순화)], ...]  (줌 TILE_ROUTE_MIN_ZOOM 이상)
+    messages: [[id, 경도, 위도], ...]
+    """
+    if z > TILE_MAX_ZOOM or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        return jsonify({'error': 'Invalid tile'}), 404
+
+    key = (z, x, y)
+    cached = tile_cache.get(key)
+    if cached is None:
+        min_lon, min_lat, max_lon, max_lat = tile_bounds(z, x, y)
+
+        routes = []
+        if z >= TILE_ROUTE_MIN_ZOOM:
+            lod_level = pick_lod_level(z)
+            enc_column = RouteLOD.points_enc if lod_level is not None else Route.points_enc
+            query = db.session.query(Route.id, Route.mode, enc_column)
+            if lod_level is not None:
+                query = query.join(RouteLOD, db.and_(RouteLOD.route_id == Route.id, RouteLOD.level == lod_level))
+            routes = filter_routes_in_bounds(query, min_lon, min_lat, max_lon, max_lat).order_by(Route.timestamp.desc()).limit(TILE_MAX_ROUTES).all()
+
+        # 좋아요/댓글 수처럼 자주 바뀌는 값은 타일에 넣지 않음 (선택 기준도 최신순) →
+        # 타일 내용은 메시지 작성/삭제로만 바뀌어 투표 후에도 캐시가 오래되지 않음
+        messages = db.session.query(Message.id, Message.coord_x, Message.coord_y).filter(
+            Message.coord_x >= min_lon,
+            Message.coord_x < max_lon,
+            Message.coord_y >= min_lat,
+            Message.coord_y < max_lat
+        ).order_by(Message.timestamp.desc(), Message.id.desc()).limit(TILE_MAX_MESSAGES).all()
+
+        body = json.dumps({
+            'z': z, 'x': x, 'y': y,
+            'routes': [[route_id, mode, enc] for route_id, mode, enc in routes if enc],
+            'messages': [[m.id, m.coord_x, m.coord_y] for m in messages]
+        }, separators=(',', ':'))
+        etag = hashlib.md5(body.encode('utf-8')).hexdigest()
+        tile_cache.set(key, body, etag)
+    else:
+        body, etag = cached
 
-                if not (s_in or e_in):
-                    continue
-            except:
-                continue
+    response = app.response_class(response=body, status=200, mimetype='application/json')
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = TILE_CACHE_TTL
+    return response.make_conditional(request)
 
-        d = r.to_dict()
-        d['userCount'] = 1 # 실제 유저 수 (향후 집계 로직 필요)
+# ========================================
+# [NEW] 관리자 DB 조회 페이지
+# ========================================
+ADMIN_SECRET_KEY = os.environ.get('ADMIN_KEY', 'balgil_admin_2024')
 
-        # [NEW] approach_path도 궤적 데이터에 포함 (존재 시)
-        if r.approach_path:
-            try:
-                # approach_path는 [{"coords": [lon, lat], ...}] 형태의 JSON 배열일 수 있음
-                # 클라가 기대하는 points 포맷은 [[lon,lat], [lon,lat]] 형태의 좌표 배열이거나
-                # [{"coords": [lon, lat]}] 형태일 수 있음. PathManager.js를 보면:
-                # JSON.parse(route.points).map(p => ol.proj.fromLonLat(p.coords))
-                # 즉, 객체 배열 [{coords: [127..., 37...]}, ...] 형태임.
+# [Phase 15] 관리자 페이지 행 수: 짧은 TTL 캐시 + (PostgreSQL) 큰 테이블은 통계 추정치 사용
+ADMIN_COUNT_TTL = int(os.environ.get('ADMIN_COUNT_TTL', 60))  # 초
+ADMIN_COUNT_ESTIMATE_THRESHOLD = int(os.environ.get('ADMIN_COUNT_ESTIMATE_THRESHOLD', 100000))
+
+class TableCounts:
+    """테이블 행 수 제공자: count(*) 결과를 TTL 동안 캐시
+
+    PostgreSQL에서는 pg_class.reltuples(ANALYZE/autovacuum 통계)를 먼저 조회해
+    임계값 이상이면 전체 스캔 없이 추정치를 반환 → (count, estimated)
+    """
+
+    def __init__(self, ttl, estimate_threshold):
+        self.ttl = ttl
+        self.estimate_threshold = estimate_threshold
+        self._entries = {}  # table name -> (만료 시각, count, estimated)
+        self._lock = threading.Lock()
+
+    def estimate(self, table_name):
+        if db.engine.dialect.name != 'postgresql':
+            return None
+        value = db.session.execute(
+            db.text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:name)"),
+            {'name': table_name}
+        ).scalar()
+        # 한 번도 ANALYZE 되지 않은 테이블은 -1 (PG14+) 또는 0
+        return value if value is not None and value >= 0 else None
+
+    def get(self, model):
+        name = model.__table__.name
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] > time.time():
+                return entry[1], entry[2]
+
+        estimated = self.estimate(name)
+        if estimated is not None and estimated >= self.estimate_threshold:
+            count, is_estimate = int(estimated), True
+        else:
+            count, is_estimate = db.session.query(db.func.count()).select_from(model).scalar(), False
 
-                # 별도의 feature로 추가하지 않고, 원본 데이터에 포함만 시켜둠 (클라 수정 필요 시 대응)
-                pass
-            except:
-                pass
+        with self._lock:
+            self._entries[name] = (time.time() + self.ttl, count, is_estimate)
+        return count, is_estimate
 
-        result.append(d)
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
 
-    return jsonify(result)
+table_counts = TableCounts(ADMIN_COUNT_TTL, ADMIN_COUNT_ESTIMATE_THRESHOLD)
 
-# ========================================
-# [NEW] 관리자 DB 조회 페이지
-# ========================================
-ADMIN_SECRET_KEY = os.environ.get('ADMIN_KEY', 'balgil_admin_2024')
+# 섹션별 (모델, keyset 정렬 컬럼, 페이지 크기)
+ADMIN_SECTIONS = {
+    'routes': (Route, (Route.timestamp, Route.id), 10),
+    'users': (User, (User.created_at, User.id), 5),
+    'messages': (Message, (Message.timestamp, Message.id), 5),
+}
 
 @app.route('/admin/db')
 def admin_db():
@@ -835,47 +3153,44 @@ def admin_db():
     if key != ADMIN_SECRET_KEY:
         return "Access Denied. Use ?key=YOUR_KEY", 403
 
-    # 페이지네이션 & 섹션
-    page = request.args.get('page', 1, type=int)
-    section = request.args.get('section', 'routes') # routes, users, messages
-    per_page = 10 # [OPTIMIZATION] 페이지당 로드 개수 감소 (50 -> 10)
+    section = request.args.get('section', 'routes') # routes, users, messages, slow
+    if section not in ADMIN_SECTIONS and section != 'slow':
+        section = 'routes'
+    if request.args.get('refresh'):
+        table_counts.invalidate()
+    if section == 'slow' and request.args.get('clear'):
+        slow_query_log.clear()
+
+    # [Phase 15] OFFSET 대신 keyset 커서 → 몇 번째 페이지든 조회 비용 동일
+    # (page는 화면 표시용 번호일 뿐 쿼리에는 사용하지 않음)
+    page = max(1, request.args.get('page', 1, type=int))
+    rows, next_cursor, prev_cursor, per_page = [], None, None, 1
+    if section in ADMIN_SECTIONS:
+        model, columns, per_page = ADMIN_SECTIONS[section]
+        try:
+            rows, next_cursor, prev_cursor = keyset_window(model.query, columns, per_page)
+        except InvalidCursor:
+            return "Invalid cursor", 400
+        if prev_cursor is None:
+            page = 1  # 더 앞 페이지가 없으면 첫 페이지
+    # 새로고침은 현재 위치(cursor/before/page) 유지
+    refresh_args = {k: v for k, v in request.args.items() if k not in ('refresh', 'clear')}
+    refresh_url = url_for('admin_db', **refresh_args, refresh=1)
+
+    routes = rows if section == 'routes' else []
+    users = rows if section == 'users' else []
+    messages = rows if section == 'messages' else []
+    for r in routes:
+        r.timestamp_kst = r.timestamp if r.timestamp else None
+    for u in users:
+        u.created_at_kst = u.created_at if u.created_at else None
+    for m in messages:
+        m.timestamp_kst = m.timestamp if m.timestamp else None
 
-    # 초기값
-    routes = []
-    users = []
-    messages = []
-    total_routes = 0
-    total_users = 0
-    total_messages = 0
-    total_pages = 1
-
-    # [OPTIMIZATION] 필요한 섹션만 쿼리 실행 (Egress 절감)
-    if section == 'routes':
-        total_routes = Route.query.count()
-        routes = Route.query.order_by(Route.timestamp.desc()).offset((page - 1) * per_page).limit(per_page).all()
-        total_pages = (total_routes + per_page - 1) // per_page if total_routes > 0 else 1
-        for r in routes:
-            r.timestamp_kst = r.timestamp if r.timestamp else None
-
-    elif section == 'users':
-        total_users = User.query.count()
-        users = User.query.order_by(User.created_at.desc()).offset((page - 1) * per_page).limit(5).all() # [OPTIMIZATION] 유저는 5명씩
-        total_pages = (total_users + per_page - 1) // per_page if total_users > 0 else 1
-        for u in users:
-            u.created_at_kst = u.created_at if u.created_at else None
-
-    elif section == 'messages':
-        total_messages = Message.query.count()
-        messages = Message.query.order_by(Message.timestamp.desc()).offset((page - 1) * per_page).limit(5).all() # [OPTIMIZATION] 메시지는 5개씩
-        total_pages = (total_messages + per_page - 1) // per_page if total_messages > 0 else 1
-        for m in messages:
-            m.timestamp_kst = m.timestamp if m.timestamp else None
-
-    # 요약 정보 (Counts) - 가벼운 쿼리라 항상 실행해도 무방하나, 성능 위해 캐싱 고려 가능
-    # 여기서는 정확한 네비게이션을 위해 Count는 항상 조회 (비용 낮음)
-    count_routes = Route.query.count()
-    count_users = User.query.count()
-    count_messages = Message.query.count()
+    # 요약 정보 (Counts) - TTL 캐시 / 큰 테이블은 추정치 (estimated=True면 화면에 '약' 표시)
+    counts = {name: table_counts.get(m) for name, (m, _, _) in ADMIN_SECTIONS.items()}
+    section_total, _ = counts.get(section, (0, False))
+    total_pages = max(1, (section_total + per_page - 1) // per_page)
 
     return render_template('admin_db.html',
                            routes=routes,
@@ -883,12 +3198,36 @@ def admin_db():
                            messages=messages,
                            page=page,
                            section=section,
+                           next_cursor=next_cursor,
+                           prev_cursor=prev_cursor,
+                           refresh_url=refresh_url,
                            total_pages=total_pages,
-                           total_routes=count_routes,
-                           total_users=count_users,
-                           total_messages=count_messages,
+                           counts=counts,
+                           slow_queries=slow_query_log.entries() if section == 'slow' else [],
+                           slow_query_ms=int(SLOW_QUERY_SECONDS * 1000),
                            key=key)
 
+@app.route('/metrics')
+def metrics():
+    """[Phase 15] Prometheus 지표 (관리자 키: ?key= 또는 Authorization: Bearer)"""
+    auth = request.headers.get('Authorization', '')
+    key = auth[len('Bearer '):] if auth.startswith('Bearer ') else request.args.get('key')
+    if key != ADMIN_SECRET_KEY:
+        return "Access Denied. Use ?key=YOUR_KEY", 403
+    return Response(render_prometheus_metrics(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/admin/cache-stats')
+def admin_cache_stats():
+    """[Phase 12] 외부 API 캐시 hit/miss 및 응답 시간 통계 (관리자 전용)"""
+    if request.args.get('key') != ADMIN_SECRET_KEY:
+        return "Access Denied. Use ?key=YOUR_KEY", 403
+    return jsonify({
+        'backend': KAKAO_CACHE_BACKEND,
+        'kakao': kakao_cache.stats(),
+        'upstream': kakao_client.stats(),
+        'routeQueue': route_queue.stats() if route_queue is not None else None  # [Phase 15]
+    })
+
 # ========================================
 # 데이터베이스 테이블 자동 생성 (Gunicorn 호환)
 # ========================================